@@ -0,0 +1,218 @@
+# Pruebas de rendimiento de las rutas de cálculo de la hipoteca inversa
+#
+# Uso (desde la raíz del repositorio):
+#     python benchmarks/bench_pricing.py                         # imprime los resultados en JSON
+#     python benchmarks/bench_pricing.py --output resultados.json
+#     python benchmarks/bench_pricing.py --baseline benchmarks/baseline.json
+#     python benchmarks/bench_pricing.py --save-baseline benchmarks/baseline.json
+#
+# Con --baseline el programa termina con código 1 si algún caso es más lento
+# que la línea base por encima del umbral (--threshold, 1.25 por defecto).
+import argparse
+import json
+import os
+import platform
+import random
+import subprocess
+import sys
+import time
+sys.path.append("src")
+from logic import reverse_mortgage
+from logic.portfolio import Portfolio
+
+VALID_APPLICANT = (500000000, "excellent", "married", 70, 68, 0.5)
+INVALID_APPLICANT = (500000000, "excellent", None, 70, 68, 0.5)
+
+def synthetic_portfolio(size, seed=0, invalid_share=0.0):
+    """Return a seeded synthetic portfolio as six parallel columns."""
+    generator = random.Random(seed)
+    rows = []
+    for _ in range(size):
+        row = [
+            generator.randint(200_000_000, 900_000_000),
+            generator.choice(("excellent", "good", "average")),
+            generator.choice(("married", "single", "divorced")),
+            generator.randint(18, 95),
+            generator.randint(18, 85),
+            generator.choice((0.05, 0.07, 0.1, 0.5)),
+        ]
+        if generator.random() < invalid_share:
+            row[generator.randrange(6)] = None
+        rows.append(tuple(row))
+    return [list(column) for column in zip(*rows)]
+
+def measure(function, operations, repeat):
+    """Return the best seconds per operation of function over repeat runs."""
+    best = float("inf")
+    for _ in range(repeat):
+        started = time.perf_counter()
+        function()
+        best = min(best, time.perf_counter() - started)
+    return best / operations
+
+def scalar_happy_path(count):
+    calculate = reverse_mortgage.calculate_reverse_mortgage_payment
+    def run():
+        for _ in range(count):
+            calculate(*VALID_APPLICANT)
+    return run
+
+def scalar_failing_validation(count):
+    calculate = reverse_mortgage.calculate_reverse_mortgage_payment
+    def run():
+        for _ in range(count):
+            try:
+                calculate(*INVALID_APPLICANT)
+            except reverse_mortgage.InvalidMaritalStatusError:
+                pass
+    return run
+
+def validate_inputs_only(count):
+    validate = reverse_mortgage.validate_inputs
+    def run():
+        for _ in range(count):
+            validate(*VALID_APPLICANT)
+    return run
+
+def life_expectancy_lookup(count):
+    lookup = reverse_mortgage.get_life_expectancy
+    ages = [18 + index % 70 for index in range(count)]
+    def run():
+        for age in ages:
+            lookup(age)
+    return run
+
+def scalar_portfolio(columns):
+    calculate = reverse_mortgage.calculate_reverse_mortgage_payment
+    rows = list(zip(*columns))
+    def run():
+        for row in rows:
+            try:
+                calculate(*row)
+            except Exception:
+                pass
+    return run
+
+def batch_portfolio(columns):
+    def run():
+        reverse_mortgage.calculate_reverse_mortgage_payments(*columns)
+    return run
+
+def bulk_validation(columns):
+    def run():
+        reverse_mortgage.validate_inputs_bulk(*columns)
+    return run
+
+def portfolio_reprice_rate(count):
+    # A rate held by one row in a hundred; the rate flips back and forth so
+    # every run moves the same rows.
+    applicants = [(200000000 + index, "good", "single", 60 + index % 20, 60, 0.05 if index % 100 else 0.09) for index in range(count)]
+    portfolio = Portfolio(applicants)
+    rates = [0.09, 0.1]
+    def run():
+        portfolio.reprice_rate(rates[0], rates[1])
+        rates.reverse()
+    return run
+
+def cold_start(command):
+    environment = dict(os.environ, PYTHONPATH="src")
+    def run():
+        subprocess.run(command, input="", capture_output=True, text=True, env=environment, check=True)
+    return run
+
+def run_benchmarks(scale=1.0, repeat=5):
+    """
+    Run every benchmark case.
+
+    Args:
+        scale (float): Multiplier of the number of operations of each case.
+        repeat (int): Runs per case; the fastest one is reported.
+
+    Returns:
+        dict: Seconds per operation and operation count, by case name.
+    """
+    calls = max(1, int(20_000 * scale))
+    rows = max(1, int(100_000 * scale))
+    clean = synthetic_portfolio(rows, seed=1)
+    dirty = synthetic_portfolio(rows, seed=2, invalid_share=0.3)
+
+    cases = {
+        "scalar_happy_path": (scalar_happy_path(calls), calls),
+        "scalar_failing_validation": (scalar_failing_validation(calls), calls),
+        "validate_inputs": (validate_inputs_only(calls), calls),
+        "get_life_expectancy": (life_expectancy_lookup(calls), calls),
+        "scalar_portfolio_loop": (scalar_portfolio(clean), rows),
+        "batch_portfolio": (batch_portfolio(clean), rows),
+        "bulk_validation_dirty": (bulk_validation(dirty), rows),
+        "portfolio_reprice_rate": (portfolio_reprice_rate(rows // 5), 1),
+        "cold_start_worker": (cold_start([sys.executable, "-m", "logic"]), 1),
+        "cold_start_console": (cold_start([sys.executable, "src/console/console.py", "--input", "-"]), 1),
+    }
+    return {
+        name: {"seconds_per_op": measure(function, operations, repeat), "operations": operations}
+        for name, (function, operations) in cases.items()
+    }
+
+def compare(results, baseline, threshold):
+    """
+    Compare results with a baseline.
+
+    Returns:
+        dict: For each case, the ratio current / baseline and whether it is a
+        regression (ratio above threshold). A case missing from the baseline
+        has a ratio of None and counts as a regression, so a new case cannot
+        go unguarded until the baseline is regenerated.
+    """
+    comparison = {}
+    for name, result in results.items():
+        if name in baseline:
+            ratio = result["seconds_per_op"] / baseline[name]["seconds_per_op"]
+            comparison[name] = {"ratio": ratio, "regression": ratio > threshold}
+        else:
+            comparison[name] = {"ratio": None, "regression": True}
+    return comparison
+
+def parse_arguments(argv=None):
+    """Parse the command line options of the benchmark suite."""
+    parser = argparse.ArgumentParser(description="Benchmarks of the reverse mortgage pricing hot paths.")
+    parser.add_argument("--scale", type=float, default=1.0, help="Multiplier of the number of operations (default: 1).")
+    parser.add_argument("--repeat", type=int, default=5, help="Runs per case; the fastest is reported (default: 5).")
+    parser.add_argument("--output", help="File to write the JSON results to (default: stdout).")
+    parser.add_argument("--baseline", help="Baseline JSON to compare against.")
+    parser.add_argument("--save-baseline", help="Write the results as a new baseline file.")
+    parser.add_argument("--threshold", type=float, default=1.25, help="Slowdown ratio counted as a regression (default: 1.25).")
+    return parser.parse_args(argv)
+
+def main(argv=None):
+    """Run the suite, write the report and return the exit code."""
+    arguments = parse_arguments(argv)
+    results = run_benchmarks(arguments.scale, arguments.repeat)
+    report = {
+        "python": platform.python_version(),
+        "machine": platform.machine(),
+        "results": results,
+    }
+
+    exit_code = 0
+    if arguments.baseline:
+        with open(arguments.baseline, encoding="utf-8") as source:
+            baseline = json.load(source)["results"]
+        report["comparison"] = compare(results, baseline, arguments.threshold)
+        if any(case["regression"] for case in report["comparison"].values()):
+            exit_code = 1
+
+    text = json.dumps(report, indent=2)
+    if arguments.output:
+        with open(arguments.output, "w", encoding="utf-8") as target:
+            target.write(text + "\n")
+    else:
+        print(text)
+    if arguments.save_baseline:
+        with open(arguments.save_baseline, "w", encoding="utf-8") as target:
+            json.dump({"python": report["python"], "machine": report["machine"], "results": results}, target, indent=2)
+            target.write("\n")
+    return exit_code
+
+
+if __name__ == "__main__":
+    sys.exit(main())
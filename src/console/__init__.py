@@ -0,0 +1 @@
+# Este archivo convierte a una carpeta en un paquete que puede ser importado desde otra carpeta
\ No newline at end of file
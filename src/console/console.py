@@ -1,7 +1,11 @@
 # Solicitar valores al usuario
+import argparse
+import os
 import sys
-sys.path.append("src")
-from logic import  reverse_mortgage
+if not __package__:
+    # Ejecutado como script (python src/console/console.py): el paquete logic está junto a esta carpeta
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from logic import  reverse_mortgage, PROFILE_VARIABLE
 from logic.reverse_mortgage import (
     calculate_reverse_mortgage_payment,
     get_input,
@@ -14,7 +18,7 @@ from logic.reverse_mortgage import (
     ExcessivePropertyValueError
 )
 
-def main():
+def main(quote_cache_path=None):
     """Main function to interact with the user and calculate the mortgage payment."""
     try:
         property_value = get_input("Enter the property value: ", float)
@@ -24,7 +28,12 @@ def main():
         spouse_age = get_input("Enter the spouse's age: ", int)
         interest_rate = get_input("Enter the interest rate (e.g., 0.05 for 5%): ", float)
 
-        monthly_payment = calculate_reverse_mortgage_payment(property_value, property_condition, marital_status, owner_age, spouse_age, interest_rate)
+        if quote_cache_path:
+            from logic.quote_cache import QuoteCache
+            with QuoteCache(quote_cache_path) as quote_cache:
+                monthly_payment = quote_cache.quote(property_value, property_condition, marital_status, owner_age, spouse_age, interest_rate)
+        else:
+            monthly_payment = calculate_reverse_mortgage_payment(property_value, property_condition, marital_status, owner_age, spouse_age, interest_rate)
         
         print(f"The monthly reverse mortgage payment is: {monthly_payment}")
 
@@ -36,5 +45,149 @@ def main():
         return  # Stop the program if there's an error
 
 
+def detect_format(path, default="csv"):
+    """Infer the file format (csv, jsonl, xlsx or columnar) from a file extension."""
+    extension = os.path.splitext(path or "")[1].lower()
+    if extension == ".rmc":
+        return "columnar"
+    if extension in (".jsonl", ".ndjson", ".json"):
+        return "jsonl"
+    if extension in (".xlsx", ".xlsm"):
+        return "xlsx"
+    if extension == ".csv":
+        return "csv"
+    return default
+
+def run_batch(input_path, output_path=None, input_format=None, output_format=None, chunk_size=10_000, workers=1, summary_path=None):
+    """
+    Price a portfolio file non-interactively, streaming it in fixed-size chunks.
+
+    Args:
+        input_path (str): CSV, JSONL, XLSX or columnar (.rmc) file to read,
+            or "-" for stdin.
+        output_path (str): File to write, or None/"-" for stdout. An XLSX
+            output of an XLSX input is a copy of the input with a results
+            sheet, and may be the input file itself; any other output must
+            differ from the input.
+        input_format (str): "csv", "jsonl", "xlsx" or "columnar"; inferred
+            from the extension if None.
+        output_format (str): "csv", "jsonl", "xlsx" or "columnar"; inferred
+            from the output extension, else the input format (csv for an xlsx
+            or columnar input on stdout).
+        chunk_size (int): Number of applicants priced per chunk.
+        workers (int): Number of worker processes; 1 prices in this process.
+        summary_path (str): Optional JSON file for the totals and payment
+            distribution, aggregated while the results stream by.
+
+    Returns:
+        int: The number of rows written.
+
+    Raises:
+        InvalidInputError: If the output would overwrite the input while it is read.
+    """
+    from logic.portfolio_stream import RESULT_FIELDS, price_stream, read_applicants, write_results
+
+    input_format = input_format or detect_format(None if input_path == "-" else input_path)
+    if output_path in (None, "-"):
+        output_format = output_format or ("csv" if input_format in ("xlsx", "columnar") else input_format)
+    else:
+        output_format = output_format or detect_format(output_path, input_format)
+    if output_format in ("xlsx", "columnar") and output_path in (None, "-"):
+        raise InvalidInputError(f"An {output_format} output needs an --output file.")
+    if (input_path != "-" and output_path not in (None, "-") and os.path.exists(output_path)
+            and os.path.samefile(input_path, output_path) and not (input_format == output_format == "xlsx")):
+        raise InvalidInputError(f"The output file must differ from the input file. You entered: {output_path}.")
+
+    source = None
+    target = None
+    try:
+        if input_format == "xlsx":
+            from logic.workbook import read_workbook_applicants
+            applicants = read_workbook_applicants(input_path)
+        elif input_format == "columnar":
+            from logic.columnar import ColumnarFile
+            source = ColumnarFile(input_path)
+            applicants = source.iter_applicants(chunk_size)
+        else:
+            source = sys.stdin if input_path == "-" else open(input_path, newline="", encoding="utf-8")
+            applicants = read_applicants(source, input_format)
+
+        if workers == 1:
+            results = price_stream(applicants, chunk_size)
+        else:
+            from logic.parallel_pricing import price_in_parallel
+            results = price_in_parallel(applicants, workers or None, chunk_size)
+
+        if summary_path:
+            from logic.aggregation import aggregate_stream
+            aggregator, results = aggregate_stream(results)
+
+        if output_format == "xlsx":
+            from itertools import chain
+            from logic.workbook import add_sheet, write_workbook
+            rows = chain([RESULT_FIELDS], (applicant + (monthly_payment, error) for applicant, monthly_payment, error in results))
+            if input_format == "xlsx":
+                count = add_sheet(input_path, output_path, rows) - 1
+            else:
+                count = write_workbook(output_path, rows) - 1
+        elif output_format == "columnar":
+            from logic.columnar import ColumnarWriter
+            with ColumnarWriter(output_path, RESULT_FIELDS) as writer:
+                writer.write_rows(applicant + (monthly_payment, error) for applicant, monthly_payment, error in results)
+            count = writer.rows
+        else:
+            target = sys.stdout if output_path in (None, "-") else open(output_path, "w", newline="", encoding="utf-8")
+            count = write_results(results, target, output_format)
+
+        if summary_path:
+            import json
+            with open(summary_path, "w", encoding="utf-8") as summary:
+                json.dump(aggregator.report(), summary, indent=2)
+        return count
+    finally:
+        if source is not None and source is not sys.stdin:
+            source.close()
+        if target is not None and target is not sys.stdout:
+            target.close()
+
+def parse_arguments(argv=None):
+    """Parse the command line options of the console entry point."""
+    parser = argparse.ArgumentParser(description="Reverse mortgage calculator. Without --input it asks for one applicant interactively.")
+    parser.add_argument("--worker", action="store_true", help="Serve newline-delimited JSON quote requests from stdin until end of input.")
+    parser.add_argument("--input", "-i", help="CSV, JSONL, XLSX or columnar (.rmc) portfolio to price, or '-' to read from stdin.")
+    parser.add_argument("--output", "-o", help="File to write the results to (default: stdout).")
+    parser.add_argument("--format", choices=["csv", "jsonl", "xlsx", "columnar"], help="Input format (default: inferred from the file extension, csv for stdin).")
+    parser.add_argument("--output-format", choices=["csv", "jsonl", "xlsx", "columnar"], help="Output format (default: same as the input).")
+    parser.add_argument("--chunk-size", type=int, default=10_000, help="Number of applicants priced per chunk (default: 10000).")
+    parser.add_argument("--quote-cache", help="SQLite file used to cache interactive quotes across runs.")
+    parser.add_argument("--workers", type=int, default=1, help="Worker processes for batch pricing; 0 uses every CPU (default: 1).")
+    parser.add_argument("--summary", help="JSON file for portfolio totals and payment distribution of a batch run.")
+    parser.add_argument("--profile", default=os.environ.get(PROFILE_VARIABLE) or None,
+                        help=f"Directory for a CPU and memory profile of the run: a hot-spot report and raw files for flame-graph tools (default: ${PROFILE_VARIABLE}, off if unset).")
+    parser.add_argument("--profile-top", type=int, default=20, help="Functions and allocation sites listed in the profile report (default: 20).")
+    return parser.parse_args(argv)
+
+def run(arguments):
+    """Run the mode selected by the command line options."""
+    if arguments.worker:
+        from logic.worker import run_worker
+        run_worker()
+    elif arguments.input:
+        run_batch(arguments.input, arguments.output, arguments.format, arguments.output_format, arguments.chunk_size, arguments.workers, arguments.summary)
+    else:
+        main(arguments.quote_cache)
+
+def cli(argv=None):
+    """Console entry point: parse the options and run, profiled if --profile is given."""
+    arguments = parse_arguments(argv)
+    if arguments.profile:
+        from logic.profiling import PricingProfiler
+        with PricingProfiler(arguments.profile, arguments.profile_top):
+            run(arguments)
+        print(f"Profile written to {arguments.profile}", file=sys.stderr)
+    else:
+        run(arguments)
+
+
 if __name__ == "__main__":
-    main()
+    cli()
@@ -0,0 +1,233 @@
+# Servicio HTTP/JSON de cotizaciones con micro-lotes
+import argparse
+import asyncio
+import json
+import os
+import sys
+import time
+from collections import deque
+if not __package__:
+    # Ejecutado como script (python src/console/quote_service.py): el paquete logic está junto a esta carpeta
+    sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+from logic import instrumentation
+from logic.parallel_pricing import price_chunk_safely
+from logic.portfolio_stream import APPLICANT_FIELDS, normalize_applicant
+
+class QuoteBatcher:
+    """
+    Collects concurrent quote requests into micro-batches and prices each batch in one pass.
+
+    A batch is closed when it reaches max_batch_size or when max_delay seconds
+    have passed since its first request. Pending requests wait in a bounded
+    queue; when the queue is full, new requests are rejected immediately so
+    the service sheds load instead of building an unbounded backlog.
+    """
+
+    def __init__(self, max_batch_size=256, max_delay=0.002, queue_size=10_000, latency_window=100_000):
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self.queue = asyncio.Queue(maxsize=queue_size)
+        self.batch_ready = asyncio.Event()
+        self.latencies = deque(maxlen=latency_window)
+        self.batches = 0
+        self.quotes = 0
+        self.rejected = 0
+        self.worker = None
+
+    def start(self):
+        """Start the background batching task."""
+        self.worker = asyncio.get_running_loop().create_task(self.run())
+
+    async def stop(self):
+        """Stop the background batching task."""
+        if self.worker is not None:
+            self.worker.cancel()
+            try:
+                await self.worker
+            except asyncio.CancelledError:
+                pass
+
+    async def quote(self, applicant):
+        """
+        Queue one applicant and wait for its (monthly_payment, error) result.
+
+        Returns:
+            tuple: (monthly_payment, error) as produced by price_chunk_safely,
+            or None if the queue is full.
+        """
+        future = asyncio.get_running_loop().create_future()
+        try:
+            self.queue.put_nowait((applicant, future, time.perf_counter()))
+        except asyncio.QueueFull:
+            self.rejected += 1
+            return None
+        if self.queue.qsize() >= self.max_batch_size:
+            self.batch_ready.set()
+        return await future
+
+    async def run(self):
+        """Close and price batches until cancelled."""
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.queue.get()]
+            deadline = loop.time() + self.max_delay
+            while True:
+                while len(batch) < self.max_batch_size and not self.queue.empty():
+                    batch.append(self.queue.get_nowait())
+                timeout = deadline - loop.time()
+                if len(batch) >= self.max_batch_size or timeout <= 0:
+                    break
+                # Sleep until the deadline or until a full batch is waiting.
+                self.batch_ready.clear()
+                try:
+                    await asyncio.wait_for(self.batch_ready.wait(), timeout)
+                except asyncio.TimeoutError:
+                    pass
+            self.price(batch)
+
+    def price(self, batch):
+        """Price one batch and resolve the futures of its requests."""
+        results = price_chunk_safely([applicant for applicant, _, _ in batch])
+        finished = time.perf_counter()
+        for (_, future, started), (monthly_payment, error) in zip(batch, results):
+            if not future.done():
+                future.set_result((monthly_payment, error))
+            self.latencies.append(finished - started)
+        self.batches += 1
+        self.quotes += len(batch)
+
+    def metrics(self):
+        """
+        Return service counters and p50/p99 queue-to-result latency in milliseconds.
+
+        When pricing instrumentation is enabled, its snapshot is included
+        under "pricing".
+        """
+        latencies = sorted(self.latencies)
+
+        def latency_percentile(percent):
+            if not latencies:
+                return None
+            return latencies[min(len(latencies) - 1, int(len(latencies) * percent / 100))] * 1000
+
+        metrics = {
+            "quotes": self.quotes,
+            "batches": self.batches,
+            "rejected": self.rejected,
+            "queue_depth": self.queue.qsize(),
+            "mean_batch_size": self.quotes / self.batches if self.batches else 0,
+            "latency_p50_ms": latency_percentile(50),
+            "latency_p99_ms": latency_percentile(99),
+        }
+        recorder = instrumentation.current()
+        if recorder is not None:
+            metrics["pricing"] = recorder.snapshot()
+        return metrics
+
+async def read_request(reader):
+    """
+    Read one HTTP/1.1 request.
+
+    Returns:
+        tuple: (method, path, headers, body), or None when the client closed the connection.
+    """
+    request_line = await reader.readline()
+    if not request_line:
+        return None
+    method, path, _ = request_line.decode("latin-1").split(" ", 2)
+    headers = {}
+    while True:
+        line = await reader.readline()
+        if line in (b"\r\n", b"\n", b""):
+            break
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    body = await reader.readexactly(int(headers.get("content-length", 0)))
+    return method, path, headers, body
+
+def write_response(writer, status, payload, keep_alive):
+    """Write one JSON HTTP response."""
+    reasons = {200: "OK", 400: "Bad Request", 404: "Not Found", 422: "Unprocessable Entity", 503: "Service Unavailable"}
+    body = json.dumps(payload).encode("utf-8")
+    writer.write(
+        f"HTTP/1.1 {status} {reasons[status]}\r\nContent-Type: application/json\r\n"
+        f"Content-Length: {len(body)}\r\nConnection: {'keep-alive' if keep_alive else 'close'}\r\n\r\n".encode("latin-1") + body)
+
+async def handle_quote(batcher, body):
+    """Return (status, payload) for a POST /quote body."""
+    try:
+        record = json.loads(body)
+    except ValueError:
+        return 400, {"error": "InvalidInputError", "message": "Request body must be a JSON object."}
+    if not isinstance(record, dict):
+        return 400, {"error": "InvalidInputError", "message": "Request body must be a JSON object."}
+
+    result = await batcher.quote(normalize_applicant(record))
+    if result is None:
+        return 503, {"error": "ServiceOverloaded", "message": "Quote queue is full, retry later."}
+    monthly_payment, error = result
+    if error:
+        return 422, {"error": error}
+    return 200, {"monthly_payment": monthly_payment}
+
+def connection_handler(batcher):
+    """Return the asyncio connection callback serving /quote and /metrics."""
+    async def handle_connection(reader, writer):
+        try:
+            while True:
+                request = await read_request(reader)
+                if request is None:
+                    break
+                method, path, headers, body = request
+                keep_alive = headers.get("connection", "").lower() != "close"
+                if method == "POST" and path == "/quote":
+                    status, payload = await handle_quote(batcher, body)
+                elif method == "GET" and path == "/metrics":
+                    status, payload = 200, batcher.metrics()
+                else:
+                    status, payload = 404, {"error": "NotFound", "message": f"Use POST /quote with the fields {', '.join(APPLICANT_FIELDS)} or GET /metrics."}
+                write_response(writer, status, payload, keep_alive)
+                await writer.drain()
+                if not keep_alive:
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+    return handle_connection
+
+async def serve(host="127.0.0.1", port=8080, max_batch_size=256, max_delay=0.002, queue_size=10_000, instrument=False):
+    """Run the quote service until cancelled."""
+    if instrument:
+        instrumentation.enable()
+    batcher = QuoteBatcher(max_batch_size, max_delay, queue_size)
+    batcher.start()
+    server = await asyncio.start_server(connection_handler(batcher), host, port)
+    try:
+        async with server:
+            await server.serve_forever()
+    finally:
+        await batcher.stop()
+
+def parse_arguments(argv=None):
+    """Parse the command line options of the quote service."""
+    parser = argparse.ArgumentParser(description="Local HTTP/JSON reverse mortgage quote service with micro-batching.")
+    parser.add_argument("--host", default="127.0.0.1", help="Address to listen on (default: 127.0.0.1).")
+    parser.add_argument("--port", type=int, default=8080, help="Port to listen on (default: 8080).")
+    parser.add_argument("--max-batch-size", type=int, default=256, help="Largest micro-batch (default: 256).")
+    parser.add_argument("--max-delay-ms", type=float, default=2.0, help="Longest wait to fill a micro-batch, in milliseconds (default: 2).")
+    parser.add_argument("--queue-size", type=int, default=10_000, help="Pending quotes accepted before returning 503 (default: 10000).")
+    parser.add_argument("--instrument", action="store_true", help="Report per-stage pricing timers and failure counters in /metrics.")
+    return parser.parse_args(argv)
+
+def cli(argv=None):
+    """Quote service entry point: parse the options and serve until interrupted."""
+    arguments = parse_arguments(argv)
+    try:
+        asyncio.run(serve(arguments.host, arguments.port, arguments.max_batch_size, arguments.max_delay_ms / 1000, arguments.queue_size, arguments.instrument))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    cli()
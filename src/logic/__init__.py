@@ -1 +1,6 @@
-# Este archivo convierte a una carpeta en un paquete que puede ser importado desde otra carpeta
\ No newline at end of file
+# Este archivo convierte a una carpeta en un paquete que puede ser importado desde otra carpeta
+
+# Variable de entorno con el directorio donde una ejecución perfilada escribe su
+# perfil. La leen console.py y python -m logic cuando no se pasa --profile;
+# se define aquí para no importar logic.profiling cuando el perfil está apagado.
+PROFILE_VARIABLE = "REVERSE_MORTGAGE_PROFILE"
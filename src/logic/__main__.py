@@ -0,0 +1,15 @@
+# Punto de entrada del paquete: python -m logic (con el paquete instalado, pip install -e ., o con src en PYTHONPATH)
+# Inicia el modo trabajador, que lee solicitudes JSON por stdin y responde por stdout.
+# Con REVERSE_MORTGAGE_PROFILE definido, escribe un perfil de CPU y memoria en ese directorio.
+import os
+
+from logic import PROFILE_VARIABLE
+from logic.worker import run_worker
+
+if __name__ == "__main__":
+    if os.environ.get(PROFILE_VARIABLE):
+        from logic.profiling import PricingProfiler
+        with PricingProfiler(os.environ[PROFILE_VARIABLE]):
+            run_worker()
+    else:
+        run_worker()
@@ -0,0 +1,267 @@
+# aggregation.py
+import math
+
+from logic.reverse_mortgage import get_life_expectancy
+
+GROUP_FIELDS = ("property_condition", "marital_status", "life_expectancy_years")
+
+class RunningStats:
+    """
+    Count, mean, variance and range of a stream of values in O(1) memory.
+
+    The mean and the sum of squared deviations are updated with Welford's
+    algorithm, and two partial results are combined with the pairwise formula
+    of Chan et al., so the result does not depend on how the stream was split.
+    """
+
+    def __init__(self):
+        self.count = 0
+        self.mean = 0.0
+        self.squared_deviations = 0.0
+        self.minimum = None
+        self.maximum = None
+
+    def add(self, value):
+        """Add one value."""
+        self.count += 1
+        delta = value - self.mean
+        self.mean += delta / self.count
+        self.squared_deviations += delta * (value - self.mean)
+        if self.minimum is None or value < self.minimum:
+            self.minimum = value
+        if self.maximum is None or value > self.maximum:
+            self.maximum = value
+
+    def merge(self, other):
+        """Add the values summarized by another RunningStats."""
+        if not other.count:
+            return
+        if not self.count:
+            self.count, self.mean, self.squared_deviations = other.count, other.mean, other.squared_deviations
+            self.minimum, self.maximum = other.minimum, other.maximum
+            return
+        count = self.count + other.count
+        delta = other.mean - self.mean
+        self.mean += delta * other.count / count
+        self.squared_deviations += other.squared_deviations + delta * delta * self.count * other.count / count
+        self.count = count
+        self.minimum = min(self.minimum, other.minimum)
+        self.maximum = max(self.maximum, other.maximum)
+
+    @property
+    def variance(self):
+        """Return the sample variance (n - 1 in the denominator), or 0.0 below two values."""
+        return self.squared_deviations / (self.count - 1) if self.count > 1 else 0.0
+
+    def to_dict(self):
+        return {
+            "count": self.count,
+            "mean": self.mean,
+            "variance": self.variance,
+            "minimum": self.minimum,
+            "maximum": self.maximum,
+        }
+
+class QuantileSketch:
+    """
+    Mergeable quantile sketch with a bounded relative error.
+
+    Positive values are counted in logarithmic buckets whose bounds grow by a
+    factor gamma = (1 + relative_accuracy) / (1 - relative_accuracy), so any
+    quantile is returned within relative_accuracy of a true value and the
+    number of buckets only grows with the log of the value range (about 1,000
+    buckets cover 1 to 10^9 at 1%). Merging adds bucket counts, so sketches
+    built on separate chunks or processes combine exactly.
+    """
+
+    def __init__(self, relative_accuracy=0.01):
+        self.relative_accuracy = relative_accuracy
+        self.gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self.log_gamma = math.log(self.gamma)
+        self.buckets = {}
+        self.zero_count = 0
+        self.count = 0
+
+    def add(self, value):
+        """Add one non-negative value."""
+        self.count += 1
+        if value <= 0:
+            self.zero_count += 1
+            return
+        key = math.ceil(math.log(value) / self.log_gamma)
+        self.buckets[key] = self.buckets.get(key, 0) + 1
+
+    def merge(self, other):
+        """
+        Add the values of another sketch.
+
+        Raises:
+            ValueError: If the sketches have different accuracies.
+        """
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Only sketches with the same relative accuracy can be merged.")
+        for key, count in other.buckets.items():
+            self.buckets[key] = self.buckets.get(key, 0) + count
+        self.zero_count += other.zero_count
+        self.count += other.count
+
+    def quantile(self, fraction):
+        """
+        Return the value at a quantile.
+
+        Args:
+            fraction (float): The quantile, between 0 and 1.
+
+        Returns:
+            float or None: The estimate, or None if the sketch is empty.
+        """
+        if not self.count:
+            return None
+        rank = fraction * (self.count - 1)
+        if rank < self.zero_count:
+            return 0.0
+        seen = self.zero_count
+        for key in sorted(self.buckets):
+            seen += self.buckets[key]
+            if seen > rank:
+                # The point of (gamma^(key-1), gamma^key] within the relative
+                # accuracy of both ends of the bucket.
+                return 2 * self.gamma ** key / (self.gamma + 1)
+        return 2 * self.gamma ** max(self.buckets) / (self.gamma + 1)
+
+class PortfolioAggregator:
+    """
+    Single-pass totals and distributions of priced portfolio rows.
+
+    It keeps running statistics and a quantile sketch of the monthly payment,
+    the exact total outflow in cents, the same statistics grouped by property
+    condition, marital status and life expectancy bucket, and the number of
+    rejected rows by exception name. Memory depends only on the number of
+    distinct group values and sketch buckets, never on the number of rows, and
+    aggregators built on separate chunks or worker processes can be merged.
+    """
+
+    def __init__(self, relative_accuracy=0.01):
+        self.relative_accuracy = relative_accuracy
+        self.payments = RunningStats()
+        self.sketch = QuantileSketch(relative_accuracy)
+        self.total_cents = 0
+        self.groups = {field: {} for field in GROUP_FIELDS}
+        self.errors = {}
+
+    def add(self, applicant, monthly_payment, error=None):
+        """
+        Add one priced row.
+
+        Args:
+            applicant (tuple): The applicant in APPLICANT_FIELDS order.
+            monthly_payment (float): Its payment, or None if it was rejected.
+            error (str): The exception name of a rejected row.
+        """
+        if error is not None or monthly_payment is None:
+            self.errors[error] = self.errors.get(error, 0) + 1
+            return
+        _, property_condition, marital_status, owner_age, spouse_age, _ = applicant
+        self.payments.add(monthly_payment)
+        self.sketch.add(monthly_payment)
+        self.total_cents += round(monthly_payment * 100)
+        for field, value in zip(GROUP_FIELDS, (property_condition, marital_status, get_life_expectancy(min(owner_age, spouse_age)))):
+            group = self.groups[field].get(value)
+            if group is None:
+                group = self.groups[field][value] = RunningStats()
+            group.add(monthly_payment)
+
+    def add_rows(self, rows):
+        """
+        Add (applicant, monthly_payment, error) rows, as produced by price_stream.
+
+        Returns:
+            PortfolioAggregator: This aggregator.
+        """
+        add = self.add
+        for applicant, monthly_payment, error in rows:
+            add(applicant, monthly_payment, error)
+        return self
+
+    def add_chunk(self, applicants, results):
+        """
+        Add one chunk given as applicants and their (monthly_payment, error)
+        results, as returned by price_chunk_safely.
+
+        Returns:
+            PortfolioAggregator: This aggregator.
+        """
+        add = self.add
+        for applicant, (monthly_payment, error) in zip(applicants, results):
+            add(applicant, monthly_payment, error)
+        return self
+
+    def merge(self, other):
+        """
+        Add the rows summarized by another aggregator.
+
+        Returns:
+            PortfolioAggregator: This aggregator.
+        """
+        self.payments.merge(other.payments)
+        self.sketch.merge(other.sketch)
+        self.total_cents += other.total_cents
+        for field, groups in other.groups.items():
+            for value, stats in groups.items():
+                self.groups[field].setdefault(value, RunningStats()).merge(stats)
+        for error, count in other.errors.items():
+            self.errors[error] = self.errors.get(error, 0) + count
+        return self
+
+    def report(self, quantiles=(0.05, 0.5, 0.95, 0.99)):
+        """
+        Return the aggregates as a JSON-ready dict.
+
+        Args:
+            quantiles (sequence of float): Payment quantiles to estimate.
+
+        Returns:
+            dict: "priced" and "rejected" row counts, "total_monthly_outflow",
+            "payment" statistics with "quantiles", "by_<field>" statistics for
+            each group field and "errors" counts by exception name.
+        """
+        payment = self.payments.to_dict()
+        payment["quantiles"] = {}
+        for fraction in quantiles:
+            estimate = self.sketch.quantile(fraction)
+            if estimate is not None:
+                # The exact extremes are known, so no estimate falls outside them.
+                estimate = min(max(estimate, self.payments.minimum), self.payments.maximum)
+            payment["quantiles"][str(fraction)] = estimate
+        report = {
+            "priced": self.payments.count,
+            "rejected": sum(self.errors.values()),
+            "total_monthly_outflow": self.total_cents / 100,
+            "payment": payment,
+        }
+        for field in GROUP_FIELDS:
+            report[f"by_{field}"] = {str(value): stats.to_dict() for value, stats in sorted(self.groups[field].items(), key=lambda item: str(item[0]))}
+        report["errors"] = dict(sorted(self.errors.items()))
+        return report
+
+def aggregate_stream(rows, relative_accuracy=0.01):
+    """
+    Aggregate priced rows and pass them through unchanged.
+
+    Args:
+        rows (iterable of tuple): (applicant, monthly_payment, error) rows.
+        relative_accuracy (float): Accuracy of the payment quantiles.
+
+    Returns:
+        tuple: (aggregator, rows), where rows is a generator that adds each
+        row to the aggregator as it is consumed.
+    """
+    aggregator = PortfolioAggregator(relative_accuracy)
+
+    def pass_through():
+        add = aggregator.add
+        for row in rows:
+            add(*row)
+            yield row
+
+    return aggregator, pass_through()
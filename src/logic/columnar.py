@@ -0,0 +1,324 @@
+# columnar.py
+import json
+import math
+import mmap
+import shutil
+import struct
+import sys
+import tempfile
+from array import array
+from itertools import chain
+
+from logic.portfolio_stream import RESULT_FIELDS, price_chunk
+from logic.reverse_mortgage import APPLICANT_FIELDS, InvalidInputError
+
+# File layout: the 8-byte MAGIC, the header length as a little-endian uint64,
+# a UTF-8 JSON header, then one little-endian column after another, each
+# starting at an 8-byte aligned offset recorded in the header.
+MAGIC = b"RMCOL\x00\x01\x00"
+ALIGNMENT = 8
+
+# Storage kind of every known field: "d" float64 with NaN for a missing value,
+# "h" int16 with MISSING_INTEGER for a missing value, and "category" for
+# dictionary-encoded values stored as uint8 codes (uint16 past 256 values).
+COLUMN_KINDS = {
+    "property_value": "d",
+    "property_condition": "category",
+    "marital_status": "category",
+    "owner_age": "h",
+    "spouse_age": "h",
+    "interest_rate": "d",
+    "monthly_payment": "d",
+    "error": "category",
+}
+MISSING_INTEGER = -32768
+SPOOL_ROWS = 65_536
+
+def _native_little_endian():
+    return sys.byteorder == "little"
+
+class _ColumnSpool:
+    """Buffers one column in a temporary file while rows are appended."""
+
+    def __init__(self, kind):
+        self.kind = kind
+        self.typecode = "H" if kind == "category" else kind
+        self.buffer = array(self.typecode)
+        self.file = tempfile.TemporaryFile()
+        self.dictionary = {}
+
+    def append(self, value):
+        kind = self.kind
+        if kind == "category":
+            if not isinstance(value, (str, int, float, bool, type(None))):
+                value = str(value)
+            code = self.dictionary.get(value)
+            if code is None:
+                code = self.dictionary[value] = len(self.dictionary)
+                if code > 0xFFFF:
+                    raise InvalidInputError("A categorical column cannot hold more than 65536 distinct values.")
+            self.buffer.append(code)
+        elif kind == "d":
+            self.buffer.append(value if value.__class__ is float or value.__class__ is int else math.nan)
+        elif value.__class__ is int and MISSING_INTEGER < value <= 32767:
+            self.buffer.append(value)
+        else:
+            self.buffer.append(MISSING_INTEGER)
+        if len(self.buffer) >= SPOOL_ROWS:
+            self.flush()
+
+    def flush(self):
+        if not _native_little_endian():
+            self.buffer.byteswap()
+        self.buffer.tofile(self.file)
+        del self.buffer[:]
+
+    def copy_to(self, target):
+        """Write the spooled column to target, narrowing small dictionaries to uint8."""
+        self.flush()
+        self.file.seek(0)
+        if self.kind == "category" and len(self.dictionary) <= 256:
+            while True:
+                block = self.file.read(2 * SPOOL_ROWS)
+                if not block:
+                    break
+                codes = array("H", block)
+                if not _native_little_endian():
+                    codes.byteswap()
+                target.write(array("B", codes).tobytes())
+        else:
+            shutil.copyfileobj(self.file, target)
+        self.file.close()
+
+    @property
+    def stored_typecode(self):
+        if self.kind == "category":
+            return "B" if len(self.dictionary) <= 256 else "H"
+        return self.typecode
+
+class ColumnarWriter:
+    """
+    Writes rows to a columnar portfolio file without holding them in memory.
+
+    Each column is spooled to its own temporary file as rows arrive; close()
+    writes the header and copies the columns one after the other.
+    """
+
+    def __init__(self, path, fields=APPLICANT_FIELDS):
+        """
+        Start a columnar file.
+
+        Args:
+            path (str): The file to write.
+            fields (sequence of str): The column names, in row order; each must
+                be a key of COLUMN_KINDS.
+
+        Raises:
+            InvalidInputError: If a field has no known storage kind.
+        """
+        unknown = [field for field in fields if field not in COLUMN_KINDS]
+        if unknown:
+            raise InvalidInputError(f"Unknown columnar fields: {', '.join(unknown)}. Must be among {', '.join(COLUMN_KINDS)}.")
+        self.path = path
+        self.fields = tuple(fields)
+        self.spools = [_ColumnSpool(COLUMN_KINDS[field]) for field in self.fields]
+        self.rows = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, error_type, error, traceback):
+        if error_type is None:
+            self.close()
+        else:
+            for spool in self.spools:
+                spool.file.close()
+
+    def write_rows(self, rows):
+        """Append rows given as tuples in field order."""
+        spools = self.spools
+        for row in rows:
+            for spool, value in zip(spools, row):
+                spool.append(value)
+            self.rows += 1
+
+    def close(self):
+        """
+        Write the file.
+
+        Returns:
+            int: The number of rows written.
+        """
+        columns = []
+        offset = 0
+        for field, spool in zip(self.fields, self.spools):
+            column = {"name": field, "typecode": spool.stored_typecode, "offset": offset}
+            if spool.kind == "category":
+                column["dictionary"] = list(spool.dictionary)
+            columns.append(column)
+            offset += _aligned(self.rows * array(spool.stored_typecode).itemsize)
+
+        # Column offsets depend on the header length and the header length on
+        # the offsets, so the data start is grown until the header fits before
+        # it; the header is then padded with spaces up to the data start.
+        relative_offsets = [column["offset"] for column in columns]
+        header = {"rows": self.rows, "columns": columns}
+        start = 0
+        while True:
+            for column, relative_offset in zip(columns, relative_offsets):
+                column["offset"] = start + relative_offset
+            encoded = json.dumps(header).encode("utf-8")
+            if len(MAGIC) + 8 + len(encoded) <= start:
+                break
+            start = _aligned(len(MAGIC) + 8 + len(encoded))
+        encoded += b" " * (start - len(MAGIC) - 8 - len(encoded))
+
+        with open(self.path, "wb") as target:
+            target.write(MAGIC + struct.pack("<Q", len(encoded)) + encoded)
+            for column, spool in zip(columns, self.spools):
+                spool.copy_to(target)
+                target.write(b"\x00" * (column["offset"] + _aligned(self.rows * array(column["typecode"]).itemsize) - target.tell()))
+        return self.rows
+
+def _aligned(size):
+    return (size + ALIGNMENT - 1) // ALIGNMENT * ALIGNMENT
+
+class ColumnarFile:
+    """
+    A memory-mapped columnar portfolio file.
+
+    Numeric columns and dictionary codes are exposed as memoryviews over the
+    mapping, so nothing is parsed or copied until values are read, and the
+    operating system pages the file in as it is scanned.
+    """
+
+    def __init__(self, path):
+        """
+        Map a file written by ColumnarWriter.
+
+        Raises:
+            InvalidInputError: If the file is not a columnar portfolio file.
+        """
+        self.file = open(path, "rb")
+        try:
+            self.map = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self.file.close()
+            raise InvalidInputError(f"'{path}' is not a columnar portfolio file.")
+        if self.map[:len(MAGIC)] != MAGIC:
+            self.close()
+            raise InvalidInputError(f"'{path}' is not a columnar portfolio file.")
+        header_length, = struct.unpack_from("<Q", self.map, len(MAGIC))
+        header = json.loads(self.map[len(MAGIC) + 8:len(MAGIC) + 8 + header_length])
+        self.rows = header["rows"]
+        self.fields = tuple(column["name"] for column in header["columns"])
+        self.dictionaries = {column["name"]: column.get("dictionary") for column in header["columns"]}
+        self.view = memoryview(self.map)
+        self.columns = {}
+        for column in header["columns"]:
+            size = self.rows * array(column["typecode"]).itemsize
+            data = self.view[column["offset"]:column["offset"] + size].cast(column["typecode"])
+            if not _native_little_endian() and column["typecode"] != "B":
+                data = array(column["typecode"], data.tobytes())
+                data.byteswap()
+            self.columns[column["name"]] = data
+
+    def __len__(self):
+        return self.rows
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, error_type, error, traceback):
+        self.close()
+
+    def close(self):
+        """Release the column views and unmap the file."""
+        columns = getattr(self, "columns", {})
+        for data in columns.values():
+            if isinstance(data, memoryview):
+                data.release()
+        columns.clear()
+        if getattr(self, "view", None) is not None:
+            self.view.release()
+            self.view = None
+        self.map.close()
+        self.file.close()
+
+    def column(self, name):
+        """
+        Return the raw stored values of a column without copying them.
+
+        Returns:
+            memoryview: Floats, int16 values or dictionary codes, by storage kind.
+        """
+        return self.columns[name]
+
+    def values(self, name, start=0, stop=None):
+        """
+        Decode a slice of a column to Python values.
+
+        Missing numbers decode to None and dictionary codes to their values.
+
+        Returns:
+            list: The values of rows start to stop.
+        """
+        stop = self.rows if stop is None else stop
+        raw = self.columns[name][start:stop].tolist()
+        dictionary = self.dictionaries[name]
+        if dictionary is not None:
+            return [dictionary[code] for code in raw]
+        if COLUMN_KINDS[name] == "d":
+            return [None if value != value else value for value in raw]
+        return [None if value == MISSING_INTEGER else value for value in raw]
+
+    def iter_chunks(self, fields=APPLICANT_FIELDS, chunk_size=100_000):
+        """
+        Decode the file in chunks of rows.
+
+        Yields:
+            list: Up to chunk_size tuples with the given fields, in file order.
+        """
+        for start in range(0, self.rows, chunk_size):
+            stop = min(start + chunk_size, self.rows)
+            yield list(zip(*(self.values(field, start, stop) for field in fields)))
+
+    def iter_applicants(self, chunk_size=100_000):
+        """Yield every row as an applicant tuple in APPLICANT_FIELDS order."""
+        return chain.from_iterable(self.iter_chunks(APPLICANT_FIELDS, chunk_size))
+
+def write_columnar(path, rows, fields=APPLICANT_FIELDS):
+    """
+    Write rows to a columnar portfolio file.
+
+    Args:
+        path (str): The file to write.
+        rows (iterable of tuple): Rows in field order, e.g. from read_applicants.
+        fields (sequence of str): The column names.
+
+    Returns:
+        int: The number of rows written.
+    """
+    with ColumnarWriter(path, fields) as writer:
+        writer.write_rows(rows)
+    return writer.rows
+
+def price_columnar(input_path, output_path, chunk_size=100_000):
+    """
+    Price a columnar applicant file into a columnar results file.
+
+    Only one chunk of decoded rows is held in memory at a time, so books far
+    larger than RAM can be priced.
+
+    Args:
+        input_path (str): A columnar file with the APPLICANT_FIELDS columns.
+        output_path (str): The columnar file to write, with the RESULT_FIELDS columns.
+        chunk_size (int): Number of applicants priced per chunk.
+
+    Returns:
+        int: The number of rows written.
+    """
+    with ColumnarFile(input_path) as source, ColumnarWriter(output_path, RESULT_FIELDS) as writer:
+        for chunk in source.iter_chunks(APPLICANT_FIELDS, chunk_size):
+            writer.write_rows(applicant + (monthly_payment, error) for applicant, monthly_payment, error in price_chunk(chunk))
+    return writer.rows
@@ -0,0 +1,178 @@
+# instrumentation.py
+import time
+
+from logic import reverse_mortgage
+from logic.reverse_mortgage import DEFAULT_PRODUCT, _monthly_payment, validate_inputs
+
+STAGES = ("validation", "condition_adjustment", "life_expectancy", "annuity", "batch")
+
+class PricingInstrumentation:
+    """
+    Per-stage timers and counters for the pricing functions.
+
+    While installed with enable(), calculate_reverse_mortgage_payment is priced
+    through price(), which calls the same validation and payment functions
+    and times each stage, and calculate_reverse_mortgage_payments is timed as a
+    whole "batch" stage. Validation failures are counted by exception class.
+    The recorder is not locked; use one per process (worker processes of
+    parallel pricing keep their own).
+    """
+
+    def __init__(self, clock=time.perf_counter):
+        self.clock = clock
+        self.reset()
+
+    def reset(self):
+        """Set every timer and counter back to zero."""
+        self.stage_seconds = dict.fromkeys(STAGES, 0.0)
+        self.stage_calls = dict.fromkeys(STAGES, 0)
+        self.quotes = 0
+        self.batch_rows = 0
+        self.validation_failures = {}
+
+    def record(self, stage, started):
+        """Add the time since started to a stage and return the current clock."""
+        now = self.clock()
+        self.stage_seconds[stage] += now - started
+        self.stage_calls[stage] += 1
+        return now
+
+    def count_failure(self, error):
+        """Count one validation failure under the name of its exception class."""
+        name = type(error).__name__
+        self.validation_failures[name] = self.validation_failures.get(name, 0) + 1
+
+    def price(self, property_value, property_condition, marital_status, owner_age, spouse_age, interest_rate, life_table=None, product=None):
+        """
+        Price one applicant like calculate_reverse_mortgage_payment, timing each stage.
+
+        Returns:
+            float: The calculated monthly mortgage payment.
+
+        Raises:
+            Any exception raised by validate_inputs, after counting it.
+        """
+        if product is None:
+            product = DEFAULT_PRODUCT
+        self.quotes += 1
+        started = self.clock()
+        try:
+            validate_inputs(property_value, property_condition, marital_status, owner_age, spouse_age, interest_rate, product)
+        except Exception as error:
+            self.record("validation", started)
+            self.count_failure(error)
+            raise
+        started = self.record("validation", started)
+
+        adjusted_value = property_value * product.condition_adjustment[property_condition]
+        started = self.record("condition_adjustment", started)
+
+        if life_table is None:
+            life_expectancy_months = product.life_expectancy_months[min(owner_age, spouse_age)]
+        else:
+            life_expectancy_months = life_table.life_expectancy_months(marital_status, owner_age, spouse_age)
+        started = self.record("life_expectancy", started)
+
+        monthly_payment = _monthly_payment(adjusted_value * product.loan_percentage, interest_rate, life_expectancy_months)
+        self.record("annuity", started)
+        return monthly_payment
+
+    def price_batch(self, price, columns, life_table=None, product=None):
+        """
+        Run a batch pricing function, timing it as the "batch" stage.
+
+        Args:
+            price (callable): Prices (columns, life_table, product) and returns the payments.
+            columns (tuple): The six applicant columns.
+            life_table (LifeTable): Optional mortality table.
+            product (ProductConfig): The product to price (default: DEFAULT_PRODUCT).
+
+        Returns:
+            list: The payments returned by price.
+        """
+        if product is None:
+            product = DEFAULT_PRODUCT
+        started = self.clock()
+        try:
+            payments = price(columns, life_table, product)
+        except Exception as error:
+            self.record("batch", started)
+            self.count_failure(error)
+            raise
+        self.record("batch", started)
+        self.batch_rows += len(payments)
+        return payments
+
+    def snapshot(self):
+        """
+        Return the current timers and counters.
+
+        Returns:
+            dict: "quotes" and "batch_rows" counts, "stages" mapping each stage
+            to its "calls", "seconds" and "mean_microseconds", and
+            "validation_failures" mapping exception class names to counts.
+        """
+        return {
+            "quotes": self.quotes,
+            "batch_rows": self.batch_rows,
+            "stages": {
+                stage: {
+                    "calls": self.stage_calls[stage],
+                    "seconds": self.stage_seconds[stage],
+                    "mean_microseconds": self.stage_seconds[stage] / self.stage_calls[stage] * 1e6 if self.stage_calls[stage] else 0.0,
+                }
+                for stage in STAGES
+            },
+            "validation_failures": dict(self.validation_failures),
+        }
+
+    def prometheus_text(self, prefix="reverse_mortgage"):
+        """
+        Return the timers and counters in the Prometheus text exposition format.
+
+        Args:
+            prefix (str): Prefix of every metric name.
+
+        Returns:
+            str: The metrics, one sample per line.
+        """
+        lines = [
+            f"# HELP {prefix}_quotes_total Applicants priced one at a time.",
+            f"# TYPE {prefix}_quotes_total counter",
+            f"{prefix}_quotes_total {self.quotes}",
+            f"# HELP {prefix}_batch_rows_total Applicants priced in batches.",
+            f"# TYPE {prefix}_batch_rows_total counter",
+            f"{prefix}_batch_rows_total {self.batch_rows}",
+            f"# HELP {prefix}_stage_seconds_total Time spent in each pricing stage.",
+            f"# TYPE {prefix}_stage_seconds_total counter",
+        ]
+        lines.extend(f'{prefix}_stage_seconds_total{{stage="{stage}"}} {self.stage_seconds[stage]!r}' for stage in STAGES)
+        lines.append(f"# HELP {prefix}_stage_calls_total Calls of each pricing stage.")
+        lines.append(f"# TYPE {prefix}_stage_calls_total counter")
+        lines.extend(f'{prefix}_stage_calls_total{{stage="{stage}"}} {self.stage_calls[stage]}' for stage in STAGES)
+        lines.append(f"# HELP {prefix}_validation_failures_total Rejected applicants by exception class.")
+        lines.append(f"# TYPE {prefix}_validation_failures_total counter")
+        lines.extend(f'{prefix}_validation_failures_total{{exception="{name}"}} {count}' for name, count in sorted(self.validation_failures.items()))
+        return "\n".join(lines) + "\n"
+
+def enable(recorder=None):
+    """
+    Install a recorder on the pricing functions.
+
+    Args:
+        recorder (PricingInstrumentation): The recorder to install; a new one
+            if None.
+
+    Returns:
+        PricingInstrumentation: The installed recorder.
+    """
+    reverse_mortgage.instrumentation = recorder or PricingInstrumentation()
+    return reverse_mortgage.instrumentation
+
+def disable():
+    """Remove the recorder, returning the pricing functions to their untimed path."""
+    reverse_mortgage.instrumentation = None
+
+def current():
+    """Return the installed recorder, or None when instrumentation is off."""
+    return reverse_mortgage.instrumentation
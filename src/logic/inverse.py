@@ -0,0 +1,167 @@
+# inverse.py
+from logic.reverse_mortgage import (
+    DEFAULT_PRODUCT,
+    _monthly_payment,
+    get_annuity_terms,
+    validate_inputs,
+    InvalidInputError,
+    UnattainablePaymentError
+)
+
+def _check_columns(columns):
+    """Raise InvalidInputError unless every column has the same length."""
+    row_count = len(columns[0])
+    if any(len(column) != row_count for column in columns):
+        raise InvalidInputError(f"All input columns must have the same length. You entered lengths: {', '.join(str(len(column)) for column in columns)}.")
+
+def _target_error(target):
+    """Return the error name for a target that is not a positive number, else None."""
+    if not isinstance(target, (int, float)) or isinstance(target, bool):
+        return "DataTypeError"
+    if target <= 0:
+        return UnattainablePaymentError.__name__
+    return None
+
+def solve_property_values(target_payments, property_conditions, marital_statuses, owner_ages, spouse_ages, interest_rates, life_table=None, product=None):
+    """
+    Find the property value that gives each target monthly payment.
+
+    The payment is linear in the property value in both branches of the
+    formula: mortgage_amount * monthly_rate / annuity_denominator, or
+    mortgage_amount / months when that annuity would pay out more than the
+    mortgage amount. Which branch applies depends only on the rate and the
+    term, so each row is inverted exactly in closed form. The returned value
+    prices to round(target, 2) with calculate_reverse_mortgage_payment. A
+    value just outside the property value limits is clamped to the limit
+    when the limit itself prices to round(target, 2), since rounding to the
+    cent makes the payments at the limits reachable from slightly beyond them.
+
+    Args:
+        target_payments (sequence of float): The wanted monthly payments.
+        property_conditions (sequence of str): The conditions of the properties.
+        marital_statuses (sequence of str): The marital statuses of the owners.
+        owner_ages (sequence of int): The ages of the owners.
+        spouse_ages (sequence of int): The ages of the spouses.
+        interest_rates (sequence of float): The interest rates of the mortgages.
+        life_table (LifeTable): Optional mortality table giving the payment
+            terms; by default the terms come from the product.
+        product (ProductConfig): The product to price (default: DEFAULT_PRODUCT).
+
+    Returns:
+        list: One (property_value, error) tuple per row, in input order. error
+        is None on success, the exception name validate_inputs raises for the
+        other inputs, or "UnattainablePaymentError" when the value would fall
+        outside the product's property value limits.
+
+    Raises:
+        InvalidInputError: If the columns do not have the same length.
+    """
+    columns = (target_payments, property_conditions, marital_statuses, owner_ages, spouse_ages, interest_rates)
+    _check_columns(columns)
+
+    if product is None:
+        product = DEFAULT_PRODUCT
+    condition_adjustment = product.condition_adjustment
+    loan_percentage = product.loan_percentage
+    results = []
+    append = results.append
+
+    for target, property_condition, marital_status, owner_age, spouse_age, interest_rate in zip(*columns):
+        error = _target_error(target)
+        if error is None:
+            try:
+                validate_inputs(product.minimum_property_value, property_condition, marital_status, owner_age, spouse_age, interest_rate, product)
+            except Exception as exception:
+                error = type(exception).__name__
+        if error is not None:
+            append((None, error))
+            continue
+
+        if life_table is None:
+            months = product.life_expectancy_months[min(owner_age, spouse_age)]
+        else:
+            months = life_table.life_expectancy_months(marital_status, owner_age, spouse_age)
+        monthly_interest_rate, annuity_denominator = get_annuity_terms(interest_rate, months)
+        if not annuity_denominator or monthly_interest_rate / annuity_denominator * months > 1:
+            payment_per_amount = 1 / months
+        else:
+            payment_per_amount = monthly_interest_rate / annuity_denominator
+
+        adjustment = condition_adjustment[property_condition] * loan_percentage
+        property_value = target / (payment_per_amount * adjustment)
+        if product.minimum_property_value <= property_value <= product.maximum_property_value:
+            append((property_value, None))
+            continue
+        limit = product.minimum_property_value if property_value < product.minimum_property_value else product.maximum_property_value
+        if _monthly_payment(limit * adjustment, interest_rate, months) == round(target, 2):
+            append((limit, None))
+        else:
+            append((None, UnattainablePaymentError.__name__))
+
+    return results
+
+def solve_interest_rates(target_payments, property_values, property_conditions, marital_statuses, owner_ages, spouse_ages, life_table=None, product=None):
+    """
+    Find the interest rates that give each target monthly payment.
+
+    For every valid rate (0 < rate <= the product's maximum interest rate)
+    the annuity payment over the term is larger than the mortgage amount,
+    since monthly_rate / (1 - (1 + monthly_rate) ** -months) > 1 / months
+    whenever monthly_rate > 0. The payment is therefore
+    always capped at mortgage_amount / months and does not depend on the rate:
+    a target is either reached by every valid rate or by none, and no
+    iterative search is needed.
+
+    Args:
+        target_payments (sequence of float): The wanted monthly payments.
+        property_values (sequence of int or float): The values of the properties.
+        property_conditions (sequence of str): The conditions of the properties.
+        marital_statuses (sequence of str): The marital statuses of the owners.
+        owner_ages (sequence of int): The ages of the owners.
+        spouse_ages (sequence of int): The ages of the spouses.
+        life_table (LifeTable): Optional mortality table giving the payment
+            terms; by default the terms come from the product.
+        product (ProductConfig): The product to price (default: DEFAULT_PRODUCT).
+
+    Returns:
+        list: One (interest_rates, error) tuple per row, in input order.
+        interest_rates is a (low, high) pair meaning every rate with
+        low < rate <= high gives round(target, 2); it is None when error is
+        set. error is the exception name validate_inputs raises for the other
+        inputs, or "UnattainablePaymentError" when no valid rate gives the target.
+
+    Raises:
+        InvalidInputError: If the columns do not have the same length.
+    """
+    columns = (target_payments, property_values, property_conditions, marital_statuses, owner_ages, spouse_ages)
+    _check_columns(columns)
+
+    if product is None:
+        product = DEFAULT_PRODUCT
+    condition_adjustment = product.condition_adjustment
+    loan_percentage = product.loan_percentage
+    results = []
+    append = results.append
+
+    for target, property_value, property_condition, marital_status, owner_age, spouse_age in zip(*columns):
+        error = _target_error(target)
+        if error is None:
+            try:
+                validate_inputs(property_value, property_condition, marital_status, owner_age, spouse_age, product.maximum_interest_rate, product)
+            except Exception as exception:
+                error = type(exception).__name__
+        if error is not None:
+            append((None, error))
+            continue
+
+        if life_table is None:
+            months = product.life_expectancy_months[min(owner_age, spouse_age)]
+        else:
+            months = life_table.life_expectancy_months(marital_status, owner_age, spouse_age)
+        mortgage_amount = property_value * condition_adjustment[property_condition] * loan_percentage
+        if round(mortgage_amount / months, 2) == round(target, 2):
+            append(((0.0, product.maximum_interest_rate), None))
+        else:
+            append((None, UnattainablePaymentError.__name__))
+
+    return results
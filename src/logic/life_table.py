@@ -0,0 +1,163 @@
+# life_table.py
+import csv
+from array import array
+
+from logic.reverse_mortgage import InvalidInputError
+
+MAX_AGE = 120
+
+class LifeTable:
+    """
+    Life expectancies indexed by age, built once from a mortality table.
+
+    Single-life expectancies live in one array indexed by age and last-survivor
+    (joint) expectancies in a flat (MAX_AGE + 1) x (MAX_AGE + 1) array, so every
+    lookup is a single index operation. The payment terms in whole months are
+    precomputed the same way. Ages above MAX_AGE use the MAX_AGE row.
+    """
+
+    def __init__(self, single_life, joint_life):
+        """
+        Wrap precomputed expectancy arrays; use the from_* constructors instead.
+
+        Args:
+            single_life (array): Expectancy in years for ages 0..MAX_AGE.
+            joint_life (array): Last-survivor expectancy in years, row-major
+                by (owner_age, spouse_age), for ages 0..MAX_AGE.
+        """
+        self.single_life = single_life
+        self.joint_life = joint_life
+        self.single_life_months = array("H", (max(1, round(years * 12)) for years in single_life))
+        self.joint_life_months = array("H", (max(1, round(years * 12)) for years in joint_life))
+
+    @classmethod
+    def from_mortality_rates(cls, mortality_rates):
+        """
+        Build a table from yearly death probabilities (q_x).
+
+        Expectancies are complete expectancies approximated as the curtate
+        expectancy plus half a year. The joint expectancy is the last-survivor
+        one, e_x + e_y - e_xy, where e_xy is the expectancy while both are alive,
+        computed with the recursion e_xy = p_x * p_y * (1 + e_x+1,y+1).
+
+        Args:
+            mortality_rates (dict or sequence): q_x by age (a sequence is
+                indexed from age 0). Ages not given take the rate of the
+                closest lower age, and ages below the first one given take
+                the first rate; the table closes with q = 1 at MAX_AGE.
+
+        Returns:
+            LifeTable: The loaded table.
+
+        Raises:
+            InvalidInputError: If no rate is given or a rate is not a number
+                between 0 and 1.
+        """
+        if not isinstance(mortality_rates, dict):
+            mortality_rates = dict(enumerate(mortality_rates))
+        if not mortality_rates:
+            raise InvalidInputError("A mortality table needs at least one rate.")
+        for age, rate in sorted(mortality_rates.items()):
+            if not (isinstance(rate, (int, float)) and 0 <= rate <= 1):
+                raise InvalidInputError(f"Mortality rates must be between 0 and 1. You entered: {rate} at age {age}.")
+        survival = []
+        rate = mortality_rates[min(mortality_rates)]
+        for age in range(MAX_AGE + 1):
+            rate = mortality_rates.get(age, rate)
+            survival.append(0.0 if age == MAX_AGE else 1 - rate)
+
+        curtate = [0.0] * (MAX_AGE + 2)
+        for age in range(MAX_AGE, -1, -1):
+            curtate[age] = survival[age] * (1 + curtate[age + 1])
+
+        size = MAX_AGE + 1
+        both_alive = [0.0] * (size * size)
+        for owner_age in range(MAX_AGE, -1, -1):
+            for spouse_age in range(MAX_AGE, -1, -1):
+                following = 0.0
+                if owner_age < MAX_AGE and spouse_age < MAX_AGE:
+                    following = both_alive[(owner_age + 1) * size + spouse_age + 1]
+                both_alive[owner_age * size + spouse_age] = survival[owner_age] * survival[spouse_age] * (1 + following)
+
+        single_life = array("d", (curtate[age] + 0.5 for age in range(size)))
+        joint_life = array("d", (
+            curtate[owner_age] + curtate[spouse_age] - both_alive[owner_age * size + spouse_age] + 0.5
+            for owner_age in range(size)
+            for spouse_age in range(size)
+        ))
+        return cls(single_life, joint_life)
+
+    @classmethod
+    def from_expectancies(cls, expectancy):
+        """
+        Build a table from a function of age, using the youngest age for couples.
+
+        With get_life_expectancy this reproduces the default pricing of married
+        applicants, where a couple is priced on the expectancy of its youngest
+        member.
+
+        Args:
+            expectancy (callable): Returns the expectancy in years for an age.
+
+        Returns:
+            LifeTable: The loaded table.
+        """
+        single_life = array("d", (expectancy(age) for age in range(MAX_AGE + 1)))
+        joint_life = array("d", (
+            single_life[min(owner_age, spouse_age)]
+            for owner_age in range(MAX_AGE + 1)
+            for spouse_age in range(MAX_AGE + 1)
+        ))
+        return cls(single_life, joint_life)
+
+    @classmethod
+    def from_csv(cls, path):
+        """
+        Load a mortality table from a CSV file with "age" and "qx" columns.
+
+        Args:
+            path (str): The CSV file.
+
+        Returns:
+            LifeTable: The loaded table.
+        """
+        with open(path, newline="", encoding="utf-8") as source:
+            mortality_rates = {int(record["age"]): float(record["qx"]) for record in csv.DictReader(source)}
+        return cls.from_mortality_rates(mortality_rates)
+
+    def single_life_expectancy(self, age):
+        """Return the life expectancy in years of one person."""
+        return self.single_life[min(age, MAX_AGE)]
+
+    def joint_life_expectancy(self, owner_age, spouse_age):
+        """Return the expectancy in years until the last of two people dies."""
+        return self.joint_life[min(owner_age, MAX_AGE) * (MAX_AGE + 1) + min(spouse_age, MAX_AGE)]
+
+    def life_expectancy_months(self, marital_status, owner_age, spouse_age):
+        """
+        Return the payment term in whole months for an applicant.
+
+        Married applicants are priced on the joint expectancy of owner and
+        spouse; single and divorced owners on their own expectancy.
+
+        Args:
+            marital_status (str): The marital status of the owner.
+            owner_age (int): The age of the owner.
+            spouse_age (int): The age of the spouse.
+
+        Returns:
+            int: The term in months (at least one).
+        """
+        if marital_status == "married":
+            return self.joint_life_months[min(owner_age, MAX_AGE) * (MAX_AGE + 1) + min(spouse_age, MAX_AGE)]
+        return self.single_life_months[min(owner_age, MAX_AGE)]
+
+    def life_expectancy_months_bulk(self, marital_statuses, owner_ages, spouse_ages):
+        """
+        Return the payment terms in months for columns of applicants.
+
+        Returns:
+            array: One unsigned term per applicant, in input order.
+        """
+        lookup = self.life_expectancy_months
+        return array("H", (lookup(*applicant) for applicant in zip(marital_statuses, owner_ages, spouse_ages)))
@@ -0,0 +1,196 @@
+# money.py
+from array import array
+from fractions import Fraction
+from functools import lru_cache
+
+from logic.reverse_mortgage import (
+    DEFAULT_PRODUCT,
+    get_annuity_terms,
+    validate_inputs,
+    validate_inputs_bulk,
+    InvalidInputError
+)
+
+# Rounding rules for the last cent: ties go to the even cent (banker's
+# rounding) or up to the next cent.
+ROUND_HALF_EVEN = "half_even"
+ROUND_HALF_UP = "half_up"
+
+@lru_cache(maxsize=32)
+def _product_fractions(product):
+    """
+    Return a product's condition adjustments and loan percentage as exact fractions.
+
+    Each factor is read from its decimal representation (0.9 is 9/10, not the
+    binary float nearest to it), so the capped payment can be computed in
+    integers.
+
+    Returns:
+        tuple: ({condition: (numerator, denominator)}, (numerator, denominator)).
+    """
+    adjustments = {condition: Fraction(str(factor)).as_integer_ratio() for condition, factor in product.condition_adjustment.items()}
+    return adjustments, Fraction(str(product.loan_percentage)).as_integer_ratio()
+
+def divide_rounded(numerator, denominator, rounding=ROUND_HALF_EVEN):
+    """
+    Divide two integers and round the quotient to an integer.
+
+    Args:
+        numerator (int): The dividend; amounts are non-negative.
+        denominator (int): The divisor, greater than zero.
+        rounding (str): ROUND_HALF_EVEN or ROUND_HALF_UP.
+
+    Returns:
+        int: The rounded quotient.
+
+    Raises:
+        InvalidInputError: If the rounding rule is unknown.
+    """
+    if rounding != ROUND_HALF_EVEN and rounding != ROUND_HALF_UP:
+        raise InvalidInputError(f"Invalid rounding rule: '{rounding}'. Must be one of {ROUND_HALF_EVEN}, {ROUND_HALF_UP}.")
+    quotient, remainder = divmod(numerator, denominator)
+    twice_remainder = 2 * remainder
+    if twice_remainder > denominator:
+        return quotient + 1
+    if twice_remainder == denominator:
+        if rounding == ROUND_HALF_UP:
+            return quotient + 1
+        return quotient + (quotient & 1)
+    return quotient
+
+def to_cents(amount, rounding=ROUND_HALF_EVEN):
+    """
+    Convert an amount to integer cents, rounding its exact binary value once.
+
+    Args:
+        amount (int or float): The amount in currency units.
+        rounding (str): ROUND_HALF_EVEN or ROUND_HALF_UP.
+
+    Returns:
+        int: The amount in cents.
+    """
+    if amount.__class__ is int:
+        return amount * 100
+    numerator, denominator = amount.as_integer_ratio()
+    return divide_rounded(numerator * 100, denominator, rounding)
+
+def format_cents(cents):
+    """Return integer cents as a decimal string with two digits, e.g. "1041666.67"."""
+    sign = "-" if cents < 0 else ""
+    units, remainder = divmod(abs(cents), 100)
+    return f"{sign}{units}.{remainder:02d}"
+
+def _payment_cents(property_value, property_condition, months, interest_rate, rounding, product):
+    """
+    Return the monthly payment in cents of a validated applicant.
+
+    Whether the cap applies depends only on the rate and the term. The capped
+    payment, property_value * adjustment * loan_percentage / months, is a
+    ratio of integers (a float property value is taken at its exact binary
+    value) and is rounded once, exactly. The uncapped annuity payment involves
+    a fractional power, so it is computed in floats and its exact binary value
+    is rounded with the same rule.
+    """
+    monthly_interest_rate, annuity_denominator = get_annuity_terms(interest_rate, months)
+    # A zero annuity denominator (a rate too small to accrue) takes the cap, the
+    # limit of the annuity payment as the rate goes to 0.
+    payment_per_amount = monthly_interest_rate / annuity_denominator if annuity_denominator else float("inf")
+    adjustment_fractions, loan_fraction = _product_fractions(product)
+    adjustment_numerator, adjustment_denominator = adjustment_fractions[property_condition]
+    loan_numerator, loan_denominator = loan_fraction
+
+    if property_value.__class__ is int:
+        value_numerator, value_denominator = property_value, 1
+    else:
+        value_numerator, value_denominator = property_value.as_integer_ratio()
+
+    if payment_per_amount * months > 1:
+        return divide_rounded(
+            value_numerator * adjustment_numerator * loan_numerator * 100,
+            value_denominator * adjustment_denominator * loan_denominator * months,
+            rounding)
+
+    mortgage_amount = property_value * adjustment_numerator / adjustment_denominator * loan_numerator / loan_denominator
+    numerator, denominator = (mortgage_amount * payment_per_amount).as_integer_ratio()
+    return divide_rounded(numerator * 100, denominator, rounding)
+
+def calculate_reverse_mortgage_payment_cents(property_value, property_condition, marital_status, owner_age, spouse_age, interest_rate, life_table=None, rounding=ROUND_HALF_EVEN, product=None):
+    """
+    Calculate the monthly reverse mortgage payment in integer cents.
+
+    The inputs, validation and formula are those of
+    calculate_reverse_mortgage_payment; only the final rounding differs. The
+    float path rounds a binary float with round(), while this path rounds the
+    exact quotient once with the given rule, so sums of payments are exact
+    integers. The two agree except for the odd case where the float path
+    rounds a value that is a tie or off by one binary digit.
+
+    Args:
+        property_value (int or float): The value of the property.
+        property_condition (str): The condition of the property.
+        marital_status (str): The marital status of the owner.
+        owner_age (int): The age of the owner.
+        spouse_age (int): The age of the spouse.
+        interest_rate (float): The interest rate of the mortgage.
+        life_table (LifeTable): Optional mortality table giving the payment
+            term; by default the term comes from get_life_expectancy.
+        rounding (str): ROUND_HALF_EVEN (default) or ROUND_HALF_UP.
+        product (ProductConfig): The product to price (default: DEFAULT_PRODUCT).
+
+    Returns:
+        int: The monthly payment in cents.
+    """
+    if product is None:
+        product = DEFAULT_PRODUCT
+    validate_inputs(property_value, property_condition, marital_status, owner_age, spouse_age, interest_rate, product)
+    if life_table is None:
+        months = product.life_expectancy_months[min(owner_age, spouse_age)]
+    else:
+        months = life_table.life_expectancy_months(marital_status, owner_age, spouse_age)
+    return _payment_cents(property_value, property_condition, months, interest_rate, rounding, product)
+
+def calculate_reverse_mortgage_payments_cents(property_values, property_conditions, marital_statuses, owner_ages, spouse_ages, interest_rates, life_table=None, rounding=ROUND_HALF_EVEN, product=None):
+    """
+    Calculate the monthly payments in integer cents for a batch of applicants.
+
+    The rows are validated in one pass with validate_inputs_bulk; the first
+    invalid row then raises the same exception as the scalar path. Each result
+    equals calculate_reverse_mortgage_payment_cents for that row.
+
+    Args:
+        property_values (sequence of int or float): The values of the properties.
+        property_conditions (sequence of str): The conditions of the properties.
+        marital_statuses (sequence of str): The marital statuses of the owners.
+        owner_ages (sequence of int): The ages of the owners.
+        spouse_ages (sequence of int): The ages of the spouses.
+        interest_rates (sequence of float): The interest rates of the mortgages.
+        life_table (LifeTable): Optional mortality table giving the payment
+            terms; by default the terms come from get_life_expectancy.
+        rounding (str): ROUND_HALF_EVEN (default) or ROUND_HALF_UP.
+        product (ProductConfig): The product to price (default: DEFAULT_PRODUCT).
+
+    Returns:
+        array: The monthly payments in cents ('q' typecode), in input order.
+
+    Raises:
+        InvalidInputError: If the columns do not have the same length.
+        Any exception raised by validate_inputs, for the first invalid row.
+    """
+    columns = (property_values, property_conditions, marital_statuses, owner_ages, spouse_ages, interest_rates)
+    if product is None:
+        product = DEFAULT_PRODUCT
+    codes, _ = validate_inputs_bulk(*columns, product=product)
+    if any(codes):
+        row = next(index for index, code in enumerate(codes) if code)
+        validate_inputs(*(column[row] for column in columns), product)
+
+    months_by_age = product.life_expectancy_months
+    payments = array("q")
+    append = payments.append
+    for property_value, property_condition, marital_status, owner_age, spouse_age, interest_rate in zip(*columns):
+        if life_table is None:
+            months = months_by_age[min(owner_age, spouse_age)]
+        else:
+            months = life_table.life_expectancy_months(marital_status, owner_age, spouse_age)
+        append(_payment_cents(property_value, property_condition, months, interest_rate, rounding, product))
+    return payments
@@ -0,0 +1,152 @@
+# monte_carlo.py
+import math
+import random
+from array import array
+
+from logic.reverse_mortgage import DEFAULT_PRODUCT, calculate_reverse_mortgage_payment
+
+def percentile(sorted_values, percent):
+    """
+    Return a percentile of sorted values by linear interpolation.
+
+    Args:
+        sorted_values (sequence of float): The values, in ascending order.
+        percent (float): The percentile to return, between 0 and 100.
+
+    Returns:
+        float: The interpolated percentile.
+    """
+    position = (len(sorted_values) - 1) * percent / 100
+    lower = math.floor(position)
+    upper = min(lower + 1, len(sorted_values) - 1)
+    return sorted_values[lower] + (sorted_values[upper] - sorted_values[lower]) * (position - lower)
+
+def simulate_rate_shocks(path_count, seed, interest_rate_volatility, chunk_size=100_000):
+    """
+    Draw the annual rate shock of every path.
+
+    The shocks are shared by every loan, so a path describes one state of the
+    market for the whole portfolio.
+
+    Args:
+        path_count (int): Number of simulated paths.
+        seed (int): Seed of the simulation.
+        interest_rate_volatility (float): Standard deviation of the annual rate shock.
+        chunk_size (int): Number of paths drawn at a time.
+
+    Returns:
+        array: One rate shock per path.
+    """
+    generator = random.Random(f"{seed}:rates")
+    gauss = generator.gauss
+    shocks = array("d")
+    for start in range(0, path_count, chunk_size):
+        shocks.extend([interest_rate_volatility * gauss(0, 1) for _ in range(min(chunk_size, path_count - start))])
+    return shocks
+
+def simulate_loan(applicant, rate_shocks, seed, loan_index=0, longevity_volatility=0.25, chunk_size=100_000, product=None):
+    """
+    Simulate the total payout and lender shortfall of one loan over every path.
+
+    The monthly payment is fixed by calculate_reverse_mortgage_payment. On
+    each path the borrower lives a lognormal number of months whose mean is the
+    get_life_expectancy term and receives the payment every month while alive.
+    The balance accrues at the shocked annual rate (floored at a tiny positive
+    rate), and the shortfall is the part of the balance at death above the
+    condition-adjusted property value. Both quantities have a closed form, so
+    a path costs O(1) work however long the borrower lives.
+
+    Args:
+        applicant (tuple): The six calculate_reverse_mortgage_payment arguments.
+        rate_shocks (array): Annual rate shock of every path.
+        seed (int): Seed of the simulation.
+        loan_index (int): Position of the loan in the portfolio; each loan
+            draws its lifetimes from its own seeded stream.
+        longevity_volatility (float): Standard deviation of the log lifetime.
+        chunk_size (int): Number of paths simulated at a time.
+        product (ProductConfig): The product to price (default: DEFAULT_PRODUCT).
+
+    Returns:
+        tuple: (payouts, shortfalls), two arrays with one value per path.
+
+    Raises:
+        Any exception raised by validate_inputs.
+    """
+    property_value, property_condition, marital_status, owner_age, spouse_age, interest_rate = applicant
+    if product is None:
+        product = DEFAULT_PRODUCT
+    monthly_payment = calculate_reverse_mortgage_payment(*applicant, product=product)
+    expected_months = product.life_expectancy_months[min(owner_age, spouse_age)]
+    collateral = property_value * product.condition_adjustment[property_condition]
+
+    generator = random.Random(f"{seed}:loan:{loan_index}")
+    gauss = generator.gauss
+    drift = -0.5 * longevity_volatility ** 2
+    exp = math.exp
+    payouts = array("d")
+    shortfalls = array("d")
+
+    for start in range(0, len(rate_shocks), chunk_size):
+        chunk_payouts = []
+        chunk_shortfalls = []
+        for rate_shock in rate_shocks[start:start + chunk_size]:
+            months = max(1, round(expected_months * exp(longevity_volatility * gauss(0, 1) + drift)))
+            monthly_interest_rate = (1 + max(interest_rate + rate_shock, 1e-9)) ** (1/12) - 1
+            balance = monthly_payment * ((1 + monthly_interest_rate) ** months - 1) / monthly_interest_rate
+            chunk_payouts.append(monthly_payment * months)
+            chunk_shortfalls.append(balance - collateral if balance > collateral else 0.0)
+        payouts.extend(chunk_payouts)
+        shortfalls.extend(chunk_shortfalls)
+
+    return payouts, shortfalls
+
+def simulate_portfolio(applicants, path_count=10_000, seed=0, interest_rate_volatility=0.01,
+                       longevity_volatility=0.25, percentiles=(5, 50, 95, 99), chunk_size=100_000, product=None):
+    """
+    Run a seeded Monte Carlo of rate and longevity risk over a portfolio.
+
+    Loans are simulated one at a time, so memory grows with the number of
+    paths and not with paths x loans. The portfolio totals of each path are
+    accumulated as the loans are processed.
+
+    Args:
+        applicants (iterable of tuple): The six calculate_reverse_mortgage_payment
+            arguments of every loan.
+        path_count (int): Number of simulated paths.
+        seed (int): Seed of the simulation; the same seed gives the same result.
+        interest_rate_volatility (float): Standard deviation of the annual rate shock.
+        longevity_volatility (float): Standard deviation of the log lifetime.
+        percentiles (sequence of float): Percentiles to report, between 0 and 100.
+        chunk_size (int): Number of paths simulated at a time.
+        product (ProductConfig): The product to price (default: DEFAULT_PRODUCT).
+
+    Returns:
+        dict: "loans" holds, for each loan in input order, the percentiles of
+        "payout" and "shortfall" keyed by percentile; "portfolio" holds the same
+        percentiles for the portfolio totals.
+
+    Raises:
+        Any exception raised by validate_inputs, for the first invalid loan.
+    """
+    rate_shocks = simulate_rate_shocks(path_count, seed, interest_rate_volatility, chunk_size)
+    total_payouts = array("d", bytes(8 * path_count))
+    total_shortfalls = array("d", bytes(8 * path_count))
+    loans = []
+
+    for loan_index, applicant in enumerate(applicants):
+        payouts, shortfalls = simulate_loan(tuple(applicant), rate_shocks, seed, loan_index, longevity_volatility, chunk_size, product)
+        for index, (payout, shortfall) in enumerate(zip(payouts, shortfalls)):
+            total_payouts[index] += payout
+            total_shortfalls[index] += shortfall
+        loans.append(_summarize(payouts, shortfalls, percentiles))
+
+    return {"loans": loans, "portfolio": _summarize(total_payouts, total_shortfalls, percentiles)}
+
+def _summarize(payouts, shortfalls, percentiles):
+    """Return the requested percentiles of payouts and shortfalls."""
+    sorted_payouts = sorted(payouts)
+    sorted_shortfalls = sorted(shortfalls)
+    return {
+        "payout": {percent: percentile(sorted_payouts, percent) for percent in percentiles},
+        "shortfall": {percent: percentile(sorted_shortfalls, percent) for percent in percentiles},
+    }
@@ -0,0 +1,59 @@
+# parallel_pricing.py
+import os
+from collections import deque
+from concurrent.futures import ProcessPoolExecutor
+
+from logic.portfolio_stream import chunked, price_applicant, price_chunk
+
+def price_chunk_safely(applicants):
+    """
+    Price one chunk, falling back to row-by-row pricing if the chunk fails.
+
+    Validation problems are already reported per row by price_chunk. If
+    anything else goes wrong, each row is priced on its own so that a single
+    bad row cannot take the rest of the chunk down with it; price_applicant
+    reports each row the way price_chunk does. Only the results
+    are returned, so the applicants are not sent back to the parent process.
+
+    Args:
+        applicants (list of tuple): Applicants in APPLICANT_FIELDS order.
+
+    Returns:
+        list: One (monthly_payment, error) tuple per applicant.
+    """
+    try:
+        return [(monthly_payment, error) for _, monthly_payment, error in price_chunk(applicants)]
+    except Exception:
+        return [price_applicant(applicant) for applicant in applicants]
+
+def price_in_parallel(applicants, workers=None, chunk_size=10_000):
+    """
+    Price an applicant stream across a pool of worker processes.
+
+    The input is cut into chunks that are sent to the pool, with at most two
+    chunks per worker in flight, so memory stays bounded for any input size.
+    Results are yielded in input order as soon as the oldest chunk is done.
+
+    Args:
+        applicants (iterable of tuple): Applicants in APPLICANT_FIELDS order.
+        workers (int): Number of worker processes (default: the CPU count).
+        chunk_size (int): Number of applicants sent to a worker at a time.
+
+    Yields:
+        tuple: (applicant, monthly_payment, error), in input order.
+    """
+    workers = workers or os.cpu_count() or 1
+    chunks = chunked(applicants, chunk_size)
+
+    def finished(chunk, future):
+        for applicant, (monthly_payment, error) in zip(chunk, future.result()):
+            yield applicant, monthly_payment, error
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        pending = deque()
+        for chunk in chunks:
+            pending.append((chunk, executor.submit(price_chunk_safely, chunk)))
+            if len(pending) >= 2 * workers:
+                yield from finished(*pending.popleft())
+        while pending:
+            yield from finished(*pending.popleft())
@@ -0,0 +1,250 @@
+# portfolio.py
+from collections import namedtuple
+
+from logic.reverse_mortgage import (
+    APPLICANT_FIELDS,
+    DEFAULT_PRODUCT,
+    _monthly_payment,
+    calculate_reverse_mortgage_payment,
+    validate_inputs,
+    InvalidInputError
+)
+
+PaymentChange = namedtuple("PaymentChange", ["row", "old_payment", "new_payment", "error"])
+
+class Portfolio:
+    """
+    A priced book of loans that reprices only the rows a change touches.
+
+    Valid rows are indexed as sets of row numbers keyed by (interest_rate,
+    term in months, property_condition), the three inputs besides the property
+    value that decide a payment. A rate
+    change moves the affected groups to their new key and prices every row of
+    a group with one set of annuity terms; a product change reprices only the
+    groups whose condition adjustment moved; an applicant change reprices only
+    the listed rows. Rows failing validation keep the name of their exception and
+    stay out of the index until a change makes them valid.
+    """
+
+    def __init__(self, applicants, life_table=None, product=None):
+        """
+        Price a portfolio and build its index.
+
+        Args:
+            applicants (iterable of tuple): Applicants in APPLICANT_FIELDS order.
+            life_table (LifeTable): Optional mortality table giving the payment
+                terms; by default the terms come from the product.
+            product (ProductConfig): The product to price (default: DEFAULT_PRODUCT).
+        """
+        self.life_table = life_table
+        self.product = DEFAULT_PRODUCT if product is None else product
+        self.applicants = []
+        self.payments = []
+        self.errors = []
+        self.index = {}
+        for applicant in applicants:
+            self.applicants.append(tuple(applicant))
+            self.payments.append(None)
+            self.errors.append(None)
+            self._price_row(len(self.applicants) - 1)
+
+    def __len__(self):
+        return len(self.applicants)
+
+    def _months(self, applicant):
+        """Return the payment term of an applicant, as the scalar path computes it."""
+        _, _, marital_status, owner_age, spouse_age, _ = applicant
+        if self.life_table is None:
+            return self.product.life_expectancy_months[min(owner_age, spouse_age)]
+        return self.life_table.life_expectancy_months(marital_status, owner_age, spouse_age)
+
+    def _price_row(self, row):
+        """Price one row with calculate_reverse_mortgage_payment and index it if valid."""
+        applicant = self.applicants[row]
+        try:
+            self.payments[row] = calculate_reverse_mortgage_payment(*applicant, life_table=self.life_table, product=self.product)
+            self.errors[row] = None
+        except Exception as error:
+            self.payments[row] = None
+            self.errors[row] = type(error).__name__
+            return
+        self.index.setdefault(self._key(applicant), set()).add(row)
+
+    def _key(self, applicant):
+        """Return the index key of a valid applicant."""
+        return applicant[5], self._months(applicant), applicant[1]
+
+    def _unindex(self, row):
+        """Remove a valid row from the index."""
+        key = self._key(self.applicants[row])
+        rows = self.index[key]
+        rows.discard(row)
+        if not rows:
+            del self.index[key]
+
+    def rows_for(self, interest_rate, months=None, property_condition=None):
+        """
+        Return the valid rows priced at a rate, optionally for one term and condition.
+
+        Returns:
+            list: The row numbers, in ascending order.
+        """
+        return sorted(
+            row
+            for (key_rate, key_months, key_condition), rows in self.index.items()
+            if key_rate == interest_rate
+            and (months is None or key_months == months)
+            and (property_condition is None or key_condition == property_condition)
+            for row in rows
+        )
+
+    def reprice_rate(self, old_rate, new_rate):
+        """
+        Move every loan at one interest rate to another and reprice only those loans.
+
+        The new rate is validated once and only the rows of the affected
+        (term, condition) groups are priced, with the payment function of
+        calculate_reverse_mortgage_payment, so the results match it to the cent.
+
+        Args:
+            old_rate (float): The rate of the loans to move.
+            new_rate (float): Their new rate.
+
+        Returns:
+            list: One PaymentChange per repriced row, including rows whose
+            payment did not move.
+
+        Raises:
+            Any exception raised by validate_inputs for the new rate.
+        """
+        product = self.product
+        validate_inputs(product.minimum_property_value, product.property_conditions[0], product.marital_statuses[0], product.minimum_age, product.minimum_age, new_rate, product)
+        if new_rate == old_rate:
+            return []
+
+        condition_adjustment = product.condition_adjustment
+        loan_percentage = product.loan_percentage
+        changes = []
+        for key in [key for key in self.index if key[0] == old_rate]:
+            _, months, property_condition = key
+            rows = self.index.pop(key)
+            adjustment = condition_adjustment[property_condition]
+            for row in sorted(rows):
+                applicant = self.applicants[row]
+                monthly_payment = _monthly_payment(applicant[0] * adjustment * loan_percentage, new_rate, months)
+
+                changes.append(PaymentChange(row, self.payments[row], monthly_payment, None))
+                self.applicants[row] = applicant[:5] + (new_rate,)
+                self.payments[row] = monthly_payment
+            self.index.setdefault((new_rate, months, property_condition), set()).update(rows)
+        return changes
+
+    def reprice_product(self, new_product):
+        """
+        Move the portfolio to another product and reprice only the loans it changes.
+
+        When the new product accepts the same applicants with the same terms
+        and only its condition adjustments or loan percentage differ, only the
+        (rate, term, condition) groups whose adjustment changed are repriced,
+        or every group if the loan percentage changed. Any other difference
+        (eligibility limits, accepted conditions or statuses, terms) can change
+        which rows are valid and their index keys, so every row is repriced.
+
+        Args:
+            new_product (ProductConfig): The product to price with from now on.
+
+        Returns:
+            list: One PaymentChange per repriced row, in row order, including
+            rows whose payment did not move.
+        """
+        old_product = self.product
+        self.product = new_product
+        same_terms = self.life_table is not None or old_product.life_expectancy_months == new_product.life_expectancy_months
+        same_eligibility = (
+            set(old_product.property_conditions) == set(new_product.property_conditions)
+            and set(old_product.marital_statuses) == set(new_product.marital_statuses)
+            and old_product.minimum_property_value == new_product.minimum_property_value
+            and old_product.maximum_property_value == new_product.maximum_property_value
+            and old_product.minimum_age == new_product.minimum_age
+            and old_product.maximum_age == new_product.maximum_age
+            and old_product.maximum_interest_rate == new_product.maximum_interest_rate
+        )
+
+        if not (same_terms and same_eligibility):
+            changes = []
+            self.index = {}
+            for row in range(len(self.applicants)):
+                old_payment = self.payments[row]
+                self._price_row(row)
+                changes.append(PaymentChange(row, old_payment, self.payments[row], self.errors[row]))
+            return changes
+
+        loan_percentage = new_product.loan_percentage
+        condition_adjustment = new_product.condition_adjustment
+        if loan_percentage == old_product.loan_percentage:
+            affected = {condition for condition in condition_adjustment if condition_adjustment[condition] != old_product.condition_adjustment[condition]}
+        else:
+            affected = set(condition_adjustment)
+
+        changes = []
+        for (interest_rate, months, property_condition), rows in self.index.items():
+            if property_condition not in affected:
+                continue
+            adjustment = condition_adjustment[property_condition]
+            for row in rows:
+                monthly_payment = _monthly_payment(self.applicants[row][0] * adjustment * loan_percentage, interest_rate, months)
+                changes.append(PaymentChange(row, self.payments[row], monthly_payment, None))
+                self.payments[row] = monthly_payment
+        changes.sort()
+        return changes
+
+    def update_rows(self, rows, **changes):
+        """
+        Change applicant fields of some rows and reprice only those rows.
+
+        Args:
+            rows (iterable of int): The rows to change.
+            **changes: New values keyed by APPLICANT_FIELDS names.
+
+        Returns:
+            list: One PaymentChange per row; rows that become invalid have a
+            new_payment of None and the exception name in error.
+
+        Raises:
+            InvalidInputError: If a keyword is not an applicant field.
+        """
+        unknown = [field for field in changes if field not in APPLICANT_FIELDS]
+        if unknown:
+            raise InvalidInputError(f"Unknown applicant fields: {', '.join(unknown)}. Must be among {', '.join(APPLICANT_FIELDS)}.")
+
+        positions = [(APPLICANT_FIELDS.index(field), value) for field, value in changes.items()]
+        result = []
+        for row in rows:
+            old_payment = self.payments[row]
+            if self.errors[row] is None:
+                self._unindex(row)
+            applicant = list(self.applicants[row])
+            for position, value in positions:
+                applicant[position] = value
+            self.applicants[row] = tuple(applicant)
+            self._price_row(row)
+            result.append(PaymentChange(row, old_payment, self.payments[row], self.errors[row]))
+        return result
+
+    def append(self, applicant):
+        """
+        Price and add one loan.
+
+        Returns:
+            PaymentChange: The new row, with an old_payment of None.
+        """
+        self.applicants.append(tuple(applicant))
+        self.payments.append(None)
+        self.errors.append(None)
+        row = len(self.applicants) - 1
+        self._price_row(row)
+        return PaymentChange(row, None, self.payments[row], self.errors[row])
+
+    def total_payment(self):
+        """Return the sum of the monthly payments of the valid rows."""
+        return sum(payment for payment in self.payments if payment is not None)
@@ -0,0 +1,228 @@
+# portfolio_stream.py
+import csv
+import json
+import math
+from itertools import islice
+
+from logic.reverse_mortgage import (
+    APPLICANT_FIELDS,
+    InvalidInputError,
+    calculate_reverse_mortgage_payment,
+    calculate_reverse_mortgage_payments,
+    validate_inputs_bulk,
+    validation_error_for,
+)
+
+RESULT_FIELDS = APPLICANT_FIELDS + ("monthly_payment", "error")
+
+class MalformedRecord(tuple):
+    """
+    An applicant of None fields standing in for an input line that could not
+    be parsed, so that it is reported as an InvalidInputError row in its place
+    instead of stopping the stream.
+    """
+
+    __slots__ = ()
+
+    def __new__(cls):
+        return super().__new__(cls, (None,) * len(APPLICANT_FIELDS))
+
+    def __reduce__(self):
+        # Rebuilt without arguments when sent to a worker process.
+        return MalformedRecord, ()
+
+def parse_number(text):
+    """
+    Convert a text field to int or float, leaving it unchanged if it is not a number.
+
+    Args:
+        text (str): The raw field value.
+
+    Returns:
+        int, float or str: The parsed number, or the original text so that
+        validation reports it as a data type error.
+    """
+    text = text.strip()
+    try:
+        return int(text)
+    except ValueError:
+        pass
+    try:
+        return float(text)
+    except ValueError:
+        return text
+
+def normalize_applicant(record):
+    """
+    Build an applicant tuple in APPLICANT_FIELDS order from a parsed record.
+
+    Text fields are converted the same way get_input converts interactive
+    answers: numbers are parsed and categorical values are lower-cased. Values
+    that are already typed (as in JSON) are kept as they are. Missing fields
+    become None and are reported by validation.
+
+    Args:
+        record (dict): One applicant keyed by field name.
+
+    Returns:
+        tuple: The six calculate_reverse_mortgage_payment arguments.
+    """
+    values = []
+    for field in APPLICANT_FIELDS:
+        value = record.get(field)
+        if isinstance(value, str):
+            if field in ("property_condition", "marital_status"):
+                value = value.strip().lower()
+            else:
+                value = parse_number(value)
+        values.append(value)
+    return tuple(values)
+
+def read_applicants(stream, file_format):
+    """
+    Lazily read applicants from a CSV or JSONL text stream.
+
+    Args:
+        stream (file object): An open text stream.
+        file_format (str): Either "csv" (with a header row) or "jsonl".
+
+    Yields:
+        tuple: One applicant in APPLICANT_FIELDS order per input record; a
+        JSONL line that is not a JSON object yields a MalformedRecord.
+
+    Raises:
+        InvalidInputError: If the format is not supported.
+    """
+    if file_format == "csv":
+        for record in csv.DictReader(stream):
+            yield normalize_applicant(record)
+    elif file_format == "jsonl":
+        for line in stream:
+            if not line.strip():
+                continue
+            try:
+                record = json.loads(line)
+            except ValueError:
+                record = None
+            yield normalize_applicant(record) if isinstance(record, dict) else MalformedRecord()
+    else:
+        raise InvalidInputError(f"Unsupported file format: '{file_format}'. Must be one of csv, jsonl.")
+
+def chunked(iterable, chunk_size):
+    """
+    Group an iterable into lists of at most chunk_size items.
+
+    Args:
+        iterable (iterable): The items to group.
+        chunk_size (int): The maximum number of items per chunk.
+
+    Yields:
+        list: The next chunk of items.
+    """
+    iterator = iter(iterable)
+    while True:
+        chunk = list(islice(iterator, chunk_size))
+        if not chunk:
+            return
+        yield chunk
+
+def price_applicant(applicant):
+    """
+    Price one applicant, reporting a failure as the name of its exception.
+
+    Args:
+        applicant (tuple): An applicant in APPLICANT_FIELDS order.
+
+    Returns:
+        tuple: (monthly_payment, error). For an invalid row the payment is
+        None and error is the name of the exception
+        calculate_reverse_mortgage_payment raises, or InvalidInputError for a
+        MalformedRecord.
+    """
+    if isinstance(applicant, MalformedRecord):
+        return None, InvalidInputError.__name__
+    try:
+        return calculate_reverse_mortgage_payment(*applicant), None
+    except Exception as error:
+        return None, type(error).__name__
+
+def price_chunk(applicants):
+    """
+    Validate and price one chunk of applicants.
+
+    Args:
+        applicants (list of tuple): Applicants in APPLICANT_FIELDS order.
+
+    Returns:
+        list: One (applicant, monthly_payment, error) tuple per applicant. For
+        invalid rows the payment is None and error is the name of the
+        exception calculate_reverse_mortgage_payment would raise, or
+        InvalidInputError for a MalformedRecord.
+    """
+    codes, _ = validate_inputs_bulk(*zip(*applicants)) if applicants else ([], {})
+    valid_applicants = [applicant for applicant, code in zip(applicants, codes) if not code]
+    payments = iter(calculate_reverse_mortgage_payments(*zip(*valid_applicants)) if valid_applicants else ())
+
+    results = []
+    for applicant, code in zip(applicants, codes):
+        if isinstance(applicant, MalformedRecord):
+            results.append((applicant,) + price_applicant(applicant))
+        elif code:
+            results.append((applicant, None, validation_error_for(code).__name__))
+        else:
+            results.append((applicant, next(payments), None))
+    return results
+
+def price_stream(applicants, chunk_size=10_000):
+    """
+    Price an applicant stream in fixed-size chunks.
+
+    Only one chunk is held in memory at a time, and the results of a chunk
+    are produced before the next chunk is read.
+
+    Args:
+        applicants (iterable of tuple): Applicants in APPLICANT_FIELDS order.
+        chunk_size (int): The number of applicants priced per chunk.
+
+    Yields:
+        tuple: (applicant, monthly_payment, error), in input order.
+    """
+    for chunk in chunked(applicants, chunk_size):
+        yield from price_chunk(chunk)
+
+def _json_value(value):
+    """Return a value as JSON can hold it: NaN and infinities become None."""
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+def write_results(results, stream, file_format):
+    """
+    Write priced results to a text stream as CSV or JSONL.
+
+    JSONL output is strict JSON: NaN and infinite values, which a CSV field
+    such as "nan" parses to, are written as null.
+
+    Args:
+        results (iterable of tuple): (applicant, monthly_payment, error) tuples.
+        stream (file object): An open text stream.
+        file_format (str): Either "csv" or "jsonl".
+
+    Returns:
+        int: The number of rows written.
+    """
+    count = 0
+    if file_format == "csv":
+        writer = csv.writer(stream, lineterminator="\n")
+        writer.writerow(RESULT_FIELDS)
+        for applicant, monthly_payment, error in results:
+            writer.writerow(applicant + (monthly_payment, error))
+            count += 1
+    else:
+        for applicant, monthly_payment, error in results:
+            record = {field: _json_value(value) for field, value in zip(APPLICANT_FIELDS, applicant)}
+            record["monthly_payment"] = monthly_payment
+            record["error"] = error
+            stream.write(json.dumps(record, allow_nan=False) + "\n")
+            count += 1
+    return count
@@ -0,0 +1,143 @@
+# profiling.py
+import cProfile
+import io
+import os
+import pstats
+import tracemalloc
+
+# Functions of reverse_mortgage.py reported on their own, whatever their rank.
+PRICING_FUNCTIONS = ("validate_inputs", "calculate_reverse_mortgage_payment", "validate_inputs_bulk", "calculate_reverse_mortgage_payments")
+
+PROFILE_FILE = "pricing.prof"
+ALLOCATIONS_FILE = "allocations.tracemalloc"
+REPORT_FILE = "profile_report.txt"
+
+class PricingProfiler:
+    """
+    CPU profile and memory allocations of one run.
+
+    Between start() and stop() every call is recorded by cProfile and every
+    allocation traced by tracemalloc. write() saves the raw cProfile stats
+    (readable by pstats, snakeviz, gprof2dot or flameprof), the tracemalloc
+    snapshot and a text report with the top hot spots, the pricing functions
+    and the allocation sites that grew the most. Only code run in this process
+    is profiled; worker processes of parallel pricing are not.
+    """
+
+    def __init__(self, output_directory, top=20, frames=10):
+        """
+        Args:
+            output_directory (str): Directory for the report and raw files;
+                created if missing.
+            top (int): Number of functions and allocation sites in the report.
+            frames (int): Stack frames kept per traced allocation.
+        """
+        self.output_directory = output_directory
+        self.top = top
+        self.frames = frames
+        self.profile = cProfile.Profile()
+        self.baseline = None
+        self.snapshot = None
+        self.peak_bytes = None
+        self.started_tracing = False
+
+    def __enter__(self):
+        self.start()
+        return self
+
+    def __exit__(self, error_type, error, traceback):
+        self.stop()
+        self.write()
+
+    def start(self):
+        """Start recording calls and allocations."""
+        if not tracemalloc.is_tracing():
+            tracemalloc.start(self.frames)
+            self.started_tracing = True
+        self.baseline = tracemalloc.take_snapshot()
+        tracemalloc.reset_peak()
+        self.profile.enable()
+
+    def stop(self):
+        """Stop recording and keep the final allocation snapshot."""
+        self.profile.disable()
+        self.snapshot = tracemalloc.take_snapshot()
+        self.peak_bytes = tracemalloc.get_traced_memory()[1]
+        if self.started_tracing:
+            tracemalloc.stop()
+            self.started_tracing = False
+
+    def pricing_stats(self):
+        """
+        Return the profile of the pricing functions.
+
+        Returns:
+            dict: For each of PRICING_FUNCTIONS that was called, its "calls",
+            "total_seconds" (own time) and "cumulative_seconds" (with callees).
+        """
+        stats = pstats.Stats(self.profile).stats
+        result = {}
+        for (filename, _, function), (_, calls, total_seconds, cumulative_seconds, _) in stats.items():
+            if function in PRICING_FUNCTIONS and os.path.basename(filename) == "reverse_mortgage.py":
+                result[function] = {"calls": calls, "total_seconds": total_seconds, "cumulative_seconds": cumulative_seconds}
+        return result
+
+    def allocation_stats(self, filename_pattern=None):
+        """
+        Return the allocation sites that grew the most during the run.
+
+        Args:
+            filename_pattern (str): Optional fnmatch pattern keeping only the
+                allocations made in matching files, e.g. "*reverse_mortgage.py".
+
+        Returns:
+            list: Up to top tracemalloc StatisticDiff entries, by size increase.
+        """
+        # Leave out the snapshots' own bookkeeping.
+        filters = (tracemalloc.Filter(False, tracemalloc.__file__),)
+        if filename_pattern is not None:
+            filters += (tracemalloc.Filter(True, filename_pattern),)
+        return self.snapshot.filter_traces(filters).compare_to(self.baseline.filter_traces(filters), "lineno")[:self.top]
+
+    def report(self):
+        """Return the text report of hot spots, pricing functions and allocations."""
+        output = io.StringIO()
+        output.write(f"Top {self.top} functions by cumulative time\n")
+        pstats.Stats(self.profile, stream=output).sort_stats("cumulative").print_stats(self.top)
+
+        output.write("Pricing functions\n")
+        pricing = self.pricing_stats()
+        for function in PRICING_FUNCTIONS:
+            if function in pricing:
+                stats = pricing[function]
+                output.write(f"  {function}: {stats['calls']} calls, {stats['total_seconds']:.6f} s own, {stats['cumulative_seconds']:.6f} s cumulative\n")
+            else:
+                output.write(f"  {function}: not called\n")
+
+        output.write(f"\nTop {self.top} allocation sites by size increase\n")
+        for statistic in self.allocation_stats():
+            output.write(f"  {statistic}\n")
+        output.write("\nAllocation sites in reverse_mortgage.py\n")
+        for statistic in self.allocation_stats("*reverse_mortgage.py"):
+            output.write(f"  {statistic}\n")
+        output.write(f"\nPeak traced memory: {self.peak_bytes} bytes\n")
+        return output.getvalue()
+
+    def write(self):
+        """
+        Write the raw profile, the allocation snapshot and the report.
+
+        Returns:
+            dict: The paths written, under "profile", "allocations" and "report".
+        """
+        os.makedirs(self.output_directory, exist_ok=True)
+        paths = {
+            "profile": os.path.join(self.output_directory, PROFILE_FILE),
+            "allocations": os.path.join(self.output_directory, ALLOCATIONS_FILE),
+            "report": os.path.join(self.output_directory, REPORT_FILE),
+        }
+        self.profile.dump_stats(paths["profile"])
+        self.snapshot.dump(paths["allocations"])
+        with open(paths["report"], "w", encoding="utf-8") as report:
+            report.write(self.report())
+        return paths
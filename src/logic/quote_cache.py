@@ -0,0 +1,146 @@
+# quote_cache.py
+import sqlite3
+
+from logic.reverse_mortgage import PRICING_VERSION, calculate_reverse_mortgage_payment
+
+def normalize_quote_key(property_value, property_condition, marital_status, owner_age, spouse_age, interest_rate):
+    """
+    Build the cache key for one quote.
+
+    Numbers are stored as floats so that 500000000 and 500000000.0 share an
+    entry; the result of calculate_reverse_mortgage_payment is the same for both.
+
+    Returns:
+        tuple: The normalized (property_value, property_condition,
+        marital_status, owner_age, spouse_age, interest_rate) key.
+
+    Raises:
+        TypeError: If an input does not have the type validate_inputs expects,
+            so that it can never share a key with a valid quote.
+    """
+    if not (isinstance(property_value, (int, float)) and isinstance(interest_rate, (int, float))
+            and isinstance(owner_age, int) and isinstance(spouse_age, int)
+            and isinstance(property_condition, str) and isinstance(marital_status, str)):
+        raise TypeError("Quote inputs do not have the expected types.")
+    return (float(property_value), property_condition, marital_status, owner_age, spouse_age, float(interest_rate))
+
+class QuoteCache:
+    """
+    Persistent quote cache shared by separate runs and processes.
+
+    Entries live in a SQLite database in WAL mode, so several processes can
+    read and write the same file at once. Every entry is tagged with
+    PRICING_VERSION; entries written by another version are never returned,
+    so processes on different versions can share one file. Once the file holds
+    more than max_entries quotes, the least recently used ones are evicted,
+    whatever their version, so stale entries age out first;
+    purge_other_versions removes them at once.
+    """
+
+    def __init__(self, path, max_entries=100_000, version=PRICING_VERSION):
+        """
+        Open (or create) a quote cache.
+
+        Args:
+            path (str): The SQLite database file.
+            max_entries (int): Maximum number of cached quotes.
+            version (str): Pricing version the entries are tagged with.
+        """
+        self.max_entries = max_entries
+        self.version = version
+        self.hits = 0
+        self.misses = 0
+        self.connection = sqlite3.connect(path, timeout=30, isolation_level=None)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.execute("PRAGMA synchronous=NORMAL")
+        self.connection.execute(
+            "CREATE TABLE IF NOT EXISTS quotes ("
+            "version TEXT NOT NULL, property_value REAL NOT NULL, property_condition TEXT NOT NULL, "
+            "marital_status TEXT NOT NULL, owner_age INTEGER NOT NULL, spouse_age INTEGER NOT NULL, "
+            "interest_rate REAL NOT NULL, monthly_payment REAL NOT NULL, last_used INTEGER NOT NULL DEFAULT 0, "
+            "PRIMARY KEY (version, property_value, property_condition, marital_status, owner_age, spouse_age, interest_rate))")
+        columns = [column[1] for column in self.connection.execute("PRAGMA table_info(quotes)")]
+        if "last_used" not in columns:
+            # Files written before entries kept their last use.
+            self.connection.execute("ALTER TABLE quotes ADD COLUMN last_used INTEGER NOT NULL DEFAULT 0")
+        self.connection.execute("CREATE INDEX IF NOT EXISTS quotes_last_used ON quotes (last_used)")
+
+    def get(self, property_value, property_condition, marital_status, owner_age, spouse_age, interest_rate):
+        """
+        Return the cached payment for a quote, or None if it is not cached.
+
+        A hit marks the entry as the most recently used.
+        """
+        key = normalize_quote_key(property_value, property_condition, marital_status, owner_age, spouse_age, interest_rate)
+        row = self.connection.execute(
+            "SELECT rowid, monthly_payment FROM quotes WHERE version = ? AND property_value = ? AND property_condition = ? "
+            "AND marital_status = ? AND owner_age = ? AND spouse_age = ? AND interest_rate = ?",
+            (self.version,) + key).fetchone()
+        if row is None:
+            return None
+        self.connection.execute(
+            "UPDATE quotes SET last_used = (SELECT MAX(last_used) + 1 FROM quotes) WHERE rowid = ?", (row[0],))
+        return row[1]
+
+    def put(self, property_value, property_condition, marital_status, owner_age, spouse_age, interest_rate, monthly_payment):
+        """
+        Store the payment for a quote and evict the least recently used entries over the size cap.
+        """
+        key = normalize_quote_key(property_value, property_condition, marital_status, owner_age, spouse_age, interest_rate)
+        self.connection.execute(
+            "INSERT OR REPLACE INTO quotes VALUES (?, ?, ?, ?, ?, ?, ?, ?, (SELECT COALESCE(MAX(last_used), 0) + 1 FROM quotes))",
+            (self.version,) + key + (monthly_payment,))
+        excess = self.connection.execute("SELECT COUNT(*) FROM quotes").fetchone()[0] - self.max_entries
+        if excess > 0:
+            self.connection.execute(
+                "DELETE FROM quotes WHERE rowid IN (SELECT rowid FROM quotes ORDER BY last_used LIMIT ?)", (excess,))
+
+    def purge_other_versions(self):
+        """
+        Remove the entries written by other pricing versions.
+
+        Meant for maintenance once no process on an older version still uses
+        the file; until then their entries are only evicted as they age.
+
+        Returns:
+            int: The number of entries removed.
+        """
+        return self.connection.execute("DELETE FROM quotes WHERE version != ?", (self.version,)).rowcount
+
+    def quote(self, property_value, property_condition, marital_status, owner_age, spouse_age, interest_rate):
+        """
+        Return the monthly payment for a quote, pricing and caching it on a miss.
+
+        Invalid inputs are never cached: validation runs on every miss and its
+        exceptions propagate exactly as from calculate_reverse_mortgage_payment.
+
+        Returns:
+            float: The calculated monthly mortgage payment.
+        """
+        try:
+            monthly_payment = self.get(property_value, property_condition, marital_status, owner_age, spouse_age, interest_rate)
+        except (TypeError, OverflowError):
+            # Inputs that cannot form a key are left to validation.
+            return calculate_reverse_mortgage_payment(property_value, property_condition, marital_status, owner_age, spouse_age, interest_rate)
+
+        if monthly_payment is not None:
+            self.hits += 1
+            return monthly_payment
+
+        self.misses += 1
+        monthly_payment = calculate_reverse_mortgage_payment(property_value, property_condition, marital_status, owner_age, spouse_age, interest_rate)
+        self.put(property_value, property_condition, marital_status, owner_age, spouse_age, interest_rate, monthly_payment)
+        return monthly_payment
+
+    def __len__(self):
+        return self.connection.execute("SELECT COUNT(*) FROM quotes WHERE version = ?", (self.version,)).fetchone()[0]
+
+    def close(self):
+        """Close the database connection."""
+        self.connection.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc_info):
+        self.close()
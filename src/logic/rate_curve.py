@@ -0,0 +1,164 @@
+# rate_curve.py
+from array import array
+
+from logic.reverse_mortgage import (
+    InterestRateCurve,
+    DataTypeError,
+    InvalidInputError,
+    InvalidInterestRateError
+)
+
+class RateCurve(InterestRateCurve):
+    """
+    An interest rate term structure given as one annual forward rate per month.
+
+    Month t of a loan accrues at the monthly equivalent of the t-th forward
+    rate, (1 + rate) ** (1/12) - 1, and the last rate applies to every month
+    past the end of the curve. The discount factors and their running sums
+    (the annuity factors) are computed once per curve and extended only when a
+    longer term is asked for; the discount vector of each term is built once
+    and shared by every loan with that term. Pricing a loan against a curve is
+    therefore one lookup, like pricing it at a flat rate.
+
+    A curve is passed wherever a flat interest_rate is accepted. It is compared
+    and hashed by identity, so build each curve once and reuse it.
+    """
+
+    def __init__(self, forward_rates):
+        """
+        Build a curve from annual forward rates.
+
+        Args:
+            forward_rates (sequence of float): The annual forward rate of each
+                month, starting with month 1.
+
+        Raises:
+            InvalidInputError: If no rate is given.
+            DataTypeError: If a rate is not a number.
+            InvalidInterestRateError: If a rate is -100% or lower.
+        """
+        rates = tuple(forward_rates)
+        if not rates:
+            raise InvalidInputError("A rate curve needs at least one rate.")
+        for rate in rates:
+            if not isinstance(rate, (int, float)) or isinstance(rate, bool):
+                raise DataTypeError(f"Curve rates must be numbers. You entered: {rate}.")
+            if rate <= -1:
+                raise InvalidInterestRateError(f"Curve rates must be greater than -1. You entered: {rate}.")
+        self.forward_rates = rates
+        self.minimum_rate = min(rates)
+        self.maximum_rate = max(rates)
+        self._monthly_rates = array("d", ((1 + rate) ** (1/12) - 1 for rate in rates))
+        self._discount_factors = array("d")
+        self._annuity_factors = array("d")
+        self._discount_vectors = {}
+
+    @classmethod
+    def flat(cls, rate):
+        """Return the curve of a constant annual rate."""
+        return cls((rate,))
+
+    @classmethod
+    def from_zero_rates(cls, tenors, zero_rates):
+        """
+        Build a curve from annual zero-coupon rates at a few tenors.
+
+        Zero rates are interpolated linearly between tenors and held flat
+        before the first and after the last one. Month t is discounted by
+        (1 + zero_rate(t)) ** (-t / 12), and the forward rate of each month is
+        the one that links consecutive discount factors.
+
+        Args:
+            tenors (sequence of int): Tenors in months, strictly increasing.
+            zero_rates (sequence of float): The annual zero rate at each tenor.
+
+        Returns:
+            RateCurve: A curve with one forward rate per month up to the last tenor.
+
+        Raises:
+            InvalidInputError: If the tenors are not positive, increasing
+                integers with one rate each.
+            DataTypeError: If a rate is not a number.
+        """
+        tenors = tuple(tenors)
+        zero_rates = tuple(zero_rates)
+        if not tenors or len(tenors) != len(zero_rates):
+            raise InvalidInputError(f"A rate curve needs one zero rate per tenor. You entered {len(tenors)} tenors and {len(zero_rates)} rates.")
+        if any(not isinstance(tenor, int) or tenor <= 0 for tenor in tenors) or any(a >= b for a, b in zip(tenors, tenors[1:])):
+            raise InvalidInputError(f"Tenors must be positive, strictly increasing numbers of months. You entered: {', '.join(map(str, tenors))}.")
+        for rate in zero_rates:
+            if not isinstance(rate, (int, float)) or isinstance(rate, bool):
+                raise DataTypeError(f"Curve rates must be numbers. You entered: {rate}.")
+
+        forward_rates = []
+        previous_discount = 1.0
+        segment = 0
+        for month in range(1, tenors[-1] + 1):
+            while month > tenors[segment]:
+                segment += 1
+            if segment == 0:
+                zero_rate = zero_rates[0]
+            else:
+                start, stop = tenors[segment - 1], tenors[segment]
+                zero_rate = zero_rates[segment - 1] + (zero_rates[segment] - zero_rates[segment - 1]) * (month - start) / (stop - start)
+            discount = (1 + zero_rate) ** (-month / 12)
+            forward_rates.append((previous_discount / discount) ** 12 - 1)
+            previous_discount = discount
+        return cls(forward_rates)
+
+    def __len__(self):
+        return len(self.forward_rates)
+
+    def __repr__(self):
+        return f"RateCurve({len(self.forward_rates)} months, {self.minimum_rate:g} to {self.maximum_rate:g})"
+
+    def _extend(self, months):
+        """Compute the discount and annuity factors up to months, if not done yet."""
+        discount_factors = self._discount_factors
+        annuity_factors = self._annuity_factors
+        monthly_rates = self._monthly_rates
+        known = len(discount_factors)
+        if months <= known:
+            return
+        discount = discount_factors[-1] if known else 1.0
+        annuity = annuity_factors[-1] if known else 0.0
+        last_rate = monthly_rates[-1]
+        for month in range(known, months):
+            discount /= 1 + (monthly_rates[month] if month < len(monthly_rates) else last_rate)
+            annuity += discount
+            discount_factors.append(discount)
+            annuity_factors.append(annuity)
+
+    def discount_factors(self, months):
+        """
+        Return the discount factors of months 1 to months.
+
+        Returns:
+            array: The shared discount vector of the term ('d' typecode); do not modify it.
+        """
+        vector = self._discount_vectors.get(months)
+        if vector is None:
+            self._extend(months)
+            vector = self._discount_vectors[months] = self._discount_factors[:months]
+        return vector
+
+    def annuity_terms(self, months):
+        """
+        Return the annuity terms of a term, as get_annuity_terms does for a flat rate.
+
+        The level payment that repays an amount over the term is
+        amount / annuity_factor, with annuity_factor the sum of the term's
+        discount factors, so the terms are (1.0, annuity_factor).
+
+        Returns:
+            tuple: (1.0, annuity_factor).
+        """
+        self._extend(months)
+        return 1.0, self._annuity_factors[months - 1]
+
+    def monthly_rates(self, months):
+        """Return the monthly rate applied in each of months 1 to months."""
+        monthly_rates = self._monthly_rates
+        if months <= len(monthly_rates):
+            return monthly_rates[:months]
+        return monthly_rates + array("d", [monthly_rates[-1]]) * (months - len(monthly_rates))
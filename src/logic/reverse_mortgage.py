@@ -1,4 +1,9 @@
 # reverse_mortgage.py
+from abc import ABC, abstractmethod
+from array import array
+from functools import lru_cache
+from types import MappingProxyType
+
 class DataTypeError(Exception):
     """Exception raised for errors in data types."""
     pass
@@ -31,6 +36,70 @@ class InvalidInputError(Exception):
     """Custom exception for invalid inputs."""
     pass
 
+class UnattainablePaymentError(Exception):
+    """Exception raised when no input within the validation limits gives a target payment."""
+    pass
+
+class InterestRateCurve(ABC):
+    """
+    Base class of the term structures accepted in place of a flat interest rate.
+
+    Subclasses set minimum_rate and maximum_rate, the lowest and highest annual
+    rates of the curve, which validate_inputs checks against the product limit,
+    and implement annuity_terms and monthly_rates. Curves are hashed by
+    identity, as get_annuity_terms caches them.
+    """
+    minimum_rate = None
+    maximum_rate = None
+
+    @abstractmethod
+    def annuity_terms(self, months):
+        """Return the (1.0, annuity_factor) pair get_annuity_terms returns for this curve."""
+
+    @abstractmethod
+    def monthly_rates(self, months):
+        """Return the monthly rate applied in each of the first months months."""
+
+# Names of the calculate_reverse_mortgage_payment arguments, in order, as used
+# by record-based inputs (files, JSON requests).
+APPLICANT_FIELDS = ("property_value", "property_condition", "marital_status", "owner_age", "spouse_age", "interest_rate")
+
+# Version of the pricing rules. Bump it whenever the formula, the condition
+# adjustments or the validation limits change, so persisted quotes priced with
+# the old rules are discarded.
+PRICING_VERSION = "1"
+
+# Bulk validation flags. Each flag is one check of validate_inputs, and the
+# flags follow the order in which validate_inputs runs its checks, so the
+# lowest flag set in a row tells which exception the scalar path would raise.
+PROPERTY_VALUE_TYPE_FLAG = 1 << 0
+AGE_TYPE_FLAG = 1 << 1
+INTEREST_RATE_TYPE_FLAG = 1 << 2
+NON_POSITIVE_PROPERTY_VALUE_FLAG = 1 << 3
+PROPERTY_VALUE_RANGE_FLAG = 1 << 4
+MAXIMUM_AGE_FLAG = 1 << 5
+MINIMUM_AGE_FLAG = 1 << 6
+INTEREST_RATE_RANGE_FLAG = 1 << 7
+PROPERTY_CONDITION_FLAG = 1 << 8
+MARITAL_STATUS_FLAG = 1 << 9
+
+VALIDATION_FLAGS = {
+    PROPERTY_VALUE_TYPE_FLAG: ("property_value_type", DataTypeError),
+    AGE_TYPE_FLAG: ("age_type", DataTypeError),
+    INTEREST_RATE_TYPE_FLAG: ("interest_rate_type", DataTypeError),
+    NON_POSITIVE_PROPERTY_VALUE_FLAG: ("non_positive_property_value", InvalidPropertyValueError),
+    PROPERTY_VALUE_RANGE_FLAG: ("property_value_range", ExcessivePropertyValueError),
+    MAXIMUM_AGE_FLAG: ("maximum_age", InvalidPropertyValueError),
+    MINIMUM_AGE_FLAG: ("minimum_age", InvalidPropertyValueError),
+    INTEREST_RATE_RANGE_FLAG: ("interest_rate_range", InvalidInterestRateError),
+    PROPERTY_CONDITION_FLAG: ("property_condition", InvalidPropertyConditionError),
+    MARITAL_STATUS_FLAG: ("marital_status", InvalidMaritalStatusError),
+}
+
+# Recorder installed by logic.instrumentation.enable(). While it is None the
+# pricing functions do no timing work beyond this one check.
+instrumentation = None
+
 def get_input(prompt: str, expected_type: type = str, valid_values: list = None):
     """
     Generalized input function to handle different data types and validation.
@@ -102,7 +171,7 @@ def get_input(prompt: str, expected_type: type = str, valid_values: list = None)
                 
         else:
             print("Error: Unsupported expected_type provided.")
-def validate_inputs(property_value, property_condition, marital_status, owner_age, spouse_age, interest_rate):
+def validate_inputs(property_value, property_condition, marital_status, owner_age, spouse_age, interest_rate, product=None):
     """
     Function to validate inputs, raising exceptions if inputs are invalid.
     
@@ -112,7 +181,9 @@ def validate_inputs(property_value, property_condition, marital_status, owner_ag
         marital_status (str): The marital status of the owner.
         owner_age (int): The age of the owner.
         spouse_age (int): The age of the spouse.
-        interest_rate (float): The interest rate of the mortgage.
+        interest_rate (float or InterestRateCurve): The interest rate of the
+            mortgage; every rate of a curve must be within the limit.
+        product (ProductConfig): The product whose limits apply (default: DEFAULT_PRODUCT).
         
     Raises:
         DataTypeError: If any input has an incorrect data type.
@@ -122,6 +193,9 @@ def validate_inputs(property_value, property_condition, marital_status, owner_ag
         InvalidPropertyConditionError: If the property condition is invalid.
         InvalidMaritalStatusError: If the marital status is invalid.
     """
+    if product is None:
+        product = DEFAULT_PRODUCT
+
     # Type verification
     if not isinstance(property_value, (int, float)):
         raise DataTypeError(f"Property value must be a number. You entered: {property_value}.")
@@ -129,35 +203,37 @@ def validate_inputs(property_value, property_condition, marital_status, owner_ag
     if not isinstance(owner_age, int) or not isinstance(spouse_age, int):
         raise DataTypeError(f"Owner and spouse ages must be integers. You entered: owner age = {owner_age}, spouse age = {spouse_age}.")
     
-    if not isinstance(interest_rate, (int, float)):
+    if isinstance(interest_rate, (int, float)):
+        lowest_rate = highest_rate = interest_rate
+    elif isinstance(interest_rate, InterestRateCurve):
+        lowest_rate, highest_rate = interest_rate.minimum_rate, interest_rate.maximum_rate
+    else:
         raise DataTypeError(f"Interest rate must be a number. You entered: {interest_rate}.")
     
     # Validation
     if property_value <= 0:
         raise InvalidPropertyValueError(f"Property value must be a positive number. You entered: {property_value}.")
     
-    if not (200_000_000 <= property_value <= 900_000_000):
-        raise ExcessivePropertyValueError(f"Property value must be between 200,000,000 and 900,000,000. You entered: {property_value}.")
+    if not (product.minimum_property_value <= property_value <= product.maximum_property_value):
+        raise ExcessivePropertyValueError(f"Property value must be between {product.minimum_property_value:,} and {product.maximum_property_value:,}. You entered: {property_value}.")
     
     min_age = min(owner_age, spouse_age)
-    if min_age > 85:
-        raise InvalidPropertyValueError("Owner and spouse age must not exceed 85.")
+    if min_age > product.maximum_age:
+        raise InvalidPropertyValueError(f"Owner and spouse age must not exceed {product.maximum_age}.")
     
-    if owner_age < 18 or spouse_age < 18:
-        raise InvalidPropertyValueError(f"Owner and spouse must be at least 18 years old. You entered: owner age = {owner_age}, spouse age = {spouse_age}.")
+    if owner_age < product.minimum_age or spouse_age < product.minimum_age:
+        raise InvalidPropertyValueError(f"Owner and spouse must be at least {product.minimum_age} years old. You entered: owner age = {owner_age}, spouse age = {spouse_age}.")
     
-    if not (0 < interest_rate <= 1):
-        raise InvalidInterestRateError(f"Interest rate must be between 0 and 1. You entered: {interest_rate}.")
+    if not (0 < lowest_rate and highest_rate <= product.maximum_interest_rate):
+        raise InvalidInterestRateError(f"Interest rate must be between 0 and {product.maximum_interest_rate}. You entered: {interest_rate}.")
     
-    valid_conditions = ["excellent", "good", "average"]
-    if property_condition not in valid_conditions:
-        raise InvalidPropertyConditionError(f"Invalid property condition: '{property_condition}'. Must be one of {', '.join(valid_conditions)}.")
+    if property_condition not in product.property_conditions:
+        raise InvalidPropertyConditionError(f"Invalid property condition: '{property_condition}'. Must be one of {', '.join(product.property_conditions)}.")
     
-    valid_marital_statuses = ["married", "single", "divorced"]
-    if marital_status not in valid_marital_statuses:
-        raise InvalidMaritalStatusError(f"Invalid marital status: '{marital_status}'. Must be one of {', '.join(valid_marital_statuses)}.")
+    if marital_status not in product.marital_statuses:
+        raise InvalidMaritalStatusError(f"Invalid marital status: '{marital_status}'. Must be one of {', '.join(product.marital_statuses)}.")
 
-def calculate_reverse_mortgage_payment(property_value, property_condition, marital_status, owner_age, spouse_age, interest_rate):
+def calculate_reverse_mortgage_payment(property_value, property_condition, marital_status, owner_age, spouse_age, interest_rate, life_table=None, product=None):
     """
     Calculate the monthly reverse mortgage payment.
     
@@ -167,34 +243,35 @@ def calculate_reverse_mortgage_payment(property_value, property_condition, marit
         marital_status (str): The marital status of the owner.
         owner_age (int): The age of the owner.
         spouse_age (int): The age of the spouse.
-        interest_rate (float): The interest rate of the mortgage.
+        interest_rate (float or InterestRateCurve): The interest rate of the
+            mortgage, or a rate curve (see logic.rate_curve).
+        life_table (LifeTable): Optional mortality table giving the payment
+            term; by default the term comes from get_life_expectancy.
+        product (ProductConfig): The product to price (default: DEFAULT_PRODUCT).
         
     Returns:
         float: The calculated monthly mortgage payment.
     """
+    if product is None:
+        product = DEFAULT_PRODUCT
+    if instrumentation is not None:
+        return instrumentation.price(property_value, property_condition, marital_status, owner_age, spouse_age, interest_rate, life_table, product)
+
     # Validate inputs
-    validate_inputs(property_value, property_condition, marital_status, owner_age, spouse_age, interest_rate)
+    validate_inputs(property_value, property_condition, marital_status, owner_age, spouse_age, interest_rate, product)
 
     # Adjust property value based on condition
-    condition_adjustment = {"excellent": 1, "good": 0.9, "average": 0.8}
-    adjusted_value = property_value * condition_adjustment[property_condition]
+    adjusted_value = property_value * product.condition_adjustment[property_condition]
 
     # Calculate life expectancy
-    youngest_age = min(owner_age, spouse_age)
-    life_expectancy_years = get_life_expectancy(youngest_age)
-    life_expectancy_months = life_expectancy_years * 12
+    if life_table is None:
+        life_expectancy_months = product.life_expectancy_months[min(owner_age, spouse_age)]
+    else:
+        life_expectancy_months = life_table.life_expectancy_months(marital_status, owner_age, spouse_age)
 
     # Calculate mortgage payment
-    loan_percentage = 0.50
-    mortgage_amount = adjusted_value * loan_percentage
-    monthly_interest_rate = (1 + interest_rate) ** (1/12) - 1
-    monthly_payment = mortgage_amount * monthly_interest_rate / (1 - (1 + monthly_interest_rate) ** -life_expectancy_months)
-
-    total_payment = monthly_payment * life_expectancy_months
-    if total_payment > mortgage_amount:
-        monthly_payment = mortgage_amount / life_expectancy_months
-
-    return round(monthly_payment, 2)
+    mortgage_amount = adjusted_value * product.loan_percentage
+    return _monthly_payment(mortgage_amount, interest_rate, life_expectancy_months)
 
 def get_life_expectancy(age):
     """
@@ -213,11 +290,473 @@ def get_life_expectancy(age):
     else:
         return 25
 
+class ProductConfig:
+    """
+    Immutable pricing rules of one reverse mortgage product.
+
+    Everything the pricing functions look up per applicant is built once here:
+    the condition adjustments by name, integer codes for the property
+    conditions and marital statuses with a tuple of per-code factors, the
+    limits and the payment term in months for every youngest age the product
+    accepts. Several products can be priced side by side by passing different
+    instances, and instances can be pickled to reach worker processes.
+    """
+
+    __slots__ = (
+        "name", "property_conditions", "condition_adjustment", "condition_codes", "condition_factors",
+        "marital_statuses", "marital_status_codes", "loan_percentage", "minimum_property_value",
+        "maximum_property_value", "minimum_age", "maximum_age", "maximum_interest_rate",
+        "life_expectancy_months",
+    )
+
+    def __init__(self, name="standard", condition_adjustment=(("excellent", 1), ("good", 0.9), ("average", 0.8)),
+                 marital_statuses=("married", "single", "divorced"), loan_percentage=0.50,
+                 minimum_property_value=200_000_000, maximum_property_value=900_000_000,
+                 minimum_age=18, maximum_age=85, maximum_interest_rate=1, life_expectancy=get_life_expectancy):
+        """
+        Precompile a product.
+
+        Args:
+            name (str): The product name.
+            condition_adjustment (sequence of tuple): (condition, factor) pairs,
+                in the order used by error messages; codes follow this order.
+            marital_statuses (sequence of str): Accepted marital statuses.
+            loan_percentage (float): Share of the adjusted value that is lent.
+            minimum_property_value (int): Lowest accepted property value.
+            maximum_property_value (int): Highest accepted property value.
+            minimum_age (int): Lowest accepted owner and spouse age.
+            maximum_age (int): Highest accepted age of the youngest of both.
+            maximum_interest_rate (float): Highest accepted interest rate.
+            life_expectancy (callable): Life expectancy in years by age.
+        """
+        condition_adjustment = tuple(condition_adjustment)
+        setattr_ = object.__setattr__
+        setattr_(self, "name", name)
+        setattr_(self, "property_conditions", tuple(condition for condition, _ in condition_adjustment))
+        setattr_(self, "condition_adjustment", MappingProxyType(dict(condition_adjustment)))
+        setattr_(self, "condition_codes", MappingProxyType({condition: code for code, (condition, _) in enumerate(condition_adjustment)}))
+        setattr_(self, "condition_factors", tuple(factor for _, factor in condition_adjustment))
+        setattr_(self, "marital_statuses", tuple(marital_statuses))
+        setattr_(self, "marital_status_codes", MappingProxyType({status: code for code, status in enumerate(marital_statuses)}))
+        setattr_(self, "loan_percentage", loan_percentage)
+        setattr_(self, "minimum_property_value", minimum_property_value)
+        setattr_(self, "maximum_property_value", maximum_property_value)
+        setattr_(self, "minimum_age", minimum_age)
+        setattr_(self, "maximum_age", maximum_age)
+        setattr_(self, "maximum_interest_rate", maximum_interest_rate)
+        setattr_(self, "life_expectancy_months", tuple(life_expectancy(age) * 12 for age in range(maximum_age + 1)))
+
+    def __setattr__(self, name, value):
+        raise AttributeError(f"ProductConfig is immutable; build a new one instead of setting '{name}'.")
+
+    def __delattr__(self, name):
+        raise AttributeError(f"ProductConfig is immutable; cannot delete '{name}'.")
+
+    def __repr__(self):
+        return f"ProductConfig(name={self.name!r})"
+
+    def __reduce__(self):
+        # A mappingproxy cannot be pickled, so the lookups travel as dicts.
+        state = {name: getattr(self, name) for name in self.__slots__}
+        for name in _PRODUCT_MAPPINGS:
+            state[name] = dict(state[name])
+        return _restore_product, (state,)
+
+    def encode_conditions(self, property_conditions):
+        """
+        Return the integer code of each property condition, -1 if it is not accepted.
 
+        Returns:
+            array: Signed byte codes, in input order.
+        """
+        codes = self.condition_codes
+        return array("b", (codes.get(condition, -1) if condition.__class__ is str else -1 for condition in property_conditions))
 
+    def encode_marital_statuses(self, marital_statuses):
+        """
+        Return the integer code of each marital status, -1 if it is not accepted.
 
+        Returns:
+            array: Signed byte codes, in input order.
+        """
+        codes = self.marital_status_codes
+        return array("b", (codes.get(status, -1) if status.__class__ is str else -1 for status in marital_statuses))
 
+_PRODUCT_MAPPINGS = ("condition_adjustment", "condition_codes", "marital_status_codes")
 
+def _restore_product(state):
+    """Rebuild a ProductConfig from the state returned by its __reduce__."""
+    product = object.__new__(ProductConfig)
+    for name, value in state.items():
+        object.__setattr__(product, name, MappingProxyType(value) if name in _PRODUCT_MAPPINGS else value)
+    return product
 
+# The product priced when no other one is given.
+DEFAULT_PRODUCT = ProductConfig()
 
+ANNUITY_CACHE_SIZE = 1024
+
+# Batches of at least this many rows are priced with NumPy when it is installed.
+VECTORIZED_MINIMUM_ROWS = 100
+
+# The NumPy batch pricer, loaded on the first large batch; False when NumPy is
+# not installed. Loading it lazily keeps NumPy out of small runs and start-up.
+_vectorized_pricer = None
+LIFE_EXPECTANCY_MONTHS = (180, 240, 300)
+
+@lru_cache(maxsize=ANNUITY_CACHE_SIZE)
+def get_annuity_terms(interest_rate, months):
+    """
+    Return the monthly rate and annuity denominator for a rate and term.
+
+    Results are kept in a bounded LRU cache keyed by (interest_rate, months);
+    only three terms exist and a portfolio uses few distinct rates, so repeated
+    quotes skip both power operations.
+
+    A rate curve is answered by its own annuity_terms, (1.0, annuity_factor)
+    where the annuity factor is the sum of the curve's discount factors over
+    the term, so mortgage_amount * monthly_interest_rate / annuity_denominator
+    is the level payment under the curve. Curves are cached too, keyed by
+    identity, so the cache holds a strong reference to up to
+    ANNUITY_CACHE_SIZE of the most recently priced curves (with their
+    discount factors) until newer keys evict them; a process building many
+    short-lived curves can release them with get_annuity_terms.cache_clear().
+
+    Args:
+        interest_rate (float or InterestRateCurve): The annual interest rate of the mortgage.
+        months (int): The number of monthly payments.
+
+    Returns:
+        tuple: (monthly_interest_rate, 1 - (1 + monthly_interest_rate) ** -months).
+    """
+    if isinstance(interest_rate, InterestRateCurve):
+        return interest_rate.annuity_terms(months)
+    monthly_interest_rate = (1 + interest_rate) ** (1/12) - 1
+    return monthly_interest_rate, 1 - (1 + monthly_interest_rate) ** -months
+
+def _monthly_payment(mortgage_amount, interest_rate, months):
+    """
+    Return the monthly payment of a mortgage amount, rounded to the cent.
+
+    This is the one place the payment formula lives; every pricing path calls
+    it. The payment is the annuity that repays the amount over the term at
+    the rate, capped so the payments never add up to more than the amount.
+    A rate so small that (1 + rate) ** (1/12) rounds to 1 leaves a zero
+    annuity denominator; it is priced at the limit of the formula as the
+    rate goes to 0, mortgage_amount / months, which is also the cap.
+    Bump PRICING_VERSION whenever it changes.
+
+    Args:
+        mortgage_amount (float): The amount lent.
+        interest_rate (float or InterestRateCurve): The interest rate of the mortgage.
+        months (int): The number of monthly payments.
+
+    Returns:
+        float: The monthly payment.
+    """
+    monthly_interest_rate, annuity_denominator = get_annuity_terms(interest_rate, months)
+    if not annuity_denominator:
+        return round(mortgage_amount / months, 2)
+    monthly_payment = mortgage_amount * monthly_interest_rate / annuity_denominator
+
+    total_payment = monthly_payment * months
+    if total_payment > mortgage_amount:
+        monthly_payment = mortgage_amount / months
+
+    return round(monthly_payment, 2)
+
+def annuity_cache_info():
+    """
+    Return the hit/miss statistics of the annuity cache.
+
+    Returns:
+        CacheInfo: A named tuple with hits, misses, maxsize and currsize.
+    """
+    return get_annuity_terms.cache_info()
+
+def warm_annuity_cache(interest_rates, months=LIFE_EXPECTANCY_MONTHS):
+    """
+    Pre-compute the annuity terms for a list of rates and every term.
+
+    Args:
+        interest_rates (iterable of float): The annual rates to load.
+        months (iterable of int): The terms to load, by default every term
+            get_life_expectancy can produce.
+    """
+    for interest_rate in interest_rates:
+        for term in months:
+            get_annuity_terms(interest_rate, term)
+
+def calculate_reverse_mortgage_payments(property_values, property_conditions, marital_statuses, owner_ages, spouse_ages, interest_rates, life_table=None, product=None):
+    """
+    Calculate the monthly reverse mortgage payment for a batch of applicants.
+
+    The inputs are parallel columns (one entry per applicant). Every row is
+    validated exactly like calculate_reverse_mortgage_payment and priced with
+    the same arithmetic, so each result matches the scalar function to the cent.
+    The condition adjustments and life expectancy terms come from the
+    precompiled product, and the monthly rate terms from the annuity cache.
+
+    With NumPy installed (pip install .[fast]), a batch of at least
+    VECTORIZED_MINIMUM_ROWS rows priced by the product's own terms is
+    validated and priced with array operations by logic.vectorized. Batches
+    with an invalid row or a rate curve, and every batch without NumPy, are
+    priced row by row, which saves the per-call overhead of the scalar path
+    but not the per-row arithmetic.
+
+    Args:
+        property_values (sequence of int or float): The values of the properties.
+        property_conditions (sequence of str): The conditions of the properties.
+        marital_statuses (sequence of str): The marital statuses of the owners.
+        owner_ages (sequence of int): The ages of the owners.
+        spouse_ages (sequence of int): The ages of the spouses.
+        interest_rates (sequence of float or InterestRateCurve): The interest rates of the mortgages.
+        life_table (LifeTable): Optional mortality table giving the payment
+            terms; by default the terms come from get_life_expectancy.
+        product (ProductConfig): The product to price (default: DEFAULT_PRODUCT).
+
+    Returns:
+        list: The calculated monthly mortgage payments, in input order.
+
+    Raises:
+        InvalidInputError: If the columns do not have the same length.
+        Any exception raised by validate_inputs, for the first invalid row.
+    """
+    columns = (property_values, property_conditions, marital_statuses, owner_ages, spouse_ages, interest_rates)
+    row_count = len(property_values)
+    if any(len(column) != row_count for column in columns):
+        raise InvalidInputError(f"All input columns must have the same length. You entered lengths: {', '.join(str(len(column)) for column in columns)}.")
+
+    if product is None:
+        product = DEFAULT_PRODUCT
+    if instrumentation is not None:
+        return instrumentation.price_batch(_price_batch, columns, life_table, product)
+    if life_table is None and row_count >= VECTORIZED_MINIMUM_ROWS and _load_vectorized_pricer():
+        payments = _vectorized_pricer(columns, product)
+        if payments is not None:
+            return payments
+    return _price_batch(columns, life_table, product)
+
+def _load_vectorized_pricer():
+    """Return the NumPy batch pricer, or False if NumPy is not installed."""
+    global _vectorized_pricer
+    if _vectorized_pricer is None:
+        try:
+            from logic.vectorized import price_batch
+        except ImportError:
+            price_batch = False
+        _vectorized_pricer = price_batch
+    return _vectorized_pricer
+
+def _price_batch(columns, life_table, product):
+    """Price equal-length applicant columns for calculate_reverse_mortgage_payments."""
+    condition_adjustment = product.condition_adjustment
+    valid_conditions = product.property_conditions
+    valid_marital_statuses = product.marital_statuses
+    minimum_property_value = product.minimum_property_value
+    maximum_property_value = product.maximum_property_value
+    minimum_age = product.minimum_age
+    maximum_age = product.maximum_age
+    maximum_interest_rate = product.maximum_interest_rate
+    loan_percentage = product.loan_percentage
+    months_by_age = product.life_expectancy_months
+    number_types = (int, float)
+    # Identities of the rate curves already validated in this batch, so loans
+    # sharing a curve take the inline check like loans with a flat rate.
+    accepted_curves = set()
+    payments = []
+    append = payments.append
+
+    for property_value, property_condition, marital_status, owner_age, spouse_age, interest_rate in zip(*columns):
+        # Inline check for the common valid row; anything unusual goes through
+        # validate_inputs so the raised exception is the same as the scalar path.
+        youngest_age = min(owner_age, spouse_age) if owner_age.__class__ is int and spouse_age.__class__ is int else None
+        if not (property_value.__class__ in number_types
+                and (0 < interest_rate <= maximum_interest_rate if interest_rate.__class__ in number_types else id(interest_rate) in accepted_curves)
+                and youngest_age is not None and minimum_age <= youngest_age <= maximum_age
+                and minimum_property_value <= property_value <= maximum_property_value
+                and property_condition in valid_conditions and marital_status in valid_marital_statuses):
+            validate_inputs(property_value, property_condition, marital_status, owner_age, spouse_age, interest_rate, product)
+            youngest_age = min(owner_age, spouse_age)
+            if isinstance(interest_rate, InterestRateCurve):
+                accepted_curves.add(id(interest_rate))
+
+        mortgage_amount = property_value * condition_adjustment[property_condition] * loan_percentage
+
+        if life_table is None:
+            life_expectancy_months = months_by_age[youngest_age]
+        else:
+            life_expectancy_months = life_table.life_expectancy_months(marital_status, owner_age, spouse_age)
+
+        append(_monthly_payment(mortgage_amount, interest_rate, life_expectancy_months))
+
+    return payments
+
+def validate_inputs_bulk(property_values, property_conditions, marital_statuses, owner_ages, spouse_ages, interest_rates, product=None):
+    """
+    Validate a batch of applicants in one pass without raising per row.
+
+    Every check of validate_inputs is applied to every row, so a row reports
+    all of its problems instead of only the first one. Numeric range checks are
+    skipped for a field whose type is already wrong, as validate_inputs would
+    never reach them.
+
+    Args:
+        property_values (sequence of int or float): The values of the properties.
+        property_conditions (sequence of str): The conditions of the properties.
+        marital_statuses (sequence of str): The marital statuses of the owners.
+        owner_ages (sequence of int): The ages of the owners.
+        spouse_ages (sequence of int): The ages of the spouses.
+        interest_rates (sequence of float or InterestRateCurve): The interest rates of the mortgages.
+        product (ProductConfig): The product whose limits apply (default: DEFAULT_PRODUCT).
+
+    Returns:
+        tuple: An array.array of unsigned per-row bitmasks built from the
+        *_FLAG constants (0 means the row is valid), and a dict with the number
+        of rows failing each check, keyed by the names in VALIDATION_FLAGS.
+
+    Raises:
+        InvalidInputError: If the columns do not have the same length.
+    """
+    columns = (property_values, property_conditions, marital_statuses, owner_ages, spouse_ages, interest_rates)
+    row_count = len(property_values)
+    if any(len(column) != row_count for column in columns):
+        raise InvalidInputError(f"All input columns must have the same length. You entered lengths: {', '.join(str(len(column)) for column in columns)}.")
+
+    if product is None:
+        product = DEFAULT_PRODUCT
+    valid_conditions = product.property_conditions
+    valid_marital_statuses = product.marital_statuses
+    minimum_property_value = product.minimum_property_value
+    maximum_property_value = product.maximum_property_value
+    minimum_age = product.minimum_age
+    maximum_age = product.maximum_age
+    maximum_interest_rate = product.maximum_interest_rate
+    number_types = (int, float)
+    codes = array("H", bytes(2 * row_count))
+    counts = dict.fromkeys(VALIDATION_FLAGS, 0)
+
+    for index, (property_value, property_condition, marital_status, owner_age, spouse_age, interest_rate) in enumerate(zip(*columns)):
+        code = 0
+
+        if isinstance(property_value, number_types):
+            if property_value <= 0:
+                code |= NON_POSITIVE_PROPERTY_VALUE_FLAG
+            elif not (minimum_property_value <= property_value <= maximum_property_value):
+                code |= PROPERTY_VALUE_RANGE_FLAG
+        else:
+            code |= PROPERTY_VALUE_TYPE_FLAG
+
+        if isinstance(owner_age, int) and isinstance(spouse_age, int):
+            if min(owner_age, spouse_age) > maximum_age:
+                code |= MAXIMUM_AGE_FLAG
+            if owner_age < minimum_age or spouse_age < minimum_age:
+                code |= MINIMUM_AGE_FLAG
+        else:
+            code |= AGE_TYPE_FLAG
+
+        if isinstance(interest_rate, number_types):
+            if not (0 < interest_rate <= maximum_interest_rate):
+                code |= INTEREST_RATE_RANGE_FLAG
+        elif isinstance(interest_rate, InterestRateCurve):
+            if not (0 < interest_rate.minimum_rate and interest_rate.maximum_rate <= maximum_interest_rate):
+                code |= INTEREST_RATE_RANGE_FLAG
+        else:
+            code |= INTEREST_RATE_TYPE_FLAG
+
+        if property_condition not in valid_conditions:
+            code |= PROPERTY_CONDITION_FLAG
+
+        if marital_status not in valid_marital_statuses:
+            code |= MARITAL_STATUS_FLAG
+
+        if code:
+            codes[index] = code
+            for flag in counts:
+                if code & flag:
+                    counts[flag] += 1
+
+    summary = {VALIDATION_FLAGS[flag][0]: count for flag, count in counts.items()}
+    return codes, summary
+
+def validation_error_for(code):
+    """
+    Return the exception class validate_inputs would raise for a bulk code.
+
+    Args:
+        code (int): A per-row bitmask returned by validate_inputs_bulk.
+
+    Returns:
+        type or None: The exception class of the first failing check, or None
+        if the row is valid.
+    """
+    if not code:
+        return None
+    return VALIDATION_FLAGS[code & -code][1]
+
+def calculate_product_payments(property_values, property_conditions, marital_statuses, owner_ages, spouse_ages, interest_rates, products, life_table=None):
+    """
+    Price a portfolio under several products in one pass over its rows.
+
+    Each row is read once and priced with every product, each with its own
+    limits, adjustments and terms. Rows a product does not accept get None
+    for that product instead of raising, so one product's limits cannot stop
+    the others.
+
+    Args:
+        property_values (sequence of int or float): The values of the properties.
+        property_conditions (sequence of str): The conditions of the properties.
+        marital_statuses (sequence of str): The marital statuses of the owners.
+        owner_ages (sequence of int): The ages of the owners.
+        spouse_ages (sequence of int): The ages of the spouses.
+        interest_rates (sequence of float or InterestRateCurve): The interest rates of the mortgages.
+        products (sequence of ProductConfig): The products to price.
+        life_table (LifeTable): Optional mortality table giving the payment
+            terms; by default the terms come from each product.
+
+    Returns:
+        dict: For each product name, the list of monthly payments in input
+        order, with None for the rows the product rejects.
+
+    Raises:
+        InvalidInputError: If the columns do not have the same length or two
+            products share a name.
+    """
+    columns = (property_values, property_conditions, marital_statuses, owner_ages, spouse_ages, interest_rates)
+    row_count = len(property_values)
+    if any(len(column) != row_count for column in columns):
+        raise InvalidInputError(f"All input columns must have the same length. You entered lengths: {', '.join(str(len(column)) for column in columns)}.")
+    names = [product.name for product in products]
+    if len(set(names)) != len(names):
+        raise InvalidInputError(f"Every product needs its own name. You entered: {', '.join(map(str, names))}.")
+
+    results = {product.name: [] for product in products}
+    pricers = [(product, results[product.name].append) for product in products]
+    number_types = (int, float)
+
+    for property_value, property_condition, marital_status, owner_age, spouse_age, interest_rate in zip(*columns):
+        if interest_rate.__class__ in number_types or not isinstance(interest_rate, InterestRateCurve):
+            lowest_rate = highest_rate = interest_rate
+        else:
+            lowest_rate, highest_rate = interest_rate.minimum_rate, interest_rate.maximum_rate
+        typed = (isinstance(property_value, number_types) and isinstance(lowest_rate, number_types)
+                 and isinstance(owner_age, int) and isinstance(spouse_age, int))
+        youngest_age = min(owner_age, spouse_age) if typed else None
+        for product, append in pricers:
+            if not (typed and product.minimum_age <= owner_age and product.minimum_age <= spouse_age
+                    and youngest_age <= product.maximum_age
+                    and product.minimum_property_value <= property_value <= product.maximum_property_value
+                    and 0 < lowest_rate and highest_rate <= product.maximum_interest_rate
+                    and property_condition in product.property_conditions
+                    and marital_status in product.marital_statuses):
+                append(None)
+                continue
+
+            mortgage_amount = property_value * product.condition_adjustment[property_condition] * product.loan_percentage
+            if life_table is None:
+                life_expectancy_months = product.life_expectancy_months[youngest_age]
+            else:
+                life_expectancy_months = life_table.life_expectancy_months(marital_status, owner_age, spouse_age)
+            append(_monthly_payment(mortgage_amount, interest_rate, life_expectancy_months))
 
+    return results
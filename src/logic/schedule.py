@@ -0,0 +1,164 @@
+# schedule.py
+from array import array
+from collections import namedtuple
+from itertools import repeat
+
+from logic.reverse_mortgage import (
+    DEFAULT_PRODUCT,
+    calculate_reverse_mortgage_payment,
+    calculate_reverse_mortgage_payments,
+    get_annuity_terms,
+    InterestRateCurve,
+)
+
+ScheduleRow = namedtuple("ScheduleRow", ["month", "payment", "accrued_interest", "balance"])
+
+def generate_schedule(property_value, property_condition, marital_status, owner_age, spouse_age, interest_rate, product=None):
+    """
+    Lazily yield the month-by-month schedule of one reverse mortgage.
+
+    Each month the owner receives the monthly payment and the outstanding
+    balance accrues interest at the monthly rate, so the balance after month t
+    is balance * (1 + monthly_rate) + payment. Rows are produced one at a time
+    up to the life expectancy term.
+
+    Args:
+        property_value (int or float): The value of the property.
+        property_condition (str): The condition of the property.
+        marital_status (str): The marital status of the owner.
+        owner_age (int): The age of the owner.
+        spouse_age (int): The age of the spouse.
+        interest_rate (float or InterestRateCurve): The interest rate of the mortgage;
+            under a curve each month accrues at its own forward rate.
+        product (ProductConfig): The product to price (default: DEFAULT_PRODUCT).
+
+    Yields:
+        ScheduleRow: (month, payment, accrued_interest, balance), starting at month 1.
+
+    Raises:
+        Any exception raised by validate_inputs, before the first row.
+    """
+    if product is None:
+        product = DEFAULT_PRODUCT
+    monthly_payment = calculate_reverse_mortgage_payment(property_value, property_condition, marital_status, owner_age, spouse_age, interest_rate, product=product)
+    return _schedule_rows(monthly_payment, min(owner_age, spouse_age), interest_rate, product)
+
+def _monthly_rates(interest_rate, months):
+    """Return the monthly rate of each month of a term, for a flat rate or a rate curve."""
+    if isinstance(interest_rate, InterestRateCurve):
+        return interest_rate.monthly_rates(months)
+    return repeat(get_annuity_terms(interest_rate, months)[0], months)
+
+def _schedule_rows(monthly_payment, youngest_age, interest_rate, product):
+    """Yield the schedule rows of an already validated and priced loan."""
+    life_expectancy_months = product.life_expectancy_months[youngest_age]
+    balance = 0.0
+    for month, monthly_interest_rate in enumerate(_monthly_rates(interest_rate, life_expectancy_months), 1):
+        accrued_interest = balance * monthly_interest_rate
+        balance += accrued_interest + monthly_payment
+        yield ScheduleRow(month, monthly_payment, accrued_interest, balance)
+
+class PortfolioSchedule:
+    """
+    Month-by-month schedules of many loans stored in flat arrays of doubles.
+
+    Loan i occupies months[i] consecutive slots starting at offsets[i] in the
+    payment, accrued_interest and balance arrays, so a whole portfolio of
+    300-month schedules costs three contiguous buffers instead of one object
+    per month.
+    """
+
+    def __init__(self, months, offsets, payments, accrued_interest, balances):
+        self.months = months
+        self.offsets = offsets
+        self.payments = payments
+        self.accrued_interest = accrued_interest
+        self.balances = balances
+
+    def __len__(self):
+        return len(self.months)
+
+    def row(self, loan, month):
+        """
+        Return one month of one loan.
+
+        Args:
+            loan (int): The loan index, in input order.
+            month (int): The month number, starting at 1.
+
+        Returns:
+            ScheduleRow: The requested row.
+
+        Raises:
+            IndexError: If the month is outside the loan's term.
+        """
+        if not 1 <= month <= self.months[loan]:
+            raise IndexError(f"Month must be between 1 and {self.months[loan]}. You entered: {month}.")
+        index = self.offsets[loan] + month - 1
+        return ScheduleRow(month, self.payments[index], self.accrued_interest[index], self.balances[index])
+
+    def loan(self, loan):
+        """
+        Iterate over the rows of one loan.
+
+        Args:
+            loan (int): The loan index, in input order.
+
+        Yields:
+            ScheduleRow: The rows of the loan, from month 1.
+        """
+        for month in range(1, self.months[loan] + 1):
+            yield self.row(loan, month)
+
+    def final_balances(self):
+        """
+        Return the outstanding balance of every loan at the end of its term.
+
+        Returns:
+            array: One double per loan.
+        """
+        return array("d", (self.balances[offset + months - 1] for offset, months in zip(self.offsets, self.months)))
+
+def build_portfolio_schedule(property_values, property_conditions, marital_statuses, owner_ages, spouse_ages, interest_rates, product=None):
+    """
+    Build the schedules of a whole portfolio in array-backed storage.
+
+    Args:
+        property_values (sequence of int or float): The values of the properties.
+        property_conditions (sequence of str): The conditions of the properties.
+        marital_statuses (sequence of str): The marital statuses of the owners.
+        owner_ages (sequence of int): The ages of the owners.
+        spouse_ages (sequence of int): The ages of the spouses.
+        interest_rates (sequence of float or InterestRateCurve): The interest rates of the mortgages.
+        product (ProductConfig): The product to price (default: DEFAULT_PRODUCT).
+
+    Returns:
+        PortfolioSchedule: The schedules of every loan, in input order.
+
+    Raises:
+        Any exception raised by calculate_reverse_mortgage_payments.
+    """
+    if product is None:
+        product = DEFAULT_PRODUCT
+    monthly_payments = calculate_reverse_mortgage_payments(property_values, property_conditions, marital_statuses, owner_ages, spouse_ages, interest_rates, product=product)
+
+    months = array("H")
+    offsets = array("q")
+    payments = array("d")
+    accrued_interest = array("d")
+    balances = array("d")
+
+    for monthly_payment, owner_age, spouse_age, interest_rate in zip(monthly_payments, owner_ages, spouse_ages, interest_rates):
+        life_expectancy_months = product.life_expectancy_months[min(owner_age, spouse_age)]
+        offsets.append(len(balances))
+        months.append(life_expectancy_months)
+        payments.extend(array("d", [monthly_payment]) * life_expectancy_months)
+
+        balance = 0.0
+        for monthly_interest_rate in _monthly_rates(interest_rate, life_expectancy_months):
+            interest = balance * monthly_interest_rate
+            balance += interest + monthly_payment
+            accrued_interest.append(interest)
+            balances.append(balance)
+
+    return PortfolioSchedule(months, offsets, payments, accrued_interest, balances)
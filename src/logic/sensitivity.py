@@ -0,0 +1,111 @@
+# sensitivity.py
+from array import array
+
+from logic.reverse_mortgage import DEFAULT_PRODUCT, _monthly_payment, validate_inputs
+
+class PaymentGrid:
+    """
+    Monthly payments over a rate x property value x age x condition grid.
+
+    The payments are stored in one flat array of doubles in row-major order,
+    with the axes in the order (interest_rates, property_values, ages,
+    property_conditions).
+    """
+
+    def __init__(self, interest_rates, property_values, ages, property_conditions, values):
+        self.interest_rates = interest_rates
+        self.property_values = property_values
+        self.ages = ages
+        self.property_conditions = property_conditions
+        self.values = values
+        self.shape = (len(interest_rates), len(property_values), len(ages), len(property_conditions))
+
+    def __len__(self):
+        return len(self.values)
+
+    def __getitem__(self, indices):
+        """Return the payment at (rate_index, value_index, age_index, condition_index)."""
+        rate_index, value_index, age_index, condition_index = indices
+        _, value_count, age_count, condition_count = self.shape
+        return self.values[((rate_index * value_count + value_index) * age_count + age_index) * condition_count + condition_index]
+
+    def tolist(self):
+        """
+        Return the payments as nested lists following the grid shape.
+
+        Returns:
+            list: payments[rate][property_value][age][condition].
+        """
+        rate_count, value_count, age_count, condition_count = self.shape
+        values = self.values.tolist()
+        rows = [values[start:start + condition_count] for start in range(0, len(values), condition_count)]
+        ages = [rows[start:start + age_count] for start in range(0, len(rows), age_count)]
+        return [ages[start:start + value_count] for start in range(0, len(ages), value_count)]
+
+def calculate_payment_grid(interest_rates, property_values, ages, property_conditions, product=None):
+    """
+    Calculate the monthly payment for every combination of the given axes.
+
+    Each axis value is validated once, not once per cell. Age only matters
+    through its life expectancy bucket and condition only through its
+    adjustment, so the payments are computed once per (rate, bucket) and
+    (property value, condition) pair and then copied to every age in the
+    bucket. Every cell equals calculate_reverse_mortgage_payment for an owner
+    and spouse of that age.
+
+    Args:
+        interest_rates (sequence of float): The interest rates axis.
+        property_values (sequence of int or float): The property values axis.
+        ages (sequence of int): The youngest age axis.
+        property_conditions (sequence of str): The property conditions axis.
+        product (ProductConfig): The product to price (default: DEFAULT_PRODUCT).
+
+    Returns:
+        PaymentGrid: The payments, with shape (rates, values, ages, conditions).
+
+    Raises:
+        Any exception raised by validate_inputs, for the first invalid axis value.
+    """
+    # Check each axis value against an otherwise valid applicant, so the same
+    # exceptions and limits as the scalar path apply.
+    if product is None:
+        product = DEFAULT_PRODUCT
+    minimum_value = product.minimum_property_value
+    minimum_age = product.minimum_age
+    valid_condition = product.property_conditions[0]
+    valid_marital_status = product.marital_statuses[0]
+    valid_rate = product.maximum_interest_rate
+    for interest_rate in interest_rates:
+        validate_inputs(minimum_value, valid_condition, valid_marital_status, minimum_age, minimum_age, interest_rate, product)
+    for property_value in property_values:
+        validate_inputs(property_value, valid_condition, valid_marital_status, minimum_age, minimum_age, valid_rate, product)
+    for age in ages:
+        validate_inputs(minimum_value, valid_condition, valid_marital_status, age, age, valid_rate, product)
+    for property_condition in property_conditions:
+        validate_inputs(minimum_value, property_condition, valid_marital_status, minimum_age, minimum_age, valid_rate, product)
+
+    condition_adjustment = product.condition_adjustment
+    loan_percentage = product.loan_percentage
+    mortgage_amounts = [
+        property_value * condition_adjustment[property_condition] * loan_percentage
+        for property_value in property_values
+        for property_condition in property_conditions
+    ]
+    condition_count = len(property_conditions)
+    age_months = [product.life_expectancy_months[age] for age in ages]
+
+    values = array("d")
+    for interest_rate in interest_rates:
+        payments_by_months = {
+            months: _bucket_payments(mortgage_amounts, interest_rate, months)
+            for months in set(age_months)
+        }
+        for start in range(0, len(mortgage_amounts), condition_count):
+            for months in age_months:
+                values.extend(payments_by_months[months][start:start + condition_count])
+
+    return PaymentGrid(interest_rates, property_values, ages, property_conditions, values)
+
+def _bucket_payments(mortgage_amounts, interest_rate, months):
+    """Price a list of mortgage amounts for one rate and term, as the scalar path does."""
+    return array("d", [_monthly_payment(mortgage_amount, interest_rate, months) for mortgage_amount in mortgage_amounts])
@@ -0,0 +1,223 @@
+# stress.py
+from array import array
+from collections import namedtuple
+
+from logic.aggregation import RunningStats
+from logic.portfolio_stream import chunked
+from logic.reverse_mortgage import (
+    DEFAULT_PRODUCT,
+    _monthly_payment,
+    validate_inputs_bulk,
+    validation_error_for,
+    InvalidInputError,
+    InvalidInterestRateError,
+    DataTypeError
+)
+
+# A stress scenario: property values are multiplied by property_value_factor
+# (0.8 for a 20% haircut), rate_shift is added to every flat interest rate,
+# and condition_adjustment (a mapping of condition to adjustment, merged over
+# the product's) and loan_percentage replace the product's when given.
+Scenario = namedtuple("Scenario", ["name", "property_value_factor", "rate_shift", "condition_adjustment", "loan_percentage"],
+                      defaults=(1.0, 0.0, None, None))
+
+BASELINE = Scenario("baseline")
+
+# Out-of-band row numbers kept per scenario by default; the rest are only counted.
+MAX_REPORTED_ROWS = 1000
+
+class ScenarioResult:
+    """Payments, out-of-band rows and rejections of one scenario."""
+
+    def __init__(self, scenario, product, max_reported_rows=MAX_REPORTED_ROWS):
+        self.scenario = scenario
+        self.condition_adjustment = dict(product.condition_adjustment)
+        self.condition_adjustment.update(scenario.condition_adjustment or {})
+        self.loan_percentage = product.loan_percentage if scenario.loan_percentage is None else scenario.loan_percentage
+        self.payments = RunningStats()
+        self.total_cents = 0
+        self.out_of_band_count = 0
+        self.out_of_band = array("q")
+        self.max_reported_rows = max_reported_rows
+        self.errors = {}
+
+    def to_dict(self):
+        return {
+            "priced": self.payments.count,
+            "total_monthly_outflow": self.total_cents / 100,
+            "payment": self.payments.to_dict(),
+            "out_of_band": {"count": self.out_of_band_count, "rows": self.out_of_band.tolist()},
+            "errors": dict(sorted(self.errors.items())),
+        }
+
+class StressRunner:
+    """
+    Evaluates several stress scenarios against a portfolio in one pass.
+
+    Each chunk of applicants is validated once with validate_inputs_bulk, and
+    the term of each valid row is looked up once; every scenario is then only
+    the payment arithmetic over those prepared rows, so the cost grows with
+    scenarios x rows of arithmetic and not with scenarios x reading and
+    validation. A row whose shocked property value leaves the product's
+    eligibility band (200,000,000 to 900,000,000) is counted and not priced
+    under that scenario; the input row numbers of the first max_reported_rows
+    of them are kept, so memory stays bounded whatever the portfolio size.
+    Rows invalid before any shock are counted once by exception name.
+    """
+
+    def __init__(self, scenarios, life_table=None, product=None, max_reported_rows=MAX_REPORTED_ROWS):
+        """
+        Args:
+            scenarios (sequence of Scenario): The shocks to evaluate.
+            life_table (LifeTable): Optional mortality table giving the payment
+                terms; by default the terms come from the product.
+            product (ProductConfig): The product whose validation, band and
+                adjustments the scenarios shock (default: DEFAULT_PRODUCT).
+            max_reported_rows (int): Out-of-band row numbers kept per scenario;
+                None keeps them all.
+
+        Raises:
+            InvalidInputError: If two scenarios share a name or a scenario
+                adjusts a condition the product does not accept.
+        """
+        if product is None:
+            product = DEFAULT_PRODUCT
+        names = [scenario.name for scenario in scenarios]
+        if len(set(names)) != len(names) or BASELINE.name in names:
+            raise InvalidInputError(f"Scenario names must be unique and not '{BASELINE.name}'. You entered: {', '.join(map(str, names))}.")
+        for scenario in scenarios:
+            unknown = set(scenario.condition_adjustment or {}) - set(product.property_conditions)
+            if unknown:
+                raise InvalidInputError(f"Scenario '{scenario.name}' adjusts unknown property conditions: {', '.join(sorted(unknown))}.")
+        self.life_table = life_table
+        self.product = product
+        self.baseline = ScenarioResult(BASELINE, product, max_reported_rows)
+        self.results = [ScenarioResult(scenario, product, max_reported_rows) for scenario in scenarios]
+        self.rows = 0
+        self.invalid = {}
+
+    def add_chunk(self, applicants):
+        """
+        Validate one chunk of applicants and evaluate every scenario on it.
+
+        Args:
+            applicants (list of tuple): Applicants in APPLICANT_FIELDS order;
+                rows are numbered from 0 across all chunks added.
+
+        Returns:
+            StressRunner: This runner.
+        """
+        first_row = self.rows
+        self.rows += len(applicants)
+        if not applicants:
+            return self
+
+        codes, _ = validate_inputs_bulk(*zip(*applicants), product=self.product)
+        months_by_age = self.product.life_expectancy_months
+        life_table = self.life_table
+        prepared = []
+        for row, (applicant, code) in enumerate(zip(applicants, codes), first_row):
+            if code:
+                name = validation_error_for(code).__name__
+                self.invalid[name] = self.invalid.get(name, 0) + 1
+                continue
+            property_value, property_condition, marital_status, owner_age, spouse_age, interest_rate = applicant
+            if life_table is None:
+                months = months_by_age[min(owner_age, spouse_age)]
+            else:
+                months = life_table.life_expectancy_months(marital_status, owner_age, spouse_age)
+            prepared.append((row, property_value, property_condition, months, interest_rate))
+
+        self._evaluate(prepared, self.baseline)
+        for result in self.results:
+            self._evaluate(prepared, result)
+        return self
+
+    def _evaluate(self, prepared, result):
+        """Price the prepared rows of a chunk under one scenario."""
+        scenario = result.scenario
+        property_value_factor = scenario.property_value_factor
+        rate_shift = scenario.rate_shift
+        condition_adjustment = result.condition_adjustment
+        loan_percentage = result.loan_percentage
+        minimum_property_value = self.product.minimum_property_value
+        maximum_property_value = self.product.maximum_property_value
+        maximum_interest_rate = self.product.maximum_interest_rate
+        number_types = (int, float)
+        payments = result.payments
+        out_of_band = result.out_of_band
+        max_reported_rows = result.max_reported_rows
+        out_of_band_count = 0
+        errors = result.errors
+        total_cents = 0
+
+        for row, property_value, property_condition, months, interest_rate in prepared:
+            property_value = property_value * property_value_factor
+            if not (minimum_property_value <= property_value <= maximum_property_value):
+                out_of_band_count += 1
+                if max_reported_rows is None or len(out_of_band) < max_reported_rows:
+                    out_of_band.append(row)
+                continue
+            if rate_shift:
+                # Rate curves are not shifted; a shocked rate must stay valid.
+                if interest_rate.__class__ not in number_types:
+                    errors[DataTypeError.__name__] = errors.get(DataTypeError.__name__, 0) + 1
+                    continue
+                interest_rate += rate_shift
+                if not (0 < interest_rate <= maximum_interest_rate):
+                    errors[InvalidInterestRateError.__name__] = errors.get(InvalidInterestRateError.__name__, 0) + 1
+                    continue
+
+            monthly_payment = _monthly_payment(property_value * condition_adjustment[property_condition] * loan_percentage, interest_rate, months)
+            payments.add(monthly_payment)
+            total_cents += round(monthly_payment * 100)
+
+        result.total_cents += total_cents
+        result.out_of_band_count += out_of_band_count
+
+    def report(self):
+        """
+        Return the baseline and scenario results as a JSON-ready dict.
+
+        Returns:
+            dict: "rows" read, "invalid" counts by exception name, "baseline"
+            results and "scenarios" results by name. Each result has "priced",
+            "total_monthly_outflow", "payment" statistics, "out_of_band" with
+            the "count" of rows leaving the eligibility band and the first
+            max_reported_rows of those "rows", and "errors"
+            counts of rows a shock made invalid; each scenario also has its
+            "outflow_change" from the baseline.
+        """
+        baseline = self.baseline.to_dict()
+        scenarios = {}
+        for result in self.results:
+            scenarios[result.scenario.name] = report = result.to_dict()
+            report["outflow_change"] = (result.total_cents - self.baseline.total_cents) / 100
+        return {
+            "rows": self.rows,
+            "invalid": dict(sorted(self.invalid.items())),
+            "baseline": baseline,
+            "scenarios": scenarios,
+        }
+
+def run_stress(applicants, scenarios, chunk_size=10_000, life_table=None, product=None, max_reported_rows=MAX_REPORTED_ROWS):
+    """
+    Evaluate stress scenarios against an applicant stream read once.
+
+    Args:
+        applicants (iterable of tuple): Applicants in APPLICANT_FIELDS order,
+            e.g. from read_applicants or ColumnarFile.iter_applicants.
+        scenarios (sequence of Scenario): The shocks to evaluate.
+        chunk_size (int): Number of applicants validated per chunk.
+        life_table (LifeTable): Optional mortality table giving the payment terms.
+        product (ProductConfig): The product the scenarios shock (default: DEFAULT_PRODUCT).
+        max_reported_rows (int): Out-of-band row numbers reported per
+            scenario; None reports them all.
+
+    Returns:
+        dict: The StressRunner report.
+    """
+    runner = StressRunner(scenarios, life_table, product, max_reported_rows)
+    for chunk in chunked(applicants, chunk_size):
+        runner.add_chunk(chunk)
+    return runner.report()
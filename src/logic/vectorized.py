@@ -0,0 +1,93 @@
+# vectorized.py
+import numpy
+
+from logic.reverse_mortgage import get_annuity_terms
+
+def price_batch(columns, product):
+    """
+    Price equal-length applicant columns with NumPy array operations.
+
+    Used by calculate_reverse_mortgage_payments for large batches when NumPy
+    is installed. Each step is the scalar arithmetic applied to whole columns
+    in the same order: the mortgage amount, the annuity terms of each distinct
+    (rate, term) pair from get_annuity_terms, the payment, the cap at
+    mortgage_amount / months and the rounding to the cent, so every payment
+    matches calculate_reverse_mortgage_payment to the cent. Only batches in
+    which every row is valid and has a flat rate are priced here; for any
+    other batch the row-by-row path runs instead and raises the same
+    exception as the scalar path.
+
+    Args:
+        columns (tuple): The six applicant columns, in APPLICANT_FIELDS order.
+        product (ProductConfig): The product to price.
+
+    Returns:
+        list: The monthly payments, in input order, or None when the batch
+        needs the row-by-row path.
+    """
+    property_values, property_conditions, marital_statuses, owner_ages, spouse_ages, interest_rates = columns
+    # NumPy integers are not int, so validate_inputs rejects integer arrays;
+    # float arrays hold numpy.float64, which is a float.
+    if any(isinstance(column, numpy.ndarray) and column.dtype.kind != "f" for column in (property_values, owner_ages, spouse_ages, interest_rates)):
+        return None
+    try:
+        if not set(product.marital_statuses).issuperset(marital_statuses):
+            return None
+        conditions = numpy.fromiter(map(dict(product.condition_codes).__getitem__, property_conditions), numpy.intp, len(property_conditions))
+        property_values = numpy.asarray(property_values)
+        owner_ages = numpy.asarray(owner_ages)
+        spouse_ages = numpy.asarray(spouse_ages)
+        interest_rates = numpy.asarray(interest_rates)
+    except (KeyError, TypeError, ValueError, OverflowError):
+        return None
+    # Booleans and other non-numeric columns, float ages and rate curves are
+    # left to the row-by-row path, which reports them like the scalar path.
+    if (property_values.dtype.kind not in "if" or interest_rates.dtype.kind not in "if"
+            or owner_ages.dtype.kind != "i" or spouse_ages.dtype.kind != "i"):
+        return None
+
+    youngest_ages = numpy.minimum(owner_ages, spouse_ages)
+    interest_rates = interest_rates.astype(numpy.float64, copy=False)
+    if not (numpy.all((product.minimum_property_value <= property_values) & (property_values <= product.maximum_property_value))
+            and numpy.all((product.minimum_age <= youngest_ages) & (youngest_ages <= product.maximum_age))
+            and numpy.all((0 < interest_rates) & (interest_rates <= product.maximum_interest_rate))):
+        return None
+
+    adjustments = numpy.array(product.condition_factors, dtype=numpy.float64)
+    mortgage_amounts = property_values.astype(numpy.float64) * adjustments[conditions] * product.loan_percentage
+
+    # Annuity terms of every distinct (rate, term) pair, from the annuity cache.
+    terms = sorted(set(product.life_expectancy_months))
+    term_index = numpy.array([terms.index(term) for term in product.life_expectancy_months], dtype=numpy.intp)[youngest_ages]
+    months = numpy.array(terms, dtype=numpy.float64)[term_index]
+    rates = numpy.unique(interest_rates)
+    rate_index = numpy.searchsorted(rates, interest_rates)
+    monthly_interest_rates = numpy.empty((len(rates), len(terms)))
+    annuity_denominators = numpy.empty((len(rates), len(terms)))
+    for row, interest_rate in enumerate(rates.tolist()):
+        for column, term in enumerate(terms):
+            monthly_interest_rates[row, column], annuity_denominators[row, column] = get_annuity_terms(interest_rate, term)
+    if not numpy.all(annuity_denominators):
+        return None
+
+    monthly_payments = mortgage_amounts * monthly_interest_rates[rate_index, term_index] / annuity_denominators[rate_index, term_index]
+    capped = monthly_payments * months > mortgage_amounts
+    monthly_payments[capped] = mortgage_amounts[capped] / months[capped]
+    return (_round_cents(monthly_payments) / 100).tolist()
+
+def _round_cents(amounts):
+    """
+    Return positive amounts in whole cents, rounded as round(amount, 2) does.
+
+    round() rounds the exact binary value of each float, half to even, while
+    amounts * 100 is itself rounded and can cross a half cent. Each amount is
+    mantissa * 2 ** (exponent - 53) with an integer mantissa, so comparing it
+    with the half cent above its lower cent, (2 * cents + 1) / 200, is exact
+    in 64-bit integers.
+    """
+    cents = numpy.floor(amounts * 100).astype(numpy.int64)
+    mantissas, exponents = numpy.frexp(amounts)
+    scaled_amounts = (mantissas * 2.0 ** 53).astype(numpy.int64) * 200
+    scaled_midpoints = (2 * cents + 1) << (53 - exponents).astype(numpy.int64)
+    round_up = (scaled_amounts > scaled_midpoints) | ((scaled_amounts == scaled_midpoints) & (cents % 2 == 1))
+    return cents + round_up
@@ -0,0 +1,385 @@
+# workbook.py
+import math
+import os
+import posixpath
+import re
+import shutil
+import tempfile
+import unicodedata
+import zipfile
+from itertools import chain
+from xml.etree.ElementTree import XMLParser, fromstring, iterparse
+from xml.sax.saxutils import escape
+
+from logic.portfolio_stream import RESULT_FIELDS, normalize_applicant, price_stream
+from logic.reverse_mortgage import APPLICANT_FIELDS, InvalidInputError
+
+MAIN_NAMESPACE = "{http://schemas.openxmlformats.org/spreadsheetml/2006/main}"
+RELATIONSHIP_NAMESPACE = "{http://schemas.openxmlformats.org/officeDocument/2006/relationships}"
+PACKAGE_NAMESPACE = "{http://schemas.openxmlformats.org/package/2006/relationships}"
+WORKSHEET_TYPE = "http://schemas.openxmlformats.org/officeDocument/2006/relationships/worksheet"
+WORKSHEET_CONTENT_TYPE = "application/vnd.openxmlformats-officedocument.spreadsheetml.worksheet+xml"
+
+# Header names accepted for each applicant field, compared after removing
+# accents, case and anything that is not a letter or a digit. The Spanish
+# names are the ones used in calculos.xlsx.
+HEADER_ALIASES = {
+    "property_value": ("propertyvalue", "valorinmueble", "valoinmueble"),
+    "property_condition": ("propertycondition", "estadoinmueble"),
+    "marital_status": ("maritalstatus", "estadocivil"),
+    "owner_age": ("ownerage", "edadpropietario", "edadlpropietario"),
+    "spouse_age": ("spouseage", "edadconyuge"),
+    "interest_rate": ("interestrate", "tasadeinteres", "tasainteres"),
+}
+
+# Spanish categorical values used in calculos.xlsx.
+VALUE_ALIASES = {
+    "excelente": "excellent", "bueno": "good", "regular": "average",
+    "casado": "married", "soltero": "single", "divorciado": "divorced",
+}
+
+def normalize_header(name):
+    """Reduce a header to lower-case letters and digits without accents."""
+    text = unicodedata.normalize("NFKD", str(name or "")).encode("ascii", "ignore").decode("ascii")
+    return re.sub(r"[^a-z0-9]", "", text.lower())
+
+def column_index(reference):
+    """Return the zero-based column of a cell reference such as 'AB12'."""
+    index = 0
+    for character in reference:
+        if not character.isalpha():
+            break
+        index = index * 26 + ord(character.upper()) - 64
+    return index - 1
+
+def column_letters(index):
+    """Return the column letters of a zero-based column index."""
+    letters = ""
+    index += 1
+    while index:
+        index, remainder = divmod(index - 1, 26)
+        letters = chr(65 + remainder) + letters
+    return letters
+
+def _parse_number(text):
+    """Convert a numeric cell value to int when it is written as an integer, float otherwise."""
+    try:
+        return int(text)
+    except ValueError:
+        return float(text)
+
+def _sheet_path(archive, sheet_name):
+    """Return the archive path of a worksheet (the first one if sheet_name is None)."""
+    workbook = fromstring(archive.read("xl/workbook.xml"))
+    relationships = fromstring(archive.read("xl/_rels/workbook.xml.rels"))
+    targets = {relationship.get("Id"): relationship.get("Target") for relationship in relationships.iter(PACKAGE_NAMESPACE + "Relationship")}
+    for sheet in workbook.iter(MAIN_NAMESPACE + "sheet"):
+        if sheet_name is None or sheet.get("name") == sheet_name:
+            target = targets[sheet.get(RELATIONSHIP_NAMESPACE + "id")]
+            return target.lstrip("/") if target.startswith("/") else posixpath.normpath(posixpath.join("xl", target))
+    raise InvalidInputError(f"Worksheet not found: '{sheet_name}'.")
+
+def _shared_strings(archive):
+    """Load the shared string table of a workbook."""
+    if "xl/sharedStrings.xml" not in archive.namelist():
+        return []
+    strings = []
+    with archive.open("xl/sharedStrings.xml") as source:
+        for _, element in iterparse(source):
+            if element.tag == MAIN_NAMESPACE + "si":
+                strings.append("".join(text.text or "" for text in element.iter(MAIN_NAMESPACE + "t")))
+                element.clear()
+    return strings
+
+class _RowCollector:
+    """
+    XMLParser target that turns worksheet XML into lists of cell values.
+
+    The parser calls start, data and end for every element; no element tree
+    is built, so only the rows of the current block are kept in memory.
+    """
+
+    def __init__(self, strings):
+        self.strings = strings
+        self.rows = []
+        self.values = None
+        self.cell_type = None
+        self.text = None
+
+    def start(self, tag, attributes):
+        if tag == MAIN_NAMESPACE + "c":
+            reference = attributes.get("r")
+            if reference:
+                self.values.extend([None] * (column_index(reference) - len(self.values)))
+            self.cell_type = attributes.get("t", "n")
+            self.text = None
+        elif tag == MAIN_NAMESPACE + "v" or tag == MAIN_NAMESPACE + "t":
+            if self.text is None:
+                self.text = []
+        elif tag == MAIN_NAMESPACE + "row":
+            self.values = []
+
+    def data(self, text):
+        if self.text is not None:
+            self.text.append(text)
+
+    def end(self, tag):
+        if tag == MAIN_NAMESPACE + "c":
+            text = None if self.text is None else "".join(self.text)
+            cell_type = self.cell_type
+            if text is None:
+                value = None
+            elif cell_type == "n":
+                value = _parse_number(text)
+            elif cell_type == "s":
+                value = self.strings[int(text)]
+            elif cell_type == "b":
+                value = text == "1"
+            else:
+                value = text
+            self.values.append(value)
+            self.text = None
+        elif tag == MAIN_NAMESPACE + "row":
+            if any(value is not None for value in self.values):
+                self.rows.append(self.values)
+            self.values = None
+
+    def close(self):
+        return None
+
+def iter_rows(path, sheet_name=None, block_size=1 << 16):
+    """
+    Lazily yield the rows of a worksheet as lists of cell values.
+
+    The sheet XML is decompressed and parsed in fixed-size blocks and the
+    rows of each block are yielded before the next one is read, so memory
+    does not grow with the number of rows. Missing cells are None; numbers
+    are int or float; text, inline and shared strings are str; booleans are
+    bool.
+
+    Args:
+        path (str): The .xlsx file.
+        sheet_name (str): The worksheet to read (default: the first one).
+        block_size (int): Number of bytes parsed at a time.
+
+    Yields:
+        list: The cell values of the next non-empty row.
+    """
+    with zipfile.ZipFile(path) as archive:
+        collector = _RowCollector(_shared_strings(archive))
+        parser = XMLParser(target=collector)
+        with archive.open(_sheet_path(archive, sheet_name)) as source:
+            while True:
+                block = source.read(block_size)
+                if not block:
+                    break
+                parser.feed(block)
+                yield from collector.rows
+                collector.rows = []
+        parser.close()
+        yield from collector.rows
+
+def _workbook_applicant(values):
+    """Build an applicant from cell values in APPLICANT_FIELDS order."""
+    record = {}
+    for field, value in zip(APPLICANT_FIELDS, values):
+        if isinstance(value, str):
+            value = value.strip().strip('"')
+            value = VALUE_ALIASES.get(value.lower(), value)
+        record[field] = value
+    return normalize_applicant(record)
+
+def read_workbook_applicants(path, sheet_name=None):
+    """
+    Lazily read applicants from a worksheet.
+
+    Two layouts are recognised. In the row layout the first row holding all
+    six field names is the header and every following row is an applicant;
+    it is streamed row by row. In the column layout used by calculos.xlsx the
+    field names are in the first column and every following column is an
+    applicant; only the six field rows are kept, so memory is bounded by the
+    width of the sheet.
+
+    Headers may use the calculate_reverse_mortgage_payment argument names or
+    the Spanish names of calculos.xlsx, and Spanish condition and marital
+    status values are translated.
+
+    Args:
+        path (str): The .xlsx file.
+        sheet_name (str): The worksheet to read (default: the first one).
+
+    Yields:
+        tuple: One applicant in APPLICANT_FIELDS order.
+
+    Raises:
+        InvalidInputError: If neither layout is found.
+    """
+    aliases = {alias: field for field, names in HEADER_ALIASES.items() for alias in names}
+    positions = None
+    field_rows = {}
+    for values in iter_rows(path, sheet_name):
+        if positions is not None:
+            yield _workbook_applicant([values[index] if index < len(values) else None for index in positions])
+            continue
+
+        found = {aliases[normalize_header(value)]: index for index, value in enumerate(values) if normalize_header(value) in aliases}
+        if len(found) == len(APPLICANT_FIELDS):
+            positions = [found[field] for field in APPLICANT_FIELDS]
+        elif normalize_header(values[0]) in aliases:
+            field_rows.setdefault(aliases[normalize_header(values[0])], values[1:])
+
+    if positions is None:
+        if len(field_rows) != len(APPLICANT_FIELDS):
+            raise InvalidInputError(f"No header with the fields {', '.join(APPLICANT_FIELDS)} was found in the first row or column.")
+        width = max(len(values) for values in field_rows.values())
+        for index in range(width):
+            values = [field_rows[field][index] if index < len(field_rows[field]) else None for field in APPLICANT_FIELDS]
+            if any(value is not None for value in values):
+                yield _workbook_applicant(values)
+
+def _cell(reference, value):
+    """Return the XML of one cell; NaN and infinities are written as text, which .xlsx numbers cannot hold."""
+    if value is None:
+        return ""
+    if isinstance(value, bool):
+        return f'<c r="{reference}" t="b"><v>{int(value)}</v></c>'
+    if isinstance(value, int) or isinstance(value, float) and math.isfinite(value):
+        return f'<c r="{reference}"><v>{value!r}</v></c>'
+    return f'<c r="{reference}" t="inlineStr"><is><t xml:space="preserve">{escape(str(value))}</t></is></c>'
+
+def _write_sheet(archive, member, rows):
+    """Stream rows into a worksheet member of an archive open for writing."""
+    letters = []
+    count = 0
+    with archive.open(member, "w", force_zip64=True) as target:
+        target.write(b'<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+                     b'<worksheet xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main"><sheetData>')
+        for number, row in enumerate(rows, start=1):
+            while len(letters) < len(row):
+                letters.append(column_letters(len(letters)))
+            cells = "".join(_cell(f"{letters[index]}{number}", value) for index, value in enumerate(row))
+            target.write(f'<row r="{number}">{cells}</row>'.encode("utf-8"))
+            count += 1
+        target.write(b"</sheetData></worksheet>")
+    return count
+
+def write_workbook(path, rows, sheet_name="Results"):
+    """
+    Write rows to a new single-sheet workbook, streaming them to disk.
+
+    Args:
+        path (str): The .xlsx file to create.
+        rows (iterable of sequence): The rows to write; the first is usually a header.
+        sheet_name (str): The name of the worksheet.
+
+    Returns:
+        int: The number of rows written.
+    """
+    with zipfile.ZipFile(path, "w", zipfile.ZIP_DEFLATED) as archive:
+        archive.writestr("[Content_Types].xml",
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Types xmlns="http://schemas.openxmlformats.org/package/2006/content-types">'
+            '<Default Extension="rels" ContentType="application/vnd.openxmlformats-package.relationships+xml"/>'
+            '<Default Extension="xml" ContentType="application/xml"/>'
+            '<Override PartName="/xl/workbook.xml" ContentType="application/vnd.openxmlformats-officedocument.spreadsheetml.sheet.main+xml"/>'
+            f'<Override PartName="/xl/worksheets/sheet1.xml" ContentType="{WORKSHEET_CONTENT_TYPE}"/></Types>')
+        archive.writestr("_rels/.rels",
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            '<Relationship Id="rId1" Type="http://schemas.openxmlformats.org/officeDocument/2006/relationships/officeDocument" Target="xl/workbook.xml"/>'
+            '</Relationships>')
+        archive.writestr("xl/workbook.xml",
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<workbook xmlns="http://schemas.openxmlformats.org/spreadsheetml/2006/main" '
+            'xmlns:r="http://schemas.openxmlformats.org/officeDocument/2006/relationships">'
+            f'<sheets><sheet name="{escape(sheet_name)}" sheetId="1" r:id="rId1"/></sheets></workbook>')
+        archive.writestr("xl/_rels/workbook.xml.rels",
+            '<?xml version="1.0" encoding="UTF-8" standalone="yes"?>\n'
+            '<Relationships xmlns="http://schemas.openxmlformats.org/package/2006/relationships">'
+            f'<Relationship Id="rId1" Type="{WORKSHEET_TYPE}" Target="worksheets/sheet1.xml"/></Relationships>')
+        return _write_sheet(archive, "xl/worksheets/sheet1.xml", rows)
+
+def add_sheet(input_path, output_path, rows, sheet_name="Results"):
+    """
+    Copy a workbook and append a worksheet streamed from rows.
+
+    Every part of the input workbook is copied unchanged except the three
+    that list the sheets, so formulas, styles and the existing sheets are
+    kept. The rows may be produced lazily from the input workbook itself.
+    The copy is written to a temporary file next to output_path and moved
+    over it once complete, so output_path may be input_path and a failed
+    run leaves any existing output untouched.
+
+    Args:
+        input_path (str): The existing .xlsx file.
+        output_path (str): The .xlsx file to create or replace.
+        rows (iterable of sequence): The rows of the new worksheet.
+        sheet_name (str): The name of the new worksheet.
+
+    Returns:
+        int: The number of rows written.
+
+    Raises:
+        InvalidInputError: If the workbook already has a sheet with that name.
+    """
+    with zipfile.ZipFile(input_path) as source:
+        workbook = source.read("xl/workbook.xml").decode("utf-8")
+        if re.search(rf'<sheet\b[^>]*\bname="{re.escape(escape(sheet_name))}"', workbook):
+            raise InvalidInputError(f"The workbook already has a sheet named '{sheet_name}'.")
+        handle, temporary_path = tempfile.mkstemp(suffix=".xlsx", dir=os.path.dirname(os.path.abspath(output_path)))
+        os.close(handle)
+        try:
+            count = _copy_with_sheet(source, workbook, temporary_path, rows, sheet_name)
+        except BaseException:
+            os.remove(temporary_path)
+            raise
+    os.replace(temporary_path, output_path)
+    return count
+
+def _copy_with_sheet(source, workbook, output_path, rows, sheet_name):
+    """Write a copy of an open workbook archive with one more worksheet."""
+    with zipfile.ZipFile(output_path, "w", zipfile.ZIP_DEFLATED) as archive:
+        names = set(source.namelist())
+        number = 1
+        while f"xl/worksheets/sheet{number}.xml" in names:
+            number += 1
+        member = f"xl/worksheets/sheet{number}.xml"
+        relationship_id = f"rIdResults{number}"
+        sheet_id = max([int(value) for value in re.findall(r'<sheet\b[^>]*\bsheetId="(\d+)"', workbook)] or [0]) + 1
+
+        workbook = workbook.replace("</sheets>", f'<sheet name="{escape(sheet_name)}" sheetId="{sheet_id}" r:id="{relationship_id}"/></sheets>')
+        relationships = source.read("xl/_rels/workbook.xml.rels").decode("utf-8").replace(
+            "</Relationships>", f'<Relationship Id="{relationship_id}" Type="{WORKSHEET_TYPE}" Target="worksheets/sheet{number}.xml"/></Relationships>')
+        content_types = source.read("[Content_Types].xml").decode("utf-8").replace(
+            "</Types>", f'<Override PartName="/{member}" ContentType="{WORKSHEET_CONTENT_TYPE}"/></Types>')
+        replaced = {"xl/workbook.xml": workbook, "xl/_rels/workbook.xml.rels": relationships, "[Content_Types].xml": content_types}
+
+        for info in source.infolist():
+            if info.filename in replaced:
+                archive.writestr(info.filename, replaced[info.filename])
+            else:
+                with source.open(info) as member_source, archive.open(info.filename, "w", force_zip64=True) as member_target:
+                    shutil.copyfileobj(member_source, member_target)
+        return _write_sheet(archive, member, rows)
+
+def price_workbook(input_path, output_path, sheet_name=None, results_sheet="Results", chunk_size=10_000):
+    """
+    Price the applicants of a workbook and write them back as a results sheet.
+
+    Rows are read, priced in chunks and written as they go, so memory stays
+    flat for any number of rows.
+
+    Args:
+        input_path (str): The .xlsx file with one applicant per row.
+        output_path (str): The .xlsx file to create, with the added results
+            sheet; it may be input_path to add the sheet in place.
+        sheet_name (str): The worksheet to read (default: the first one).
+        results_sheet (str): The name of the results worksheet.
+        chunk_size (int): The number of applicants priced per chunk.
+
+    Returns:
+        int: The number of applicants written.
+    """
+    results = price_stream(read_workbook_applicants(input_path, sheet_name), chunk_size)
+    rows = chain([RESULT_FIELDS], (applicant + (monthly_payment, error) for applicant, monthly_payment, error in results))
+    return add_sheet(input_path, output_path, rows, results_sheet) - 1
@@ -0,0 +1,59 @@
+# worker.py
+import json
+import sys
+
+from logic.reverse_mortgage import APPLICANT_FIELDS, calculate_reverse_mortgage_payment
+
+def handle_request(line):
+    """
+    Price one newline-delimited JSON request.
+
+    The request is a JSON object with the six calculate_reverse_mortgage_payment
+    fields and an optional "id" that is echoed back. Errors are reported with
+    the name of the exception class raised by the pricing logic.
+
+    Args:
+        line (str): One request line.
+
+    Returns:
+        dict: {"id", "monthly_payment"} on success, or {"id", "error", "message"}.
+    """
+    try:
+        request = json.loads(line)
+    except ValueError as error:
+        return {"id": None, "error": "InvalidInputError", "message": f"Invalid JSON request: {error}."}
+    if not isinstance(request, dict):
+        return {"id": None, "error": "InvalidInputError", "message": "Each request must be a JSON object."}
+
+    response = {"id": request.get("id")}
+    try:
+        response["monthly_payment"] = calculate_reverse_mortgage_payment(*(request.get(field) for field in APPLICANT_FIELDS))
+    except Exception as error:
+        response["error"] = type(error).__name__
+        response["message"] = str(error)
+    return response
+
+def run_worker(source=None, target=None):
+    """
+    Serve requests from a stream until end of input, one JSON response per line.
+
+    Each response is flushed right away so a caller can keep one long-lived
+    process and exchange requests and responses over pipes.
+
+    Args:
+        source (file object): Request stream (default: stdin).
+        target (file object): Response stream (default: stdout).
+
+    Returns:
+        int: The number of requests served.
+    """
+    source = source or sys.stdin
+    target = target or sys.stdout
+    count = 0
+    for line in source:
+        if not line.strip():
+            continue
+        target.write(json.dumps(handle_request(line)) + "\n")
+        target.flush()
+        count += 1
+    return count
@@ -1,5 +1,7 @@
+import pickle
 import unittest
 import sys
+from copy import deepcopy
 sys.path.append("src")
 from logic import  reverse_mortgage
 
@@ -331,6 +333,196 @@ class HipotecaInversaTest(unittest.TestCase):
             reverse_mortgage.calculate_reverse_mortgage_payment(
                 property_value, property_condition, marital_status, owner_age, spouse_age, interest_rate)
 
+class HipotecaInversaLoteTest(unittest.TestCase):
+
+    # Batch Cases: the batch entry point must agree with the scalar function
+
+    def test_Batch_1(self):
+        # Same rows as the normal cases, priced in one call
+        rows = [
+            (500000000, "excellent", "married", 70, 68, 0.5),
+            (400000000, "good", "married", 72, 70, 0.5),
+            (250000000, "average", "married", 65, 67, 0.07),
+            (300000000, "excellent", "married", 75, 65, 0.06),
+            (280000000, "good", "married", 80, 70, 0.08),
+            (200000000.5, "excellent", "single", 60, 62, 0.0001),
+        ]
+        expected_payments = [reverse_mortgage.calculate_reverse_mortgage_payment(*row) for row in rows]
+
+        result = reverse_mortgage.calculate_reverse_mortgage_payments(*zip(*rows))
+        self.assertEqual(result, expected_payments)
+
+    def test_Batch_2(self):
+        # Empty batch
+        result = reverse_mortgage.calculate_reverse_mortgage_payments([], [], [], [], [], [])
+        self.assertEqual(result, [])
+
+    def test_Batch_Error_1(self):
+        # An invalid row raises the same exception as the scalar function
+        with self.assertRaises(reverse_mortgage.InvalidMaritalStatusError):
+            reverse_mortgage.calculate_reverse_mortgage_payments(
+                [500000000, 500000000], ["excellent", "excellent"], ["married", None], [70, 70], [68, 68], [0.07, 0.07])
+
+    def test_Batch_Error_2(self):
+        # Columns of different lengths
+        with self.assertRaises(reverse_mortgage.InvalidInputError):
+            reverse_mortgage.calculate_reverse_mortgage_payments(
+                [500000000], ["excellent"], ["married"], [70], [68], [])
+
+class ValidacionMasivaTest(unittest.TestCase):
+
+    # Bulk Validation Cases: per-row codes instead of exceptions
+
+    def test_Bulk_1(self):
+        # A valid row has code 0 and counts nothing
+        codes, summary = reverse_mortgage.validate_inputs_bulk(
+            [500000000], ["excellent"], ["married"], [70], [68], [0.07])
+        self.assertEqual(list(codes), [0])
+        self.assertEqual(sum(summary.values()), 0)
+
+    def test_Bulk_2(self):
+        # A row keeps every problem, not only the first one
+        codes, summary = reverse_mortgage.validate_inputs_bulk(
+            [950000000], ["unknown"], [None], [70], [68], [2])
+        expected_code = (reverse_mortgage.PROPERTY_VALUE_RANGE_FLAG | reverse_mortgage.INTEREST_RATE_RANGE_FLAG
+                         | reverse_mortgage.PROPERTY_CONDITION_FLAG | reverse_mortgage.MARITAL_STATUS_FLAG)
+        self.assertEqual(codes[0], expected_code)
+        self.assertEqual(summary["property_value_range"], 1)
+        self.assertEqual(summary["marital_status"], 1)
+        self.assertEqual(summary["age_type"], 0)
+
+    def test_Bulk_3(self):
+        # The first flag of each row names the exception the scalar path raises
+        rows = [
+            ("", "excellent", "married", 70, 68, 0.07),
+            (0, "excellent", "married", 70, 68, 0.07),
+            (100000000, "excellent", "married", 70, 68, 0.04),
+            (400000000, "excellent", "married", 70, 68, 0),
+            (300000000, "unknown", "married", 70, 68, 0.07),
+            (500000000, "excellent", "", 70, 68, 0.07),
+            ("300000000O", "good", "married", 70, 68, 0.07),
+            (950000000, "excellent", "married", 70, 68, 0.07),
+            (500000000, "excellent", "married", 90, 88, 0.07),
+            (500000000, "excellent", "married", 70, 17, 0.07),
+            (500000000, "excellent", "married", 70.0, 68, "0.07"),
+        ]
+        codes, summary = reverse_mortgage.validate_inputs_bulk(*zip(*rows))
+
+        for row, code in zip(rows, codes):
+            with self.assertRaises(reverse_mortgage.validation_error_for(code)):
+                reverse_mortgage.validate_inputs(*row)
+        self.assertEqual(summary["property_value_type"], 2)
+
+class CacheAnualidadTest(unittest.TestCase):
+
+    # Annuity Cache Cases: cached terms must not change the result
+
+    def test_Cache_1(self):
+        # A warmed rate is served from the cache
+        reverse_mortgage.warm_annuity_cache([0.0625])
+        hits_before = reverse_mortgage.annuity_cache_info().hits
+
+        result = reverse_mortgage.calculate_reverse_mortgage_payment(
+            500000000, "excellent", "married", 70, 68, 0.0625)
+        self.assertEqual(result, 1041666.67)
+        self.assertEqual(reverse_mortgage.annuity_cache_info().hits, hits_before + 1)
+
+    def test_Cache_2(self):
+        # Cached terms are the same numbers as the direct formula
+        monthly_interest_rate = (1 + 0.07) ** (1/12) - 1
+        expected_terms = (monthly_interest_rate, 1 - (1 + monthly_interest_rate) ** -240)
+        self.assertEqual(reverse_mortgage.get_annuity_terms(0.07, 240), expected_terms)
+
+class ProductoTest(unittest.TestCase):
+
+    # Product Cases: precompiled configurations priced side by side
+
+    def test_Product_1(self):
+        # The default product keeps the original limits and messages
+        product = reverse_mortgage.DEFAULT_PRODUCT
+        self.assertEqual(product.life_expectancy_months[70], 180)
+        self.assertEqual((product.condition_codes["good"], product.condition_factors), (1, (1, 0.9, 0.8)))
+        self.assertEqual(list(product.encode_marital_statuses(["single", "widowed", 1])), [1, -1, -1])
+        with self.assertRaisesRegex(reverse_mortgage.ExcessivePropertyValueError, "between 200,000,000 and 900,000,000"):
+            reverse_mortgage.validate_inputs(100000000, "excellent", "married", 70, 68, 0.5)
+        with self.assertRaisesRegex(reverse_mortgage.InvalidPropertyValueError, "^Owner and spouse age must not exceed 85.$"):
+            reverse_mortgage.validate_inputs(500000000, "excellent", "married", 90, 88, 0.5)
+        with self.assertRaisesRegex(reverse_mortgage.InvalidInterestRateError, "between 0 and 1. You entered: 2"):
+            reverse_mortgage.validate_inputs(500000000, "excellent", "married", 70, 68, 2)
+
+    def test_Product_2(self):
+        # Another product changes the limits and the loan percentage
+        premium = reverse_mortgage.ProductConfig(name="premium", loan_percentage=0.6, maximum_property_value=1_500_000_000, maximum_age=90)
+        self.assertEqual(reverse_mortgage.calculate_reverse_mortgage_payment(500000000, "excellent", "married", 70, 68, 0.5, product=premium), 1250000.0)
+        self.assertEqual(reverse_mortgage.calculate_reverse_mortgage_payments([1200000000], ["good"], ["single"], [88], [90], [0.05], product=premium), [3600000.0])
+        with self.assertRaisesRegex(reverse_mortgage.ExcessivePropertyValueError, "between 200,000,000 and 1,500,000,000"):
+            reverse_mortgage.calculate_reverse_mortgage_payment(2000000000, "excellent", "married", 70, 68, 0.5, product=premium)
+
+    def test_Product_3(self):
+        # One pass prices every product and leaves rejected rows empty
+        premium = reverse_mortgage.ProductConfig(name="premium", loan_percentage=0.6, maximum_property_value=1_500_000_000)
+        results = reverse_mortgage.calculate_product_payments(
+            [500000000, 1200000000, 500000000], ["excellent", "good", "excellent"], ["married", "single", "widowed"],
+            [70, 60, 70], [68, 62, 68], [0.5, 0.05, 0.5], [reverse_mortgage.DEFAULT_PRODUCT, premium])
+        self.assertEqual(results, {"standard": [1041666.67, None, None], "premium": [1250000.0, 2160000.0, None]})
+
+    def test_Product_4(self):
+        # Products survive pickling and deep copies, e.g. to reach worker processes
+        premium = reverse_mortgage.ProductConfig(name="premium", loan_percentage=0.6, maximum_age=90)
+        for copy in (pickle.loads(pickle.dumps(premium)), deepcopy(premium)):
+            self.assertEqual(copy.name, "premium")
+            self.assertEqual(copy.life_expectancy_months, premium.life_expectancy_months)
+            self.assertEqual(reverse_mortgage.calculate_reverse_mortgage_payment(500000000, "excellent", "married", 70, 68, 0.5, product=copy), 1250000.0)
+            self.assertEqual(list(copy.encode_conditions(["good", "new", None])), [1, -1, -1])
+            with self.assertRaises(TypeError):
+                copy.condition_adjustment["good"] = 1
+            with self.assertRaises(TypeError):
+                copy.condition_codes["new"] = 3
+
+    def test_Product_5(self):
+        # Every pricing path follows the product it is given
+        from logic.inverse import solve_property_values
+        from logic.money import calculate_reverse_mortgage_payment_cents, calculate_reverse_mortgage_payments_cents
+        from logic.monte_carlo import simulate_loan
+        from logic.portfolio import Portfolio
+        from logic.schedule import build_portfolio_schedule, generate_schedule
+        from logic.sensitivity import calculate_payment_grid
+
+        premium = reverse_mortgage.ProductConfig(name="premium", condition_adjustment=(("excellent", 1), ("good", 0.85)), loan_percentage=0.6)
+        applicant = (300000000, "good", "single", 60, 62, 0.05)
+        payment = reverse_mortgage.calculate_reverse_mortgage_payment(*applicant, product=premium)
+        self.assertEqual(payment, 510000.0)
+
+        self.assertEqual(calculate_reverse_mortgage_payment_cents(*applicant, product=premium), 51000000)
+        self.assertEqual(list(calculate_reverse_mortgage_payments_cents(*([value] for value in applicant), product=premium)), [51000000])
+        self.assertEqual(next(generate_schedule(*applicant, product=premium)).payment, payment)
+        self.assertEqual(build_portfolio_schedule(*([value] for value in applicant), product=premium).row(0, 1).payment, payment)
+        self.assertEqual(calculate_payment_grid([0.05], [300000000], [60], ["good"], product=premium).values[0], payment)
+        self.assertEqual(Portfolio([applicant], product=premium).payments, [payment])
+        self.assertAlmostEqual(solve_property_values([payment], ["good"], ["single"], [60], [62], [0.05], product=premium)[0][0], 300000000)
+        payouts, _ = simulate_loan(applicant, [0.0], seed=1, product=premium)
+        self.assertEqual(payouts[0] % payment, 0)
+
+        # A condition the product does not accept is rejected on the cents path too
+        with self.assertRaises(reverse_mortgage.InvalidPropertyConditionError):
+            calculate_reverse_mortgage_payment_cents(300000000, "average", "single", 60, 62, 0.05, product=premium)
+
+    def test_Product_Error_1(self):
+        with self.assertRaises(AttributeError):
+            reverse_mortgage.DEFAULT_PRODUCT.loan_percentage = 0.9
+        with self.assertRaises(TypeError):
+            reverse_mortgage.DEFAULT_PRODUCT.condition_adjustment["good"] = 1
+        with self.assertRaises(TypeError):
+            reverse_mortgage.DEFAULT_PRODUCT.condition_factors[0] = 2
+
+    def test_Product_Error_2(self):
+        # Results are keyed by name, so two products cannot share one
+        with self.assertRaises(reverse_mortgage.InvalidInputError):
+            reverse_mortgage.calculate_product_payments(
+                [500000000], ["excellent"], ["married"], [70], [68], [0.5],
+                [reverse_mortgage.DEFAULT_PRODUCT, reverse_mortgage.ProductConfig(loan_percentage=0.6)])
+
+
 if __name__ == '__main__':
     unittest.main()
 
@@ -0,0 +1,74 @@
+import pickle
+import random
+import statistics
+import unittest
+import sys
+sys.path.append("src")
+from logic.aggregation import PortfolioAggregator, QuantileSketch, RunningStats, aggregate_stream
+from logic.portfolio_stream import price_stream
+
+APPLICANTS = [
+    (500000000, "excellent", "married", 70, 68, 0.5),
+    (300000000, "good", "single", 60, 62, 0.05),
+    (800000000, "average", "divorced", 66, 75, 0.05),
+    (500000000, "excellent", "widowed", 70, 68, 0.05),
+]
+
+class AgregacionTest(unittest.TestCase):
+
+    # Aggregation Cases: single-pass, mergeable portfolio statistics
+    def test_Aggregation_1(self):
+        report = PortfolioAggregator().add_rows(price_stream(APPLICANTS)).report()
+        self.assertEqual(report["priced"], 3)
+        self.assertEqual(report["rejected"], 1)
+        self.assertEqual(report["total_monthly_outflow"], 2825000.0)
+        self.assertAlmostEqual(report["payment"]["mean"], 2825000.0 / 3)
+        self.assertAlmostEqual(report["payment"]["variance"] / statistics.variance([1041666.67, 450000.0, 1333333.33]), 1, places=12)
+        self.assertEqual(report["by_property_condition"]["good"]["count"], 1)
+        self.assertEqual(report["by_life_expectancy_years"]["20"]["count"], 2)
+        self.assertEqual(report["errors"], {"InvalidMaritalStatusError": 1})
+
+    def test_Aggregation_2(self):
+        # Merged partial aggregates equal one pass over everything
+        generator = random.Random(3)
+        values = [generator.lognormvariate(13, 0.5) for _ in range(5000)]
+        whole = RunningStats()
+        parts = [RunningStats() for _ in range(3)]
+        for index, value in enumerate(values):
+            whole.add(value)
+            parts[index % 3].add(value)
+        merged = RunningStats()
+        for part in parts:
+            merged.merge(part)
+        self.assertEqual(merged.count, whole.count)
+        self.assertAlmostEqual(merged.mean, statistics.fmean(values), places=6)
+        self.assertAlmostEqual(merged.variance / statistics.variance(values), 1, places=9)
+
+    def test_Aggregation_3(self):
+        generator = random.Random(5)
+        values = sorted(generator.uniform(1e5, 5e6) for _ in range(20000))
+        first, second = QuantileSketch(), QuantileSketch()
+        for index, value in enumerate(values):
+            (first if index % 2 else second).add(value)
+        first.merge(second)
+        for fraction in (0.05, 0.5, 0.99):
+            exact = values[round(fraction * (len(values) - 1))]
+            self.assertLessEqual(abs(first.quantile(fraction) - exact) / exact, 0.01)
+        self.assertLess(len(first.buckets), 200)
+
+    def test_Aggregation_4(self):
+        # Aggregators from workers survive pickling and merge
+        first, rows = aggregate_stream(price_stream(APPLICANTS[:2]))
+        self.assertEqual(len(list(rows)), 2)
+        second = PortfolioAggregator().add_rows(price_stream(APPLICANTS[2:]))
+        merged = pickle.loads(pickle.dumps(first)).merge(second).report()
+        single = PortfolioAggregator().add_rows(price_stream(APPLICANTS)).report()
+        for key in ("priced", "rejected", "total_monthly_outflow", "errors"):
+            self.assertEqual(merged[key], single[key])
+        self.assertEqual(merged["payment"]["quantiles"], single["payment"]["quantiles"])
+        self.assertAlmostEqual(merged["payment"]["mean"], single["payment"]["mean"], places=6)
+        self.assertEqual(merged["by_marital_status"].keys(), single["by_marital_status"].keys())
+
+
+if __name__ == '__main__':
+    unittest.main()
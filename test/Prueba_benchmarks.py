@@ -0,0 +1,37 @@
+import json
+import unittest
+import sys
+sys.path.append("src")
+sys.path.append("benchmarks")
+import bench_pricing
+
+class RendimientoTest(unittest.TestCase):
+
+    # Benchmark Cases: the suite runs at a tiny scale and flags regressions against a baseline
+    def test_Benchmarks_1(self):
+        results = bench_pricing.run_benchmarks(scale=0.001, repeat=1)
+        self.assertIn("scalar_happy_path", results)
+        self.assertIn("scalar_failing_validation", results)
+        self.assertIn("cold_start_worker", results)
+        for result in results.values():
+            self.assertGreater(result["seconds_per_op"], 0)
+        # Every case has a baseline to be compared against
+        with open("benchmarks/baseline.json", encoding="utf-8") as source:
+            self.assertEqual(set(results), set(json.load(source)["results"]))
+
+    def test_Benchmarks_2(self):
+        results = {"scalar_happy_path": {"seconds_per_op": 3.0, "operations": 1}, "new_case": {"seconds_per_op": 1.0, "operations": 1}}
+        baseline = {"scalar_happy_path": {"seconds_per_op": 2.0, "operations": 1}}
+        comparison = bench_pricing.compare(results, baseline, 1.25)
+        self.assertEqual(comparison, {"scalar_happy_path": {"ratio": 1.5, "regression": True}, "new_case": {"ratio": None, "regression": True}})
+        comparison = bench_pricing.compare({"scalar_happy_path": {"seconds_per_op": 2.2, "operations": 1}}, baseline, 1.25)
+        self.assertEqual(comparison, {"scalar_happy_path": {"ratio": 1.1, "regression": False}})
+
+    def test_Benchmarks_3(self):
+        columns = bench_pricing.synthetic_portfolio(50, seed=3, invalid_share=0.5)
+        self.assertEqual(len(columns), 6)
+        self.assertEqual(columns, bench_pricing.synthetic_portfolio(50, seed=3, invalid_share=0.5))
+
+
+if __name__ == '__main__':
+    unittest.main()
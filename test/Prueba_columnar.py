@@ -0,0 +1,67 @@
+import os
+import tempfile
+import unittest
+import sys
+sys.path.append("src")
+from logic import columnar
+from logic.portfolio_stream import RESULT_FIELDS
+from logic.reverse_mortgage import InvalidInputError
+
+APPLICANTS = [
+    (500000000, "excellent", "married", 70, 68, 0.5),
+    (300000000, "good", "single", 60, 62, 0.05),
+    ("300000000p", "average", None, 70.5, 68, "x"),
+]
+
+class ColumnarTest(unittest.TestCase):
+
+    # Columnar Cases: dictionary-encoded, memory-mapped portfolio files
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "cartera.rmc")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_Columnar_1(self):
+        self.assertEqual(columnar.write_columnar(self.path, APPLICANTS), 3)
+        with columnar.ColumnarFile(self.path) as portfolio:
+            self.assertEqual(len(portfolio), 3)
+            self.assertEqual(portfolio.dictionaries["property_condition"], ["excellent", "good", "average"])
+            self.assertEqual(portfolio.column("marital_status").format, "B")
+            self.assertEqual(portfolio.column("marital_status").tolist(), [0, 1, 2])
+            self.assertEqual(portfolio.column("owner_age").tolist(), [70, 60, columnar.MISSING_INTEGER])
+            applicants = list(portfolio.iter_applicants(chunk_size=2))
+        self.assertEqual(applicants[:2], APPLICANTS[:2])
+        self.assertEqual(applicants[2], (None, "average", None, None, 68, None))
+
+    def test_Columnar_2(self):
+        # Pricing keeps the error classes of the scalar path
+        columnar.write_columnar(self.path, APPLICANTS)
+        output_path = os.path.join(self.directory.name, "resultados.rmc")
+        self.assertEqual(columnar.price_columnar(self.path, output_path, chunk_size=2), 3)
+        with columnar.ColumnarFile(output_path) as results:
+            self.assertEqual(results.fields, RESULT_FIELDS)
+            self.assertEqual(results.values("monthly_payment"), [1041666.67, 450000.0, None])
+            self.assertEqual(results.values("error"), [None, None, "DataTypeError"])
+
+    def test_Columnar_3(self):
+        # More than 256 distinct values widen the codes to uint16
+        rows = [(200000000, f"condition {index}", "married", 70, 68, 0.5) for index in range(300)]
+        columnar.write_columnar(self.path, rows)
+        with columnar.ColumnarFile(self.path) as portfolio:
+            self.assertEqual(portfolio.column("property_condition").format, "H")
+            self.assertEqual(portfolio.values("property_condition", 298), ["condition 298", "condition 299"])
+
+    def test_Columnar_Error_1(self):
+        with open(self.path, "wb") as target:
+            target.write(b"property_value\n")
+        with self.assertRaises(InvalidInputError):
+            columnar.ColumnarFile(self.path)
+        with self.assertRaises(InvalidInputError):
+            columnar.ColumnarWriter(self.path, ["rate"])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,62 @@
+import unittest
+import sys
+sys.path.append("src")
+from logic import instrumentation
+from logic.reverse_mortgage import (
+    calculate_reverse_mortgage_payment,
+    calculate_reverse_mortgage_payments,
+    InvalidMaritalStatusError,
+    DataTypeError
+)
+
+class InstrumentacionTest(unittest.TestCase):
+
+    def setUp(self):
+        self.recorder = instrumentation.enable()
+
+    def tearDown(self):
+        instrumentation.disable()
+
+    # Instrumentation Cases: stage timers, call counters and failures by exception class
+    def test_Instrumentation_1(self):
+        self.assertEqual(calculate_reverse_mortgage_payment(500000000, "excellent", "married", 70, 68, 0.5), 1041666.67)
+        self.assertEqual(calculate_reverse_mortgage_payment(300000000, "good", "single", 60, 62, 0.05), 450000.0)
+        snapshot = self.recorder.snapshot()
+        self.assertEqual(snapshot["quotes"], 2)
+        for stage in ("validation", "condition_adjustment", "life_expectancy", "annuity"):
+            self.assertEqual(snapshot["stages"][stage]["calls"], 2)
+            self.assertGreaterEqual(snapshot["stages"][stage]["seconds"], 0)
+        self.assertEqual(snapshot["validation_failures"], {})
+
+    def test_Instrumentation_2(self):
+        with self.assertRaises(InvalidMaritalStatusError):
+            calculate_reverse_mortgage_payment(500000000, "excellent", "widowed", 70, 68, 0.5)
+        with self.assertRaises(DataTypeError):
+            calculate_reverse_mortgage_payments([500000000], ["excellent"], ["married"], ["70"], [68], [0.5])
+        snapshot = self.recorder.snapshot()
+        self.assertEqual(snapshot["validation_failures"], {"InvalidMaritalStatusError": 1, "DataTypeError": 1})
+        self.assertEqual(snapshot["stages"]["annuity"]["calls"], 0)
+        self.assertEqual(snapshot["stages"]["batch"]["calls"], 1)
+
+    def test_Instrumentation_3(self):
+        payments = calculate_reverse_mortgage_payments([500000000] * 3, ["excellent"] * 3, ["married"] * 3, [70] * 3, [68] * 3, [0.5] * 3)
+        self.assertEqual(payments, [1041666.67] * 3)
+        self.assertEqual(self.recorder.snapshot()["batch_rows"], 3)
+        with self.assertRaises(InvalidMaritalStatusError):
+            calculate_reverse_mortgage_payment(500000000, "excellent", "", 70, 68, 0.5)
+        text = self.recorder.prometheus_text()
+        self.assertIn("# TYPE reverse_mortgage_stage_seconds_total counter", text)
+        self.assertIn('reverse_mortgage_stage_calls_total{stage="batch"} 1', text)
+        self.assertIn("reverse_mortgage_batch_rows_total 3", text)
+        self.assertIn('reverse_mortgage_validation_failures_total{exception="InvalidMaritalStatusError"} 1', text)
+
+    def test_Instrumentation_4(self):
+        # Disabled instrumentation records nothing
+        instrumentation.disable()
+        self.assertIsNone(instrumentation.current())
+        calculate_reverse_mortgage_payment(500000000, "excellent", "married", 70, 68, 0.5)
+        self.assertEqual(self.recorder.snapshot()["quotes"], 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,85 @@
+import unittest
+import sys
+sys.path.append("src")
+from logic.inverse import solve_property_values, solve_interest_rates
+from logic.life_table import LifeTable
+from logic.reverse_mortgage import calculate_reverse_mortgage_payment, get_life_expectancy, ProductConfig, InvalidInputError
+
+class InversoTest(unittest.TestCase):
+
+    # Inverse Cases: property value and interest rate for a target payment
+    def test_Inverse_1(self):
+        results = solve_property_values(
+            [1041666.67, 450000.0, 800000.01],
+            ["excellent", "good", "average"],
+            ["married", "single", "divorced"],
+            [70, 60, 66],
+            [68, 62, 75],
+            [0.5, 0.05, 0.07],
+        )
+        self.assertIsNone(results[0][1])
+        self.assertAlmostEqual(results[0][0], 500000000, delta=5)
+        self.assertAlmostEqual(results[1][0], 300000000)
+        self.assertEqual(calculate_reverse_mortgage_payment(results[0][0], "excellent", "married", 70, 68, 0.5), 1041666.67)
+        self.assertEqual(calculate_reverse_mortgage_payment(results[2][0], "average", "divorced", 66, 75, 0.07), 800000.01)
+
+    def test_Inverse_2(self):
+        # Values outside 200M-900M and invalid inputs are reported per row
+        results = solve_property_values(
+            [100.0, 5000000.0, 1000000.0, 1000000.0, "x"],
+            ["excellent", "excellent", "new", "excellent", "excellent"],
+            ["married"] * 5,
+            [70] * 5,
+            [68] * 5,
+            [0.5, 0.5, 0.5, 1.5, 0.5],
+        )
+        self.assertEqual([error for _, error in results], [
+            "UnattainablePaymentError", "UnattainablePaymentError", "InvalidPropertyConditionError",
+            "InvalidInterestRateError", "DataTypeError"])
+
+    def test_Inverse_3(self):
+        results = solve_interest_rates(
+            [1041666.67, 1041666.0, 1041666.67],
+            [500000000, 500000000, 50000000],
+            ["excellent"] * 3,
+            ["married"] * 3,
+            [70] * 3,
+            [68] * 3,
+        )
+        self.assertEqual(results, [((0.0, 1.0), None), (None, "UnattainablePaymentError"), (None, "ExcessivePropertyValueError")])
+        for interest_rate in (1e-6, 0.05, 0.5, 1.0):
+            self.assertEqual(calculate_reverse_mortgage_payment(500000000, "excellent", "married", 70, 68, interest_rate), 1041666.67)
+
+    def test_Inverse_4(self):
+        life_table = LifeTable.from_expectancies(get_life_expectancy)
+        results = solve_property_values([450000.0], ["good"], ["single"], [60], [62], [0.05], life_table=life_table)
+        self.assertAlmostEqual(results[0][0], 300000000)
+
+    def test_Inverse_5(self):
+        # The rate range follows the product's limit
+        capped = ProductConfig(name="capped", maximum_interest_rate=0.2)
+        results = solve_interest_rates([1041666.67], [500000000], ["excellent"], ["married"], [70], [68], product=capped)
+        self.assertEqual(results, [((0.0, 0.2), None)])
+
+    def test_Inverse_6(self):
+        # Payments priced at the property value limits invert to the limits
+        results = solve_property_values(
+            [333333.33, 1875000.004, 333333.32, 1875000.01],
+            ["average", "excellent", "average", "excellent"],
+            ["married"] * 4,
+            [66, 70, 66, 70],
+            [66, 68, 66, 68],
+            [0.05] * 4,
+        )
+        self.assertEqual(results[:2], [(200000000, None), (900000000, None)])
+        self.assertEqual(calculate_reverse_mortgage_payment(200000000, "average", "married", 66, 66, 0.05), 333333.33)
+        self.assertEqual(calculate_reverse_mortgage_payment(900000000, "excellent", "married", 70, 68, 0.05), 1875000.0)
+        self.assertEqual([error for _, error in results[2:]], ["UnattainablePaymentError"] * 2)
+
+    def test_Inverse_Error_1(self):
+        with self.assertRaises(InvalidInputError):
+            solve_property_values([1.0, 2.0], ["good"], ["single"], [60], [62], [0.05])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,69 @@
+import os
+import tempfile
+import unittest
+import sys
+sys.path.append("src")
+from logic import life_table, reverse_mortgage
+
+class TablaVidaTest(unittest.TestCase):
+
+    # Life Table Cases: single and joint expectancies from mortality rates
+
+    def test_LifeTable_1(self):
+        # The step table reproduces the default pricing of couples
+        table = life_table.LifeTable.from_expectancies(reverse_mortgage.get_life_expectancy)
+
+        result = reverse_mortgage.calculate_reverse_mortgage_payment(
+            500000000, "excellent", "married", 70, 68, 0.5, life_table=table)
+        self.assertEqual(result, 1041666.67)
+        self.assertEqual(table.life_expectancy_months("married", 80, 64), 300)
+
+    def test_LifeTable_2(self):
+        # Constant mortality: single expectancy is (1 - q) / q + 1/2 far from the closing age
+        table = life_table.LifeTable.from_mortality_rates({0: 0.1})
+
+        self.assertAlmostEqual(table.single_life_expectancy(20), 9.5, places=3)
+        # Last survivor of two independent lives outlives either one
+        self.assertGreater(table.joint_life_expectancy(20, 20), table.single_life_expectancy(20))
+        self.assertEqual(table.life_expectancy_months("single", 20, 90), 114)
+
+    def test_LifeTable_3(self):
+        # CSV loading and batch lookups match the scalar ones
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "table.csv")
+            with open(path, "w") as target:
+                target.write("age,qx\n0,0.01\n60,0.02\n70,0.05\n80,0.12\n")
+            table = life_table.LifeTable.from_csv(path)
+
+        marital_statuses = ["married", "single", "divorced"]
+        owner_ages = [70, 65, 80]
+        spouse_ages = [68, 90, 40]
+        months = table.life_expectancy_months_bulk(marital_statuses, owner_ages, spouse_ages)
+        self.assertEqual(list(months), [table.life_expectancy_months(*applicant) for applicant in zip(marital_statuses, owner_ages, spouse_ages)])
+
+        payments = reverse_mortgage.calculate_reverse_mortgage_payments(
+            [500000000] * 3, ["excellent"] * 3, marital_statuses, owner_ages, spouse_ages, [0.07] * 3, life_table=table)
+        self.assertEqual(payments, [round(250000000 / term, 2) for term in months])
+
+    def test_LifeTable_4(self):
+        # Ages below the first one given take its rate instead of dying within the year
+        table = life_table.LifeTable.from_mortality_rates({60: 0.02, 80: 0.1})
+        constant = life_table.LifeTable.from_mortality_rates({0: 0.02, 80: 0.1})
+
+        self.assertEqual(table.single_life_expectancy(50), constant.single_life_expectancy(50))
+        self.assertGreater(table.life_expectancy_months("single", 50, 50), 240)
+        result = reverse_mortgage.calculate_reverse_mortgage_payment(500000000, "excellent", "single", 50, 50, 0.05, life_table=table)
+        self.assertLess(result, 1000000)
+
+    def test_LifeTable_Error_1(self):
+        with self.assertRaises(reverse_mortgage.InvalidInputError):
+            life_table.LifeTable.from_mortality_rates({})
+
+    def test_LifeTable_Error_2(self):
+        # Rates outside [0, 1] are not probabilities
+        for rate in (-0.01, 1.5, float("nan"), "0.1"):
+            with self.assertRaises(reverse_mortgage.InvalidInputError):
+                life_table.LifeTable.from_mortality_rates({0: 0.01, 60: rate})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,58 @@
+import random
+import unittest
+import sys
+sys.path.append("src")
+from logic.money import (
+    calculate_reverse_mortgage_payment_cents,
+    calculate_reverse_mortgage_payments_cents,
+    divide_rounded,
+    format_cents,
+    to_cents,
+    ROUND_HALF_EVEN,
+    ROUND_HALF_UP
+)
+from logic.reverse_mortgage import calculate_reverse_mortgage_payment, InvalidInputError, InvalidMaritalStatusError
+
+class CentavosTest(unittest.TestCase):
+
+    # Money Cases: integer cents with half-even and half-up rounding
+    def test_Money_1(self):
+        self.assertEqual(calculate_reverse_mortgage_payment_cents(500000000, "excellent", "married", 70, 68, 0.5), 104166667)
+        self.assertEqual(calculate_reverse_mortgage_payment_cents(300000000, "good", "single", 60, 62, 0.05), 45000000)
+        self.assertEqual(format_cents(104166667), "1041666.67")
+        self.assertEqual(format_cents(-5), "-0.05")
+
+    def test_Money_2(self):
+        # Ties follow the rule; everything else rounds to the nearest cent
+        self.assertEqual(divide_rounded(5, 2, ROUND_HALF_EVEN), 2)
+        self.assertEqual(divide_rounded(7, 2, ROUND_HALF_EVEN), 4)
+        self.assertEqual(divide_rounded(5, 2, ROUND_HALF_UP), 3)
+        self.assertEqual(divide_rounded(11, 4), 3)
+        self.assertEqual(to_cents(0.125), 12)
+        self.assertEqual(to_cents(0.125, ROUND_HALF_UP), 13)
+        # 200,000,007 x 0.8 x 0.5 / 240 is 333,333.345 exactly, a tie whose
+        # lower cent is even, so the two rules part ways
+        self.assertEqual(calculate_reverse_mortgage_payment_cents(200000007, "average", "single", 66, 66, 0.05), 33333334)
+        self.assertEqual(calculate_reverse_mortgage_payment_cents(200000007, "average", "single", 66, 66, 0.05, rounding=ROUND_HALF_UP), 33333335)
+
+    def test_Money_3(self):
+        # The batch matches the scalar form and, off ties, the float path
+        generator = random.Random(7)
+        rows = [(generator.randint(200_000_000, 900_000_000), generator.choice(["excellent", "good", "average"]),
+                 generator.choice(["married", "single"]), generator.randint(18, 85), generator.randint(18, 85),
+                 generator.choice([0.05, 0.1, 0.5])) for _ in range(2000)]
+        payments = calculate_reverse_mortgage_payments_cents(*zip(*rows))
+        self.assertEqual(list(payments), [calculate_reverse_mortgage_payment_cents(*row) for row in rows])
+        differences = [to_cents(calculate_reverse_mortgage_payment(*row)) - cents for row, cents in zip(rows, payments)]
+        self.assertLessEqual(max(map(abs, differences)), 1)
+        self.assertGreater(differences.count(0), 1900)
+
+    def test_Money_Error_1(self):
+        with self.assertRaises(InvalidMaritalStatusError):
+            calculate_reverse_mortgage_payments_cents([500000000, 500000000], ["excellent"] * 2, ["married", ""], [70, 70], [68, 68], [0.5, 0.5])
+        with self.assertRaises(InvalidInputError):
+            calculate_reverse_mortgage_payment_cents(500000000, "excellent", "married", 70, 68, 0.5, rounding="down")
+
+
+if __name__ == '__main__':
+    unittest.main()
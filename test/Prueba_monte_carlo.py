@@ -0,0 +1,42 @@
+import unittest
+import sys
+sys.path.append("src")
+from logic import monte_carlo, reverse_mortgage
+
+class MonteCarloTest(unittest.TestCase):
+
+    # Simulation Cases: seeded rate and longevity risk
+
+    def test_MonteCarlo_1(self):
+        # Without volatility every path is the deterministic loan
+        applicant = (500000000, "excellent", "married", 70, 68, 0.07)
+        monthly_payment = reverse_mortgage.calculate_reverse_mortgage_payment(*applicant)
+
+        result = monte_carlo.simulate_portfolio(
+            [applicant], path_count=50, interest_rate_volatility=0, longevity_volatility=0, percentiles=(5, 95))
+
+        self.assertAlmostEqual(result["loans"][0]["payout"][5], monthly_payment * 240)
+        self.assertAlmostEqual(result["loans"][0]["payout"][95], monthly_payment * 240)
+        self.assertEqual(result["portfolio"], result["loans"][0])
+
+    def test_MonteCarlo_2(self):
+        # Same seed, same result; chunking does not change the draws
+        applicants = [(500000000, "excellent", "married", 70, 68, 0.07), (300000000, "average", "single", 60, 61, 0.1)]
+
+        first = monte_carlo.simulate_portfolio(applicants, path_count=500, seed=7)
+        second = monte_carlo.simulate_portfolio(applicants, path_count=500, seed=7, chunk_size=64)
+        self.assertEqual(first, second)
+        self.assertLessEqual(first["portfolio"]["payout"][5], first["portfolio"]["payout"][95])
+        self.assertGreater(first["loans"][1]["shortfall"][99], 0)
+
+    def test_MonteCarlo_3(self):
+        # Linear interpolation between ranks
+        self.assertEqual(monte_carlo.percentile([1.0, 2.0, 3.0, 4.0], 50), 2.5)
+
+    def test_MonteCarlo_Error_1(self):
+        # Invalid loans are rejected by validation
+        with self.assertRaises(reverse_mortgage.InvalidInterestRateError):
+            monte_carlo.simulate_portfolio([(500000000, "excellent", "married", 70, 68, 0)], path_count=10)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,48 @@
+import unittest
+import sys
+sys.path.append("src")
+from logic import parallel_pricing, portfolio_stream
+
+class PrecioParaleloTest(unittest.TestCase):
+
+    # Parallel Cases: the process pool must give the same rows in the same order
+
+    def test_Parallel_1(self):
+        applicants = [
+            (200000000 + index * 1000000, ("excellent", "good", "average", "unknown")[index % 4], "married",
+             60 + index % 30, 62 + index % 25, (0.05, 0.07, 0)[index % 3])
+            for index in range(50)
+        ]
+        expected_results = list(portfolio_stream.price_stream(applicants))
+
+        results = list(parallel_pricing.price_in_parallel(applicants, workers=2, chunk_size=7))
+        self.assertEqual(results, expected_results)
+
+    def test_Parallel_2(self):
+        # A row that breaks the chunk is reported on its own
+        class Broken:
+            def __eq__(self, other):
+                raise RuntimeError("cannot compare")
+
+        applicants = [(500000000, "excellent", "married", 70, 68, 0.5), (500000000, Broken(), "married", 70, 68, 0.5)]
+
+        results = parallel_pricing.price_chunk_safely(applicants)
+        self.assertEqual(results, [(1041666.67, None), (None, "RuntimeError")])
+
+    def test_Parallel_3(self):
+        # Malformed rows are reported the same way by the chunk, its fallback and the pool
+        class Broken:
+            def __eq__(self, other):
+                raise RuntimeError("cannot compare")
+
+        applicants = [(500000000, "excellent", "married", 70, 68, 0.5), portfolio_stream.MalformedRecord(), (500000000, "excellent", "widowed", 70, 68, 0.5)]
+        expected_results = [(monthly_payment, error) for _, monthly_payment, error in portfolio_stream.price_stream(applicants)]
+        self.assertEqual(expected_results, [(1041666.67, None), (None, "InvalidInputError"), (None, "InvalidMaritalStatusError")])
+
+        self.assertEqual(parallel_pricing.price_chunk_safely(applicants), expected_results)
+        self.assertEqual(parallel_pricing.price_chunk_safely(applicants + [(500000000, Broken(), "married", 70, 68, 0.5)])[:3], expected_results)
+        results = [(monthly_payment, error) for _, monthly_payment, error in parallel_pricing.price_in_parallel(applicants, workers=2, chunk_size=2)]
+        self.assertEqual(results, expected_results)
+
+if __name__ == '__main__':
+    unittest.main()
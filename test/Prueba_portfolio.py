@@ -0,0 +1,86 @@
+import unittest
+import sys
+sys.path.append("src")
+from logic.portfolio import Portfolio, PaymentChange
+from logic.reverse_mortgage import calculate_reverse_mortgage_payment, ProductConfig, InvalidInterestRateError, InvalidInputError
+
+APPLICANTS = [
+    (500000000, "excellent", "married", 70, 68, 0.5),
+    (300000000, "good", "single", 60, 62, 0.05),
+    (800000000, "average", "divorced", 66, 75, 0.05),
+    (500000000, "excellent", "widowed", 70, 68, 0.05),
+]
+
+class CarteraTest(unittest.TestCase):
+
+    # Portfolio Cases: incremental repricing by rate, term bucket and condition
+    def test_Portfolio_1(self):
+        portfolio = Portfolio(APPLICANTS)
+        self.assertEqual(portfolio.payments, [1041666.67, 450000.0, 1333333.33, None])
+        self.assertEqual(portfolio.errors, [None, None, None, "InvalidMaritalStatusError"])
+        self.assertEqual(portfolio.rows_for(0.05), [1, 2])
+        self.assertEqual(portfolio.rows_for(0.05, months=300, property_condition="good"), [1])
+
+    def test_Portfolio_2(self):
+        portfolio = Portfolio(APPLICANTS)
+        changes = portfolio.reprice_rate(0.05, 0.07)
+        self.assertEqual([change.row for change in changes], [1, 2])
+        self.assertEqual(portfolio.rows_for(0.05), [])
+        self.assertEqual(portfolio.rows_for(0.07), [1, 2])
+        for change in changes:
+            self.assertEqual(change.new_payment, calculate_reverse_mortgage_payment(*portfolio.applicants[change.row]))
+        self.assertEqual(portfolio.applicants[3][5], 0.05)
+
+    def test_Portfolio_3(self):
+        portfolio = Portfolio(APPLICANTS)
+        changes = portfolio.update_rows([3], marital_status="married")
+        self.assertEqual(changes, [PaymentChange(3, None, 1041666.67, None)])
+        changes = portfolio.update_rows([0], owner_age=90, spouse_age=90)
+        self.assertEqual(changes, [PaymentChange(0, 1041666.67, None, "InvalidPropertyValueError")])
+        self.assertEqual(portfolio.rows_for(0.5), [])
+        self.assertAlmostEqual(portfolio.total_payment(), 2825000.0)
+
+    def test_Portfolio_Error_1(self):
+        portfolio = Portfolio(APPLICANTS)
+        with self.assertRaises(InvalidInterestRateError):
+            portfolio.reprice_rate(0.05, 1.5)
+        with self.assertRaises(InvalidInputError):
+            portfolio.update_rows([0], rate=0.1)
+        self.assertEqual(portfolio.rows_for(0.05), [1, 2])
+
+    def test_Portfolio_4(self):
+        # A rate change on a small product only touches its own rows
+        applicants = [(200000000 + index, "good", "single", 60 + index % 20, 60, 0.05 if index % 100 else 0.09) for index in range(20000)]
+        portfolio = Portfolio(applicants)
+        changes = portfolio.reprice_rate(0.09, 0.1)
+        self.assertEqual(len(changes), 200)
+        self.assertEqual({portfolio.applicants[change.row][5] for change in changes}, {0.1})
+
+    def test_Portfolio_5(self):
+        # A new adjustment for one condition only reprices that condition's rows
+        portfolio = Portfolio(APPLICANTS)
+        product = ProductConfig("strict", (("excellent", 1), ("good", 0.9), ("average", 0.7)))
+        changes = portfolio.reprice_product(product)
+        self.assertEqual([change.row for change in changes], [2])
+        self.assertEqual(changes[0].new_payment, calculate_reverse_mortgage_payment(*APPLICANTS[2], product=product))
+        self.assertEqual(portfolio.rows_for(0.05), [1, 2])
+
+        # A new loan percentage reprices every valid row
+        product = ProductConfig("low", (("excellent", 1), ("good", 0.9), ("average", 0.7)), loan_percentage=0.4)
+        changes = portfolio.reprice_product(product)
+        self.assertEqual([change.row for change in changes], [0, 1, 2])
+        for change in changes:
+            self.assertEqual(change.new_payment, calculate_reverse_mortgage_payment(*APPLICANTS[change.row], product=product))
+
+    def test_Portfolio_6(self):
+        # A product accepting other applicants reprices every row
+        portfolio = Portfolio(APPLICANTS)
+        product = ProductConfig("widowed", marital_statuses=("married", "single", "divorced", "widowed"))
+        changes = portfolio.reprice_product(product)
+        self.assertEqual(len(changes), 4)
+        self.assertEqual(changes[3], PaymentChange(3, None, 1041666.67, None))
+        self.assertEqual(portfolio.rows_for(0.05), [1, 2, 3])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import io
+import json
+import unittest
+import sys
+sys.path.append("src")
+from logic import portfolio_stream, reverse_mortgage
+
+class FlujoPortafolioTest(unittest.TestCase):
+
+    # Streaming Cases: portfolios read from CSV/JSONL and priced in chunks
+
+    def test_Stream_1(self):
+        # CSV input is parsed like the interactive prompts and priced in order
+        source = io.StringIO(
+            "property_value,property_condition,marital_status,owner_age,spouse_age,interest_rate\n"
+            "500000000,Excellent,married,70,68,0.5\n"
+            "300000000O,good,married,70,68,0.07\n"
+            "250000000,average,married,65,67,0.07\n")
+
+        results = list(portfolio_stream.price_stream(portfolio_stream.read_applicants(source, "csv"), chunk_size=2))
+
+        self.assertEqual([payment for _, payment, _ in results], [1041666.67, None, 416666.67])
+        self.assertEqual([error for _, _, error in results], [None, "DataTypeError", None])
+
+    def test_Stream_2(self):
+        # JSONL round trip keeps typed values and reports errors per row
+        source = io.StringIO(
+            '{"property_value": 400000000, "property_condition": "good", "marital_status": "married", "owner_age": 72, "spouse_age": 70, "interest_rate": 0.5}\n'
+            '\n'
+            '{"property_value": 400000000, "property_condition": "good", "marital_status": "widowed", "owner_age": 72, "spouse_age": 70, "interest_rate": 0.5}\n')
+        target = io.StringIO()
+
+        count = portfolio_stream.write_results(
+            portfolio_stream.price_stream(portfolio_stream.read_applicants(source, "jsonl")), target, "jsonl")
+
+        self.assertEqual(count, 2)
+        lines = target.getvalue().splitlines()
+        self.assertIn('"monthly_payment": 1000000.0', lines[0])
+        self.assertIn('"error": "InvalidMaritalStatusError"', lines[1])
+
+    def test_Stream_3(self):
+        # Chunks never exceed the requested size
+        self.assertEqual([len(chunk) for chunk in portfolio_stream.chunked(range(7), 3)], [3, 3, 1])
+
+    def test_Stream_4(self):
+        # A malformed JSONL line is an InvalidInputError row and the stream goes on
+        source = io.StringIO(
+            '{"property_value": 400000000, "property_condition": "good", "marital_status": "married", "owner_age": 72, "spouse_age": 70, "interest_rate": 0.5}\n'
+            '{"property_value": 400000000,\n'
+            '[1, 2]\n'
+            '{"property_value": 400000000, "property_condition": "good", "marital_status": "married", "owner_age": 72, "spouse_age": 70, "interest_rate": 0.5}\n')
+
+        results = list(portfolio_stream.price_stream(portfolio_stream.read_applicants(source, "jsonl")))
+
+        self.assertEqual([payment for _, payment, _ in results], [1000000.0, None, None, 1000000.0])
+        self.assertEqual([error for _, _, error in results], [None, "InvalidInputError", "InvalidInputError", None])
+
+    def test_Stream_5(self):
+        # NaN read from CSV is written to JSONL as null, keeping the output strict JSON
+        source = io.StringIO(
+            "property_value,property_condition,marital_status,owner_age,spouse_age,interest_rate\n"
+            "400000000,good,married,72,70,nan\n")
+        target = io.StringIO()
+
+        portfolio_stream.write_results(portfolio_stream.price_stream(portfolio_stream.read_applicants(source, "csv")), target, "jsonl")
+
+        record = json.loads(target.getvalue(), parse_constant=lambda constant: self.fail(constant))
+        self.assertIsNone(record["interest_rate"])
+        self.assertEqual(record["error"], "InvalidInterestRateError")
+
+    def test_Stream_6(self):
+        # A valid rate too small to accrue is priced at its limit instead of stopping the stream
+        source = io.StringIO(
+            "property_value,property_condition,marital_status,owner_age,spouse_age,interest_rate\n"
+            "500000000,excellent,married,70,68,1e-17\n"
+            "300000000,good,single,60,62,0.05\n")
+
+        results = list(portfolio_stream.price_stream(portfolio_stream.read_applicants(source, "csv")))
+
+        self.assertEqual([payment for _, payment, _ in results], [1041666.67, 450000.0])
+        self.assertEqual(reverse_mortgage.calculate_reverse_mortgage_payment(500000000, "excellent", "married", 70, 68, 1e-17), 1041666.67)
+
+    def test_Stream_Error_1(self):
+        # Unsupported format
+        with self.assertRaises(reverse_mortgage.InvalidInputError):
+            list(portfolio_stream.read_applicants(io.StringIO(""), "xml"))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import os
+import pstats
+import tempfile
+import tracemalloc
+import unittest
+import sys
+sys.path.append("src")
+from logic.profiling import PricingProfiler
+from logic.reverse_mortgage import (
+    calculate_reverse_mortgage_payment,
+    calculate_reverse_mortgage_payments,
+    InvalidMaritalStatusError
+)
+
+class PerfilTest(unittest.TestCase):
+
+    # Profiling Cases: CPU profile, allocations and report of a run
+    def test_Profiling_1(self):
+        with tempfile.TemporaryDirectory() as directory:
+            with PricingProfiler(directory, top=5) as profiler:
+                for _ in range(3):
+                    calculate_reverse_mortgage_payment(500000000, "excellent", "married", 70, 68, 0.5)
+                with self.assertRaises(InvalidMaritalStatusError):
+                    calculate_reverse_mortgage_payment(500000000, "excellent", "widowed", 70, 68, 0.5)
+                calculate_reverse_mortgage_payments([300000000] * 100, ["good"] * 100, ["single"] * 100, [60] * 100, [62] * 100, [0.05] * 100)
+
+            pricing = profiler.pricing_stats()
+            self.assertEqual(pricing["calculate_reverse_mortgage_payment"]["calls"], 4)
+            self.assertEqual(pricing["validate_inputs"]["calls"], 4)
+            self.assertEqual(pricing["calculate_reverse_mortgage_payments"]["calls"], 1)
+            self.assertNotIn("validate_inputs_bulk", pricing)
+
+            for name in ("pricing.prof", "allocations.tracemalloc", "profile_report.txt"):
+                self.assertTrue(os.path.exists(os.path.join(directory, name)))
+            stats = pstats.Stats(os.path.join(directory, "pricing.prof"))
+            self.assertTrue(any(function == "validate_inputs" for _, _, function in stats.stats))
+            self.assertIsInstance(tracemalloc.Snapshot.load(os.path.join(directory, "allocations.tracemalloc")), tracemalloc.Snapshot)
+            with open(os.path.join(directory, "profile_report.txt"), encoding="utf-8") as report:
+                text = report.read()
+            self.assertIn("Top 5 functions by cumulative time", text)
+            self.assertIn("validate_inputs_bulk: not called", text)
+            self.assertIn("Allocation sites in reverse_mortgage.py", text)
+
+    def test_Profiling_2(self):
+        # Tracing is stopped after the run unless it was already on
+        with tempfile.TemporaryDirectory() as directory:
+            with PricingProfiler(directory):
+                calculate_reverse_mortgage_payment(500000000, "excellent", "married", 70, 68, 0.5)
+            self.assertFalse(tracemalloc.is_tracing())
+            tracemalloc.start()
+            try:
+                with PricingProfiler(directory) as profiler:
+                    calculate_reverse_mortgage_payment(500000000, "excellent", "married", 70, 68, 0.5)
+                self.assertTrue(tracemalloc.is_tracing())
+                self.assertGreater(profiler.peak_bytes, 0)
+            finally:
+                tracemalloc.stop()
+
+if __name__ == '__main__':
+    unittest.main()
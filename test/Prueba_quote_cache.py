@@ -0,0 +1,91 @@
+import os
+import tempfile
+import unittest
+import sys
+sys.path.append("src")
+from logic import quote_cache, reverse_mortgage
+
+class CacheCotizacionesTest(unittest.TestCase):
+
+    # Quote Cache Cases: persisted quotes across separate cache instances
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, "quotes.db")
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_Cache_1(self):
+        # A second instance (a new run) finds the quote of the first one
+        with quote_cache.QuoteCache(self.path) as cache:
+            self.assertEqual(cache.quote(500000000, "excellent", "married", 70, 68, 0.5), 1041666.67)
+            self.assertEqual(cache.misses, 1)
+
+        with quote_cache.QuoteCache(self.path) as cache:
+            self.assertEqual(cache.quote(500000000.0, "excellent", "married", 70, 68, 0.5), 1041666.67)
+            self.assertEqual(cache.hits, 1)
+
+    def test_Cache_2(self):
+        # Entries of another pricing version are never returned, and are only removed on request
+        with quote_cache.QuoteCache(self.path, version="old") as cache:
+            cache.quote(500000000, "excellent", "married", 70, 68, 0.5)
+
+        with quote_cache.QuoteCache(self.path) as cache:
+            self.assertEqual(len(cache), 0)
+            self.assertIsNone(cache.get(500000000, "excellent", "married", 70, 68, 0.5))
+
+        with quote_cache.QuoteCache(self.path, version="old") as cache:
+            self.assertEqual(cache.get(500000000, "excellent", "married", 70, 68, 0.5), 1041666.67)
+
+        with quote_cache.QuoteCache(self.path) as cache:
+            self.assertEqual(cache.purge_other_versions(), 1)
+        with quote_cache.QuoteCache(self.path, version="old") as cache:
+            self.assertEqual(len(cache), 0)
+
+    def test_Cache_3(self):
+        # The least recently used entries are evicted over the size cap
+        with quote_cache.QuoteCache(self.path, max_entries=3) as cache:
+            for property_value in range(300000000, 305000000, 1000000):
+                cache.quote(property_value, "excellent", "married", 70, 68, 0.5)
+            self.assertEqual(len(cache), 3)
+            self.assertIsNone(cache.get(300000000, "excellent", "married", 70, 68, 0.5))
+
+    def test_Cache_4(self):
+        # A hit keeps an entry, however often it is read
+        with quote_cache.QuoteCache(self.path, max_entries=3) as cache:
+            for property_value in range(300000000, 303000000, 1000000):
+                cache.quote(property_value, "excellent", "married", 70, 68, 0.5)
+            for _ in range(5):
+                cache.quote(300000000, "excellent", "married", 70, 68, 0.5)
+            cache.quote(303000000, "excellent", "married", 70, 68, 0.5)
+
+            self.assertEqual(len(cache), 3)
+            self.assertIsNotNone(cache.get(300000000, "excellent", "married", 70, 68, 0.5))
+            self.assertIsNone(cache.get(301000000, "excellent", "married", 70, 68, 0.5))
+            self.assertIsNotNone(cache.get(302000000, "excellent", "married", 70, 68, 0.5))
+
+    def test_Cache_5(self):
+        # Stale versions share the size cap and are evicted first
+        with quote_cache.QuoteCache(self.path, max_entries=2, version="old") as cache:
+            cache.quote(300000000, "excellent", "married", 70, 68, 0.5)
+
+        with quote_cache.QuoteCache(self.path, max_entries=2) as cache:
+            cache.quote(301000000, "excellent", "married", 70, 68, 0.5)
+            cache.quote(302000000, "excellent", "married", 70, 68, 0.5)
+            self.assertEqual(len(cache), 2)
+
+        with quote_cache.QuoteCache(self.path, version="old") as cache:
+            self.assertEqual(len(cache), 0)
+
+    def test_Cache_Error_1(self):
+        # Invalid inputs raise as usual and are never cached
+        with quote_cache.QuoteCache(self.path) as cache:
+            with self.assertRaises(reverse_mortgage.DataTypeError):
+                cache.quote("500000000", "excellent", "married", 70, 68, 0.5)
+            with self.assertRaises(reverse_mortgage.ExcessivePropertyValueError):
+                cache.quote(950000000, "excellent", "married", 70, 68, 0.5)
+            self.assertEqual(len(cache), 0)
+
+if __name__ == '__main__':
+    unittest.main()
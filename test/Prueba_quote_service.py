@@ -0,0 +1,69 @@
+import asyncio
+import json
+import unittest
+import sys
+sys.path.append("src")
+from console import quote_service
+
+class ServicioCotizacionTest(unittest.TestCase):
+
+    # Service Cases: micro-batched quotes over HTTP
+
+    def test_Service_1(self):
+        # Concurrent quotes share batches and keep their own results
+        async def scenario():
+            batcher = quote_service.QuoteBatcher(max_batch_size=8, max_delay=0.01)
+            batcher.start()
+            applicants = [(500000000, "excellent", "married", 70, 68, 0.5)] * 20 + [(500000000, "excellent", "", 70, 68, 0.5)]
+            results = await asyncio.gather(*[batcher.quote(applicant) for applicant in applicants])
+            await batcher.stop()
+            return results, batcher.metrics()
+
+        results, metrics = asyncio.run(scenario())
+        self.assertEqual(results[:20], [(1041666.67, None)] * 20)
+        self.assertEqual(results[20], (None, "InvalidMaritalStatusError"))
+        self.assertEqual(metrics["quotes"], 21)
+        self.assertLess(metrics["batches"], 21)
+
+    def test_Service_2(self):
+        # Full queue is rejected instead of waiting
+        async def scenario():
+            batcher = quote_service.QuoteBatcher(queue_size=1)
+            first = asyncio.ensure_future(batcher.quote((500000000, "excellent", "married", 70, 68, 0.5)))
+            await asyncio.sleep(0)
+            rejected = await batcher.quote((500000000, "excellent", "married", 70, 68, 0.5))
+            first.cancel()
+            return rejected, batcher.rejected
+
+        self.assertEqual(asyncio.run(scenario()), (None, 1))
+
+    def test_Service_3(self):
+        # End to end HTTP request and error response
+        async def scenario():
+            batcher = quote_service.QuoteBatcher(max_delay=0.001)
+            batcher.start()
+            server = await asyncio.start_server(quote_service.connection_handler(batcher), "127.0.0.1", 0)
+            port = server.sockets[0].getsockname()[1]
+
+            responses = []
+            reader, writer = await asyncio.open_connection("127.0.0.1", port)
+            for body in (b'{"property_value": 400000000, "property_condition": "good", "marital_status": "married", "owner_age": 72, "spouse_age": 70, "interest_rate": 0.5}',
+                         b'{"property_value": 0, "property_condition": "good", "marital_status": "married", "owner_age": 72, "spouse_age": 70, "interest_rate": 0.5}'):
+                writer.write(b"POST /quote HTTP/1.1\r\nContent-Length: %d\r\n\r\n" % len(body) + body)
+                status = (await reader.readline()).split()[1]
+                headers = (await reader.readuntil(b"\r\n\r\n")).decode()
+                length = int(headers.split("Content-Length: ")[1].split("\r\n")[0])
+                responses.append((int(status), json.loads(await reader.readexactly(length))))
+            writer.close()
+
+            server.close()
+            await server.wait_closed()
+            await batcher.stop()
+            return responses
+
+        responses = asyncio.run(scenario())
+        self.assertEqual(responses[0], (200, {"monthly_payment": 1000000.0}))
+        self.assertEqual(responses[1], (422, {"error": "InvalidPropertyValueError"}))
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,84 @@
+import unittest
+import sys
+sys.path.append("src")
+from logic.rate_curve import RateCurve
+from logic.schedule import generate_schedule
+from logic.reverse_mortgage import (
+    calculate_reverse_mortgage_payment,
+    calculate_reverse_mortgage_payments,
+    get_annuity_terms,
+    validate_inputs_bulk,
+    InterestRateCurve,
+    validation_error_for,
+    DataTypeError,
+    InvalidInputError,
+    InvalidInterestRateError
+)
+
+class CurvaTasasTest(unittest.TestCase):
+
+    # Curve Cases: term-structure rates in place of the flat rate
+    def test_Curve_1(self):
+        # A flat curve gives the same annuity as the scalar rate
+        curve = RateCurve.flat(0.05)
+        monthly_interest_rate, annuity_denominator = get_annuity_terms(0.05, 240)
+        curve_rate, annuity_factor = curve.annuity_terms(240)
+        self.assertAlmostEqual(curve_rate / annuity_factor, monthly_interest_rate / annuity_denominator, places=15)
+
+    def test_Curve_2(self):
+        # Zero rates are reproduced by the discount factors at and between tenors
+        curve = RateCurve.from_zero_rates((12, 120, 300), (0.03, 0.04, 0.05))
+        discount_factors = curve.discount_factors(300)
+        self.assertEqual(len(curve), 300)
+        self.assertAlmostEqual(discount_factors[11], 1.03 ** -1, places=12)
+        self.assertAlmostEqual(discount_factors[299], 1.05 ** -25, places=12)
+        self.assertAlmostEqual(discount_factors[209], 1.045 ** -17.5, places=12)
+        self.assertIs(curve.discount_factors(300), discount_factors)
+
+    def test_Curve_3(self):
+        # Scalar and batch paths accept a curve wherever a rate is accepted
+        curve = RateCurve.from_zero_rates((12, 300), (0.03, 0.05))
+        payments = calculate_reverse_mortgage_payments([500000000] * 3, ["good"] * 3, ["single"] * 3, [70, 60, 66], [72, 61, 80], [curve, curve, 0.05])
+        self.assertEqual(payments, [1250000.0, 750000.0, 937500.0])
+        self.assertEqual(calculate_reverse_mortgage_payment(500000000, "good", "single", 70, 72, curve), 1250000.0)
+
+    def test_Curve_4(self):
+        # Under a curve each month of the schedule accrues at its forward rate
+        curve = RateCurve([0.12, 0.24, 0.06])
+        rows = list(generate_schedule(500000000, "excellent", "married", 70, 68, curve))
+        self.assertEqual(len(rows), 240)
+        self.assertEqual(rows[0].accrued_interest, 0.0)
+        self.assertAlmostEqual(rows[1].accrued_interest, rows[0].balance * (1.24 ** (1/12) - 1))
+        self.assertAlmostEqual(rows[2].accrued_interest, rows[1].balance * (1.06 ** (1/12) - 1))
+        self.assertAlmostEqual(rows[239].accrued_interest, rows[238].balance * (1.06 ** (1/12) - 1))
+
+    def test_Curve_Error_1(self):
+        # Every rate of the curve must be within the product limits
+        with self.assertRaises(InvalidInterestRateError):
+            calculate_reverse_mortgage_payment(500000000, "good", "single", 70, 72, RateCurve([0.05, 1.5]))
+        codes, summary = validate_inputs_bulk([500000000] * 2, ["good"] * 2, ["single"] * 2, [70] * 2, [72] * 2, [RateCurve([0.0, 0.05]), RateCurve([0.05])])
+        self.assertIs(validation_error_for(codes[0]), InvalidInterestRateError)
+        self.assertEqual(codes[1], 0)
+        self.assertEqual(summary["interest_rate_range"], 1)
+
+    def test_Curve_Error_2(self):
+        with self.assertRaises(InvalidInputError):
+            RateCurve([])
+        with self.assertRaises(DataTypeError):
+            RateCurve([0.05, "0.06"])
+        with self.assertRaises(InvalidInputError):
+            RateCurve.from_zero_rates((120, 12), (0.03, 0.04))
+
+    def test_Curve_Error_3(self):
+        # A curve must implement both the annuity terms and the monthly rates
+        class AnnuityOnlyCurve(InterestRateCurve):
+            def annuity_terms(self, months):
+                return 1.0, months
+
+        with self.assertRaises(TypeError):
+            AnnuityOnlyCurve()
+        with self.assertRaises(TypeError):
+            InterestRateCurve()
+
+if __name__ == '__main__':
+    unittest.main()
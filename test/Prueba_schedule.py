@@ -0,0 +1,47 @@
+import unittest
+import sys
+sys.path.append("src")
+from logic import reverse_mortgage, schedule
+
+class CronogramaTest(unittest.TestCase):
+
+    # Schedule Cases: month-by-month payments, interest and balance
+
+    def test_Schedule_1(self):
+        # Term follows the life expectancy bucket and balance accrues interest
+        rows = list(schedule.generate_schedule(500000000, "excellent", "married", 70, 68, 0.5))
+        monthly_rate = (1 + 0.5) ** (1/12) - 1
+
+        self.assertEqual(len(rows), 240)
+        self.assertEqual(rows[0], (1, 1041666.67, 0.0, 1041666.67))
+        self.assertAlmostEqual(rows[1].accrued_interest, 1041666.67 * monthly_rate)
+        self.assertAlmostEqual(rows[1].balance, 1041666.67 * (2 + monthly_rate))
+
+    def test_Schedule_2(self):
+        # The array-backed portfolio holds the same rows as the generator
+        rows = [
+            (500000000, "excellent", "married", 70, 68, 0.5),
+            (250000000, "average", "married", 65, 67, 0.07),
+            (300000000, "excellent", "single", 40, 41, 0.06),
+        ]
+        portfolio = schedule.build_portfolio_schedule(*zip(*rows))
+
+        self.assertEqual(list(portfolio.months), [240, 240, 300])
+        for loan, row in enumerate(rows):
+            expected_rows = list(schedule.generate_schedule(*row))
+            self.assertEqual(list(portfolio.loan(loan)), expected_rows)
+            self.assertEqual(portfolio.final_balances()[loan], expected_rows[-1].balance)
+
+    def test_Schedule_Error_1(self):
+        # Validation happens before the first row is requested
+        with self.assertRaises(reverse_mortgage.InvalidInterestRateError):
+            schedule.generate_schedule(500000000, "excellent", "married", 70, 68, 0)
+
+    def test_Schedule_Error_2(self):
+        # Month outside the loan term
+        portfolio = schedule.build_portfolio_schedule([500000000], ["excellent"], ["married"], [70], [68], [0.5])
+        with self.assertRaises(IndexError):
+            portfolio.row(0, 241)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,41 @@
+import unittest
+import sys
+sys.path.append("src")
+from logic import reverse_mortgage, sensitivity
+
+class SensibilidadTest(unittest.TestCase):
+
+    # Grid Cases: every cell must match the scalar function
+
+    def test_Grid_1(self):
+        interest_rates = [0.0001, 0.07, 0.5, 1]
+        property_values = [200000000, 500000000, 900000000]
+        ages = [18, 64, 65, 69, 70, 85]
+        property_conditions = ["excellent", "good", "average"]
+
+        grid = sensitivity.calculate_payment_grid(interest_rates, property_values, ages, property_conditions)
+
+        self.assertEqual(grid.shape, (4, 3, 6, 3))
+        self.assertEqual(len(grid), 4 * 3 * 6 * 3)
+        for rate_index, interest_rate in enumerate(interest_rates):
+            for value_index, property_value in enumerate(property_values):
+                for age_index, age in enumerate(ages):
+                    for condition_index, property_condition in enumerate(property_conditions):
+                        expected_payment = reverse_mortgage.calculate_reverse_mortgage_payment(
+                            property_value, property_condition, "married", age, age, interest_rate)
+                        self.assertEqual(grid[rate_index, value_index, age_index, condition_index], expected_payment)
+
+    def test_Grid_2(self):
+        # Nested list view
+        grid = sensitivity.calculate_payment_grid([0.5], [500000000, 400000000], [70], ["excellent", "good"])
+        self.assertEqual(grid.tolist(), [[[[1388888.89, 1250000.0]], [[1111111.11, 1000000.0]]]])
+
+    def test_Grid_Error_1(self):
+        # Axis values are validated once, with the scalar exceptions
+        with self.assertRaises(reverse_mortgage.InvalidPropertyValueError):
+            sensitivity.calculate_payment_grid([0.5], [500000000], [17], ["excellent"])
+        with self.assertRaises(reverse_mortgage.InvalidPropertyConditionError):
+            sensitivity.calculate_payment_grid([0.5], [500000000], [70], ["unknown"])
+
+if __name__ == '__main__':
+    unittest.main()
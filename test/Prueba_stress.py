@@ -0,0 +1,82 @@
+import unittest
+import sys
+sys.path.append("src")
+from logic import reverse_mortgage, stress
+from logic.stress import Scenario, StressRunner, run_stress
+from logic.reverse_mortgage import calculate_reverse_mortgage_payments, ProductConfig, InvalidInputError
+
+APPLICANTS = [
+    (500000000, "excellent", "married", 70, 68, 0.5),
+    (210000000, "good", "single", 60, 62, 0.05),
+    (880000000, "average", "divorced", 66, 75, 0.07),
+    (100, "good", "single", 60, 62, 0.05),
+    (300000000, "new", "single", 60, 62, 0.05),
+    (400000000, "good", "married", 80, 82, 0.98),
+]
+
+class EstresTest(unittest.TestCase):
+
+    # Stress Cases: several shocks evaluated on one read of the portfolio
+    def test_Stress_1(self):
+        report = run_stress(APPLICANTS, [
+            Scenario("haircut", property_value_factor=0.9),
+            Scenario("boom", property_value_factor=1.05),
+            Scenario("rates_up", rate_shift=0.05),
+            Scenario("strict", condition_adjustment={"average": 0.7}, loan_percentage=0.4),
+        ], chunk_size=2)
+
+        self.assertEqual(report["rows"], 6)
+        self.assertEqual(report["invalid"], {"ExcessivePropertyValueError": 1, "InvalidPropertyConditionError": 1})
+        valid = [APPLICANTS[row] for row in (0, 1, 2, 5)]
+        baseline_payments = calculate_reverse_mortgage_payments(*zip(*valid))
+        self.assertEqual(report["baseline"]["priced"], 4)
+        self.assertAlmostEqual(report["baseline"]["total_monthly_outflow"], sum(baseline_payments))
+
+        # Rows are numbered in input order across chunks
+        self.assertEqual(report["scenarios"]["haircut"]["out_of_band"], {"count": 1, "rows": [1]})
+        self.assertEqual(report["scenarios"]["boom"]["out_of_band"], {"count": 1, "rows": [2]})
+        self.assertEqual(report["scenarios"]["haircut"]["priced"], 3)
+
+        self.assertEqual(report["scenarios"]["rates_up"]["errors"], {"InvalidInterestRateError": 1})
+        self.assertEqual(report["scenarios"]["rates_up"]["priced"], 3)
+
+        strict = report["scenarios"]["strict"]
+        strict_product = ProductConfig("strict", (("excellent", 1), ("good", 0.9), ("average", 0.7)), loan_percentage=0.4)
+        strict_payments = calculate_reverse_mortgage_payments(*zip(*valid), product=strict_product)
+        self.assertAlmostEqual(strict["total_monthly_outflow"], sum(strict_payments))
+        self.assertEqual(strict["payment"]["maximum"], max(strict_payments))
+        self.assertAlmostEqual(strict["outflow_change"], strict["total_monthly_outflow"] - report["baseline"]["total_monthly_outflow"])
+
+    def test_Stress_2(self):
+        # Each chunk is validated once, whatever the number of scenarios
+        calls = []
+        original = reverse_mortgage.validate_inputs_bulk
+
+        def counting(*arguments, **keywords):
+            calls.append(len(arguments[0]))
+            return original(*arguments, **keywords)
+
+        stress.validate_inputs_bulk = counting
+        try:
+            run_stress(APPLICANTS * 5, [Scenario(f"haircut_{index}", property_value_factor=1 - index / 100) for index in range(10)], chunk_size=10)
+        finally:
+            stress.validate_inputs_bulk = original
+        self.assertEqual(calls, [10, 10, 10])
+
+    def test_Stress_3(self):
+        # Out-of-band rows are all counted but only the first ones are reported
+        report = run_stress(APPLICANTS * 4, [Scenario("haircut", property_value_factor=0.9)], chunk_size=5, max_reported_rows=2)
+        self.assertEqual(report["scenarios"]["haircut"]["out_of_band"], {"count": 4, "rows": [1, 7]})
+        report = run_stress(APPLICANTS * 4, [Scenario("haircut", property_value_factor=0.9)], max_reported_rows=None)
+        self.assertEqual(report["scenarios"]["haircut"]["out_of_band"], {"count": 4, "rows": [1, 7, 13, 19]})
+
+    def test_Stress_Error_1(self):
+        with self.assertRaises(InvalidInputError):
+            StressRunner([Scenario("a"), Scenario("a")])
+        with self.assertRaises(InvalidInputError):
+            StressRunner([Scenario("baseline")])
+        with self.assertRaises(InvalidInputError):
+            StressRunner([Scenario("a", condition_adjustment={"new": 1})])
+
+if __name__ == '__main__':
+    unittest.main()
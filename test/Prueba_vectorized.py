@@ -0,0 +1,69 @@
+import random
+import unittest
+import sys
+sys.path.append("src")
+from logic import reverse_mortgage
+from logic.reverse_mortgage import (
+    calculate_reverse_mortgage_payment,
+    calculate_reverse_mortgage_payments,
+    ProductConfig,
+    InvalidMaritalStatusError
+)
+
+try:
+    import numpy
+    from logic import vectorized
+except ImportError:
+    numpy = None
+
+def random_rows(count, seed):
+    generator = random.Random(seed)
+    return [(generator.randint(200_000_000, 900_000_000), generator.choice(["excellent", "good", "average"]),
+             generator.choice(["married", "single", "divorced"]), generator.randint(18, 95), generator.randint(18, 85),
+             generator.choice([0.05, 0.07, 0.1, 0.5, 1])) for _ in range(count)]
+
+@unittest.skipUnless(numpy, "NumPy is not installed")
+class VectorizadoTest(unittest.TestCase):
+
+    # Vectorized Cases: NumPy batch pricing matches the scalar path to the cent
+    def test_Vectorized_1(self):
+        rows = [row for row in random_rows(5000, 3) if min(row[3], row[4]) <= 85]
+        # Property values whose payment is exactly half a cent
+        rows += [(200000000 + index * 6 + 3, "average", "single", 66, 66, 0.05) for index in range(2000)]
+        columns = [list(column) for column in zip(*rows)]
+        self.assertIsNotNone(vectorized.price_batch(tuple(columns), reverse_mortgage.DEFAULT_PRODUCT))
+        self.assertEqual(calculate_reverse_mortgage_payments(*columns), [calculate_reverse_mortgage_payment(*row) for row in rows])
+
+    def test_Vectorized_2(self):
+        # Products with their own adjustments, loan percentage and limits
+        product = ProductConfig("premium", (("excellent", 1), ("good", 0.85)), loan_percentage=0.6, maximum_interest_rate=0.5)
+        rows = [(property_value, "good", marital_status, owner_age, spouse_age, 0.05) for property_value, _, marital_status, owner_age, spouse_age, _ in random_rows(500, 4) if min(owner_age, spouse_age) <= 85]
+        columns = tuple(list(column) for column in zip(*rows))
+        self.assertEqual(vectorized.price_batch(columns, product), [calculate_reverse_mortgage_payment(*row, product=product) for row in rows])
+
+    def test_Vectorized_3(self):
+        # Anything the scalar path would reject is left to the row-by-row path
+        rows = [row for row in random_rows(200, 5) if min(row[3], row[4]) <= 85]
+        columns = [list(column) for column in zip(*rows)]
+        product = reverse_mortgage.DEFAULT_PRODUCT
+        for field, value in ((0, "300000000"), (1, "new"), (2, "widowed"), (3, 70.0), (5, 1.5), (0, 100)):
+            changed = [list(column) for column in columns]
+            changed[field][7] = value
+            self.assertIsNone(vectorized.price_batch(tuple(changed), product))
+        self.assertIsNone(vectorized.price_batch((columns[0], columns[1], columns[2], numpy.array(columns[3]), columns[4], columns[5]), product))
+        self.assertIsNotNone(vectorized.price_batch((numpy.array(columns[0], dtype=float), columns[1], columns[2], columns[3], columns[4], numpy.array(columns[5])), product))
+
+    def test_Vectorized_4(self):
+        # Cents are rounded like round(amount, 2), ties to even
+        amounts = [0.005, 0.015, 2.675, 1.005, 333333.345, 333333.335, 1041666.665, 123.4549999999]
+        self.assertEqual((vectorized._round_cents(numpy.array(amounts)) / 100).tolist(), [round(amount, 2) for amount in amounts])
+
+    def test_Vectorized_Error_1(self):
+        # An invalid row raises the scalar path's exception
+        rows = [row for row in random_rows(200, 6) if min(row[3], row[4]) <= 85]
+        rows[50] = (500000000, "excellent", "widowed", 70, 68, 0.5)
+        with self.assertRaises(InvalidMaritalStatusError):
+            calculate_reverse_mortgage_payments(*zip(*rows))
+
+if __name__ == '__main__':
+    unittest.main()
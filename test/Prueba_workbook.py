@@ -0,0 +1,81 @@
+import os
+import shutil
+import tempfile
+import unittest
+import sys
+sys.path.append("src")
+from logic import reverse_mortgage, workbook
+
+class LibroExcelTest(unittest.TestCase):
+
+    # Workbook Cases: streaming .xlsx reading and write-back
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_Workbook_1(self):
+        # calculos.xlsx keeps one applicant per column with Spanish names
+        applicants = list(workbook.read_workbook_applicants("calculos.xlsx"))
+
+        self.assertEqual(applicants[0], (500000000, "excellent", "married", 70, 68, 0.5))
+        self.assertEqual(applicants[2], (250000000, "average", "married", 65, 67, 0.07))
+        self.assertEqual(applicants[18], ("300000000p", "good", "married", 70, 68, 0.07))
+
+    def test_Workbook_2(self):
+        # Write-back keeps the original sheet and adds the results
+        output_path = os.path.join(self.directory.name, "resultados.xlsx")
+
+        count = workbook.price_workbook("calculos.xlsx", output_path)
+
+        results = list(workbook.iter_rows(output_path, "Results"))
+        self.assertEqual(count, len(results) - 1)
+        self.assertEqual(results[0][-2:], ["monthly_payment", "error"])
+        self.assertEqual(results[1][6], 1041666.67)
+        self.assertEqual(results[13][7], "DataTypeError")
+        self.assertEqual(list(workbook.iter_rows(output_path, "Hoja1")), list(workbook.iter_rows("calculos.xlsx")))
+
+    def test_Workbook_3(self):
+        # Row layout round trip through a new workbook
+        path = os.path.join(self.directory.name, "cartera.xlsx")
+        rows = [
+            ["property_value", "property_condition", "marital_status", "owner_age", "spouse_age", "interest_rate"],
+            [400000000, "Good", "married", 72, 70, 0.5],
+            [300000000, "excelente", "casado", 75, 65, 0.06],
+            [None, "a & b <c>", True, 70, 68, 0.07],
+        ]
+        workbook.write_workbook(path, rows)
+
+        self.assertEqual(list(workbook.iter_rows(path)), rows)
+        self.assertEqual(list(workbook.read_workbook_applicants(path))[:2],
+                         [(400000000, "good", "married", 72, 70, 0.5), (300000000, "excellent", "married", 75, 65, 0.06)])
+
+    def test_Workbook_4(self):
+        # NaN and infinities are written as text, not as invalid numbers
+        path = os.path.join(self.directory.name, "cartera.xlsx")
+        workbook.write_workbook(path, [["value"], [float("nan")], [float("inf")], [10 ** 20]])
+
+        self.assertEqual(list(workbook.iter_rows(path)), [["value"], ["nan"], ["inf"], [10 ** 20]])
+
+    def test_Workbook_5(self):
+        # Pricing a workbook in place adds the results sheet without losing the original one
+        path = os.path.join(self.directory.name, "calculos.xlsx")
+        shutil.copyfile("calculos.xlsx", path)
+
+        count = workbook.price_workbook(path, path)
+
+        self.assertEqual(len(list(workbook.iter_rows(path, "Results"))), count + 1)
+        self.assertEqual(list(workbook.iter_rows(path, "Hoja1")), list(workbook.iter_rows("calculos.xlsx")))
+        self.assertEqual(os.listdir(self.directory.name), ["calculos.xlsx"])
+
+    def test_Workbook_Error_1(self):
+        # The results sheet must not already exist
+        output_path = os.path.join(self.directory.name, "resultados.xlsx")
+        with self.assertRaises(reverse_mortgage.InvalidInputError):
+            workbook.price_workbook("calculos.xlsx", output_path, results_sheet="Hoja1")
+        self.assertFalse(os.path.exists(output_path))
+
+if __name__ == '__main__':
+    unittest.main()
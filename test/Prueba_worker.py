@@ -0,0 +1,41 @@
+import io
+import json
+import os
+import subprocess
+import unittest
+import sys
+sys.path.append("src")
+from logic import worker
+
+class TrabajadorTest(unittest.TestCase):
+
+    # Worker Cases: one JSON response per JSON request line
+
+    def test_Worker_1(self):
+        # Responses keep the request order and echo the id
+        source = io.StringIO(
+            '{"id": 1, "property_value": 500000000, "property_condition": "excellent", "marital_status": "married", "owner_age": 70, "spouse_age": 68, "interest_rate": 0.5}\n'
+            '\n'
+            '{"id": 2, "property_value": 950000000, "property_condition": "excellent", "marital_status": "married", "owner_age": 70, "spouse_age": 68, "interest_rate": 0.07}\n'
+            'not json\n')
+        target = io.StringIO()
+
+        count = worker.run_worker(source, target)
+
+        responses = [json.loads(line) for line in target.getvalue().splitlines()]
+        self.assertEqual(count, 3)
+        self.assertEqual(responses[0], {"id": 1, "monthly_payment": 1041666.67})
+        self.assertEqual(responses[1]["error"], "ExcessivePropertyValueError")
+        self.assertIn("900,000,000", responses[1]["message"])
+        self.assertEqual(responses[2]["error"], "InvalidInputError")
+
+    def test_Worker_2(self):
+        # The package entry point runs the worker
+        environment = dict(os.environ, PYTHONPATH="src")
+        completed = subprocess.run(
+            [sys.executable, "-m", "logic"], env=environment, capture_output=True, text=True,
+            input='{"property_value": 400000000, "property_condition": "good", "marital_status": "married", "owner_age": 72, "spouse_age": 70, "interest_rate": 0.5}\n')
+        self.assertEqual(json.loads(completed.stdout), {"id": None, "monthly_payment": 1000000.0})
+
+if __name__ == '__main__':
+    unittest.main()